@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Admissions analytics for Shri Shyam Public School
+
+``admission_counts`` holds the number of applications per submission day,
+class, status and gender. Submitting an application adds one to its group
+and a status change moves one between groups, in the same transaction as
+the application itself, so the admin breakdowns read a few hundred rows
+per year instead of every application. Archived applications stay counted.
+
+Rows written around the API (bulk loads, manual SQL) aren't counted; a
+rebuild recomputes the table from the applications.
+
+Usage:
+    python analytics.py rebuild     # recount from admissions and their archive
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Grouping columns of admission_counts, besides the day
+DIMENSIONS = ('class_applying', 'application_status', 'gender')
+
+def _counts_table():
+    from models import AdmissionCount
+    return AdmissionCount.__table__
+
+def _submitted_day(column, dialect):
+    # SQLite stores dates as ISO text; CAST(... AS DATE) would give a number there
+    return sa.func.date(column) if dialect == 'sqlite' else sa.cast(column, sa.Date)
+
+def count_admission(session, day, class_applying, application_status, gender, delta=1):
+    """Add ``delta`` to one group, creating it if needed; call inside the application's transaction"""
+    table = _counts_table()
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        statement = sqlite.insert(table)
+    elif dialect == 'postgresql':
+        statement = postgresql.insert(table)
+    else:
+        raise RuntimeError(f"Admission counts are not supported on {dialect}")
+    statement = statement.values(day=day, class_applying=class_applying, application_status=application_status,
+                                 gender=gender, applications=delta)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=['day', *DIMENSIONS], set_={'applications': table.c.applications + delta}))
+
+def breakdowns(session, start=None, end=None):
+    """Totals by class, status, gender, day and class x status for days in [start, end]"""
+    table = _counts_table()
+    query = sa.select(table.c.day, *[table.c[name] for name in DIMENSIONS], table.c.applications)
+    if start:
+        query = query.where(table.c.day >= start)
+    if end:
+        query = query.where(table.c.day <= end)
+
+    total = 0
+    by = {name: defaultdict(int) for name in DIMENSIONS}
+    by_day = defaultdict(int)
+    by_class_status = defaultdict(lambda: defaultdict(int))
+    rows = session.execute(query.where(table.c.applications != 0))
+    for day, class_applying, status, gender, applications in rows:
+        total += applications
+        for name, value in zip(DIMENSIONS, (class_applying, status, gender)):
+            by[name][value] += applications
+        by_day[day] += applications
+        by_class_status[class_applying][status] += applications
+    return {
+        'total': total,
+        'by_class': dict(by['class_applying']),
+        'by_status': dict(by['application_status']),
+        'by_gender': dict(by['gender']),
+        'by_class_status': {name: dict(counts) for name, counts in by_class_status.items()},
+        'by_day': [{'date': day.isoformat(), 'count': by_day[day]} for day in sorted(by_day)],
+    }
+
+def rebuild(engine):
+    """Recount admission_counts from admissions and admissions_archive; returns the number of groups"""
+    from models import Admission, admissions_archive
+
+    table = _counts_table()
+    halves = [sa.select(source.c.submitted_at, *[source.c[name] for name in DIMENSIONS])
+              for source in (Admission.__table__, admissions_archive)]
+    rows = sa.union_all(*halves).subquery()
+    day = _submitted_day(rows.c.submitted_at, engine.dialect.name)
+    groups = (sa.select(day, *[rows.c[name] for name in DIMENSIONS], sa.func.count())
+              .group_by(day, *[rows.c[name] for name in DIMENSIONS]))
+    with engine.begin() as conn:
+        conn.execute(table.delete())
+        conn.execute(table.insert().from_select(['day', *DIMENSIONS, 'applications'], groups))
+        return conn.execute(sa.select(sa.func.count()).select_from(table)).scalar()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Admissions analytics')
+    parser.add_argument('command', choices=['rebuild'])
+    parser.parse_args(argv)
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        groups = rebuild(db.engine)
+    print(f"✅ Admission counts rebuilt: {groups:,} groups")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Yearly archival of admissions and contact messages
+
+Rows submitted before an academic-year boundary are moved from
+``admissions`` and ``contact_messages`` into ``admissions_archive`` and
+``contact_messages_archive`` (same columns plus ``archived_at``), so the hot
+tables and their indexes only hold the current season. Applications still
+pending and messages still unread stay in the hot tables until handled.
+
+Rows move in small batches, each copied and deleted in one transaction, so
+the job can be interrupted and rerun, and the site keeps serving while it
+runs. Admin list endpoints read the archive too with ``include_archived=1``.
+
+Usage:
+    python archive.py run                      # archive before the current academic year
+    python archive.py run --keep-years 2       # keep this academic year and the last
+    python archive.py run --before 2024-04-01 --dry-run
+    python archive.py status
+"""
+
+import argparse
+import os
+import sys
+from datetime import date, datetime
+
+import sqlalchemy as sa
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models import Admission, ContactMessage, admissions_archive, contact_messages_archive
+
+# Hot table -> (archive table, status column, statuses that are never archived)
+ARCHIVES = {
+    Admission.__table__: (admissions_archive, 'application_status', ('pending',)),
+    ContactMessage.__table__: (contact_messages_archive, 'status', ('unread',)),
+}
+
+DEFAULT_BATCH_SIZE = 500
+
+def academic_year_start(day, start_month=4):
+    """First day of the academic year containing ``day``"""
+    year = day.year if day.month >= start_month else day.year - 1
+    return date(year, start_month, 1)
+
+def archive_cutoff(today=None, keep_years=1, start_month=4):
+    """Rows submitted before this datetime are archived; ``keep_years`` counts the current year"""
+    start = academic_year_start(today or date.today(), start_month)
+    return datetime(start.year - (keep_years - 1), start.month, 1)
+
+def _eligible(hot, cutoff):
+    _, status_column, open_statuses = ARCHIVES[hot]
+    status = hot.c[status_column]
+    return sa.and_(hot.c.submitted_at < cutoff, sa.or_(status.is_(None), status.notin_(open_statuses)))
+
+def count_eligible(conn, cutoff):
+    return {hot.name: conn.execute(sa.select(sa.func.count()).select_from(hot).where(_eligible(hot, cutoff))).scalar()
+            for hot in ARCHIVES}
+
+def archive_table(engine, hot, cutoff, batch_size=DEFAULT_BATCH_SIZE):
+    """Move eligible rows of ``hot`` into its archive table; returns the number moved"""
+    archived = ARCHIVES[hot][0]
+    columns = [column.name for column in hot.columns]
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            # Fix the batch by id so the copy and the delete see exactly the same rows
+            ids = conn.execute(sa.select(hot.c.id).where(_eligible(hot, cutoff))
+                               .order_by(hot.c.submitted_at).limit(batch_size)).scalars().all()
+            if not ids:
+                return moved
+            conn.execute(archived.insert().from_select(
+                columns + ['archived_at'],
+                sa.select(*[hot.c[name] for name in columns], sa.literal(datetime.utcnow(), sa.DateTime))
+                .where(hot.c.id.in_(ids))
+            ))
+            conn.execute(hot.delete().where(hot.c.id.in_(ids)))
+        moved += len(ids)
+
+def archive_all(engine, cutoff, batch_size=DEFAULT_BATCH_SIZE, log=print):
+    """Archive every table; returns {table name: rows moved}"""
+    moved = {}
+    for hot in ARCHIVES:
+        moved[hot.name] = archive_table(engine, hot, cutoff, batch_size)
+        log(f"✓ Archived {moved[hot.name]:,} rows from {hot.name}")
+    return moved
+
+def with_archived(model, **filters):
+    """Subquery over ``model``'s table and its archive, with an ``archived`` flag.
+
+    ``filters`` are column equality conditions applied to both halves.
+    """
+    hot = model.__table__
+    archived = ARCHIVES[hot][0]
+    halves = []
+    for table, flag in ((hot, False), (archived, True)):
+        query = sa.select(*[table.c[column.name] for column in hot.columns], sa.literal(flag).label('archived'))
+        halves.append(query.where(*[table.c[name] == value for name, value in filters.items()]))
+    return sa.union_all(*halves).subquery()
+
+def page_with_archived(session, model, order_column, offset, limit, **filters):
+    """(rows, total) for one page of ``model`` plus its archive, newest ``order_column`` first.
+
+    Each half is cut to ``offset + limit`` rows through its own index before
+    the two are merged, so deep archives don't get sorted in full.
+    """
+    hot = model.__table__
+    archived = ARCHIVES[hot][0]
+    halves, total = [], 0
+    for table, flag in ((hot, False), (archived, True)):
+        conditions = [table.c[name] == value for name, value in filters.items()]
+        total += session.execute(sa.select(sa.func.count()).select_from(table).where(*conditions)).scalar()
+        half = (sa.select(*[table.c[column.name] for column in hot.columns], sa.literal(flag).label('archived'))
+                .where(*conditions).order_by(table.c[order_column].desc()).limit(offset + limit).subquery())
+        halves.append(sa.select(half))
+    merged = sa.union_all(*halves).subquery()
+    rows = session.execute(sa.select(merged).order_by(merged.c[order_column].desc())
+                           .offset(offset).limit(limit)).all()
+    return rows, total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Move last years\' admissions and contact messages to archive tables')
+    parser.add_argument('command', choices=['run', 'status'], nargs='?', default='run')
+    parser.add_argument('--before', type=date.fromisoformat, help='archive rows submitted before this date')
+    parser.add_argument('--keep-years', type=int, help='academic years to keep, including the current one')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--dry-run', action='store_true', help='only count the rows that would move')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        if args.before:
+            cutoff = datetime.combine(args.before, datetime.min.time())
+        else:
+            cutoff = archive_cutoff(keep_years=args.keep_years or app.config['ARCHIVE_KEEP_YEARS'],
+                                    start_month=app.config['ACADEMIC_YEAR_START_MONTH'])
+        print(f"Archive boundary: {cutoff:%Y-%m-%d}")
+
+        if args.command == 'status' or args.dry_run:
+            with db.engine.connect() as conn:
+                eligible = count_eligible(conn, cutoff)
+                for hot, (archived, _, _) in ARCHIVES.items():
+                    hot_rows = conn.execute(sa.select(sa.func.count()).select_from(hot)).scalar()
+                    archived_rows = conn.execute(sa.select(sa.func.count()).select_from(archived)).scalar()
+                    print(f"{hot.name:<18} {hot_rows:>10,} hot  {archived_rows:>10,} archived  "
+                          f"{eligible[hot.name]:>10,} to archive")
+            return
+
+        moved = archive_all(db.engine, cutoff, args.batch_size)
+        print(f"✅ Archived {sum(moved.values()):,} rows")
+
+if __name__ == '__main__':
+    main()
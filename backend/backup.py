@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Online backups of the database and uploads for Shri Shyam Public School
+
+A backup is a snapshot directory in ``BACKUP_DIR``::
+
+    20250401-020000/
+        school.db        copy made with SQLite's online backup API
+        uploads/         the upload folder at the time of the snapshot
+        manifest.json    size and mtime of every upload, plus timings
+
+The database is copied with SQLite's online backup API without stopping
+writers: in WAL mode from a single read snapshot, otherwise in steps of
+``BACKUP_PAGES`` pages with the lock released between steps. Uploads whose size and mtime match the previous snapshot are
+hard-linked to it instead of copied, so each snapshot costs only the files
+that changed. A snapshot is built as ``<name>.partial`` and renamed when
+complete.
+
+Any snapshot can be streamed as a .tar.gz without a temporary file, and
+restored from either form.
+
+Usage:
+    python backup.py create                       # new snapshot, prune beyond BACKUP_KEEP
+    python backup.py list
+    python backup.py archive 20250401-020000 -o backup.tar.gz   (-o - for stdout)
+    python backup.py restore backup.tar.gz --yes  # stop the server first
+"""
+
+import argparse
+import gzip
+import json
+import os
+import queue
+import shutil
+import sqlite3
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from shared_state import is_locked, try_lock
+
+DATABASE_FILE = 'school.db'
+MANIFEST_FILE = 'manifest.json'
+PARTIAL_SUFFIX = '.partial'
+
+# fcntl locks don't exclude other threads of the same process
+_running = threading.Lock()
+# Serializes taking the lock with is_running's probe inside this process
+_probe = threading.Lock()
+# How long taking the lock waits out another process's is_running probe
+LOCK_RETRIES, LOCK_RETRY_DELAY = 5, 0.01
+
+class BackupError(Exception):
+    pass
+
+def sqlite_path(app):
+    """Filesystem path of the app's SQLite database (relative URLs resolve into the instance folder)"""
+    from extensions import db
+
+    with app.app_context():
+        url = db.engine.url
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:'):
+        raise BackupError(f"Online backups need a SQLite database file, not {url.get_backend_name()} "
+                          "(use pg_dump for PostgreSQL)")
+    return url.database[5:] if url.query.get('uri') else url.database
+
+class _Restarted(Exception):
+    pass
+
+def backup_database(source, destination, pages=1024, sleep=0.05, max_restarts=3, standalone=True):
+    """Copy a live SQLite database with the online backup API; returns the size in bytes.
+
+    In WAL mode the copy is one step reading one snapshot: writers carry on
+    meanwhile, and their commits can't restart it. Otherwise it is copied
+    ``pages`` pages at a time, sleeping between steps so writers can take
+    the lock; a write restarts the copy, so after ``max_restarts`` restarts
+    the rest is done in one step. ``standalone`` switches the copy out of
+    WAL mode so it is a single self-contained file.
+    """
+    src = sqlite3.connect(f'file:{source}?mode=ro', uri=True)
+    dst = sqlite3.connect(destination)
+    try:
+        if src.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+            src.backup(dst)
+        else:
+            state = {'remaining': None, 'restarts': 0}
+
+            def progress(status, remaining, total):
+                if state['remaining'] is not None and remaining > state['remaining']:
+                    state['restarts'] += 1
+                    if state['restarts'] > max_restarts:
+                        raise _Restarted()
+                state['remaining'] = remaining
+
+            try:
+                src.backup(dst, pages=pages, sleep=sleep, progress=progress)
+            except _Restarted:
+                src.backup(dst)
+        if standalone:
+            dst.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        dst.close()
+        src.close()
+    return os.path.getsize(destination)
+
+def _scan(directory):
+    """{relative path: (size, mtime_ns)} for every file under ``directory``"""
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files[os.path.relpath(path, directory).replace(os.sep, '/')] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+def snapshot_uploads(source, destination, previous=None):
+    """Copy ``source`` into ``destination``, hard-linking files unchanged since ``previous``.
+
+    ``previous`` is ``(snapshot dir, manifest)`` of the last snapshot.
+    Returns ``(files, copied, linked, bytes_copied)``.
+    """
+    files = _scan(source) if os.path.isdir(source) else {}
+    old_dir, old_manifest = previous or (None, {})
+    old_files = old_manifest.get('files', {})
+    copied = linked = bytes_copied = 0
+    for relpath, (size, mtime_ns) in files.items():
+        target = os.path.join(destination, relpath)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if old_dir and old_files.get(relpath) == [size, mtime_ns]:
+            try:
+                os.link(os.path.join(old_dir, 'uploads', relpath), target)
+                linked += 1
+                continue
+            except OSError:
+                pass  # no hard links here (other filesystem, Windows); copy instead
+        shutil.copy2(os.path.join(source, relpath), target)
+        copied += 1
+        bytes_copied += size
+    os.makedirs(destination, exist_ok=True)
+    return {relpath: list(entry) for relpath, entry in files.items()}, copied, linked, bytes_copied
+
+def list_snapshots(backup_dir):
+    """Completed snapshots, oldest first, as (name, manifest)"""
+    if not os.path.isdir(backup_dir):
+        return []
+    snapshots = []
+    for name in sorted(os.listdir(backup_dir)):
+        path = os.path.join(backup_dir, name, MANIFEST_FILE)
+        if not name.endswith(PARTIAL_SUFFIX) and os.path.isfile(path):
+            with open(path) as f:
+                snapshots.append((name, json.load(f)))
+    return snapshots
+
+def snapshot_dir(backup_dir, name):
+    """Path of a completed snapshot; rejects names that aren't one"""
+    if name not in {existing for existing, _ in list_snapshots(backup_dir)}:
+        raise BackupError(f"No backup named '{name}'")
+    return os.path.join(backup_dir, name)
+
+def lock_backup_dir(backup_dir):
+    """Take the lock held while a snapshot is made; returns it, or None if a backup is running"""
+    with _probe:
+        if not _running.acquire(blocking=False):
+            return None
+        os.makedirs(backup_dir, exist_ok=True)
+        fd = os.open(os.path.join(backup_dir, '.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        for _ in range(LOCK_RETRIES):
+            if try_lock(fd):
+                return fd
+            time.sleep(LOCK_RETRY_DELAY)
+        os.close(fd)
+        _running.release()
+        return None
+
+def unlock_backup_dir(lock):
+    os.close(lock)
+    _running.release()
+
+def is_running(backup_dir):
+    """Whether a backup is being made, checked without taking its lock"""
+    with _probe:
+        if _running.locked():
+            # Made by this process; probing its file would release the lock
+            return True
+        try:
+            fd = os.open(os.path.join(backup_dir, '.lock'), os.O_RDONLY)
+        except FileNotFoundError:
+            return False
+        try:
+            return is_locked(fd)
+        finally:
+            os.close(fd)
+
+def create_snapshot(app, log=print, lock=None):
+    """Snapshot the app's database and uploads; returns the manifest.
+
+    ``lock`` is one already taken with ``lock_backup_dir``; it is released
+    when the snapshot is done.
+    """
+    config = app.config
+    backup_dir = config['BACKUP_DIR']
+    lock = lock if lock is not None else lock_backup_dir(backup_dir)
+    if lock is None:
+        raise BackupError('Another backup is already running')
+    try:
+        # Left behind by an interrupted run; nobody else can be writing them now
+        for name in os.listdir(backup_dir):
+            if name.endswith(PARTIAL_SUFFIX):
+                shutil.rmtree(os.path.join(backup_dir, name), ignore_errors=True)
+
+        name = base = datetime.now().strftime('%Y%m%d-%H%M%S')
+        for n in range(1, 100):
+            if not os.path.exists(os.path.join(backup_dir, name)):
+                break
+            name = f'{base}-{n}'
+        partial = os.path.join(backup_dir, name + PARTIAL_SUFFIX)
+        os.makedirs(partial)
+        snapshots = list_snapshots(backup_dir)
+        previous = (os.path.join(backup_dir, snapshots[-1][0]), snapshots[-1][1]) if snapshots else None
+
+        started = time.perf_counter()
+        database_bytes = backup_database(sqlite_path(app),
+                                         os.path.join(partial, DATABASE_FILE),
+                                         pages=config['BACKUP_PAGES'])
+        database_ms = (time.perf_counter() - started) * 1000
+        log(f"✓ Database: {database_bytes / 1e6:,.1f} MB in {database_ms / 1000:.2f}s")
+
+        started = time.perf_counter()
+        files, copied, linked, bytes_copied = snapshot_uploads(
+            config['UPLOAD_FOLDER'], os.path.join(partial, 'uploads'), previous)
+        uploads_ms = (time.perf_counter() - started) * 1000
+        log(f"✓ Uploads: {copied:,} copied ({bytes_copied / 1e6:,.1f} MB), {linked:,} unchanged "
+            f"in {uploads_ms / 1000:.2f}s")
+
+        manifest = {
+            'name': name,
+            'created_at': datetime.utcnow().isoformat(),
+            'database_bytes': database_bytes,
+            'database_ms': round(database_ms, 1),
+            'uploads_copied': copied,
+            'uploads_linked': linked,
+            'uploads_bytes_copied': bytes_copied,
+            'uploads_ms': round(uploads_ms, 1),
+            'files': files,
+        }
+        with open(os.path.join(partial, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f)
+        os.rename(partial, os.path.join(backup_dir, name))
+
+        # Hard links keep the files that later snapshots still share
+        for old, _ in list_snapshots(backup_dir)[:-config['BACKUP_KEEP']]:
+            shutil.rmtree(os.path.join(backup_dir, old), ignore_errors=True)
+            log(f"✓ Pruned backup {old}")
+        return manifest
+    finally:
+        unlock_backup_dir(lock)
+
+class _ChunkWriter:
+    """File-like sink handing the archive to a consumer thread in ~256 KB chunks"""
+
+    CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, chunks, cancelled):
+        self.chunks = chunks
+        self.cancelled = cancelled
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.buffer:
+            self._put(bytes(self.buffer))
+            self.buffer.clear()
+
+    def _put(self, item):
+        while not self.cancelled.is_set():
+            try:
+                self.chunks.put(item, timeout=1)
+                return
+            except queue.Full:
+                continue
+        raise BackupError('Archive download cancelled')
+
+def stream_archive(path, compresslevel=6):
+    """Yield a snapshot directory as .tar.gz chunks, built on the fly with bounded memory"""
+    chunks = queue.Queue(maxsize=16)
+    cancelled = threading.Event()
+    done = object()
+
+    def produce():
+        writer = _ChunkWriter(chunks, cancelled)
+        try:
+            with gzip.GzipFile(fileobj=writer, mode='wb', compresslevel=compresslevel) as compressed:
+                with tarfile.open(fileobj=compressed, mode='w|') as tar:
+                    tar.add(path, arcname=os.path.basename(path))
+            writer.flush()
+            writer._put(done)
+        except BackupError:
+            pass  # the consumer went away
+        except Exception as e:
+            try:
+                writer._put(e)
+            except BackupError:
+                pass
+
+    producer = threading.Thread(target=produce, name='backup-archive', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+        producer.join()
+
+def _extract(archive, directory):
+    """Unpack a .tar.gz made by stream_archive; returns the snapshot directory inside it"""
+    with tarfile.open(archive, 'r:gz') as tar:
+        members = tar.getmembers()
+        top = {member.name.split('/')[0] for member in members}
+        if len(top) != 1:
+            raise BackupError('Not a backup archive')
+        if hasattr(tarfile, 'data_filter'):
+            tar.extractall(directory, members=members, filter='data')
+        else:
+            # Python before 3.11.4 has no extraction filters: refuse what the 'data' filter would
+            for member in members:
+                if (not (member.isfile() or member.isdir()) or os.path.isabs(member.name)
+                        or '..' in member.name.split('/')):
+                    raise BackupError(f"Unsafe entry in backup archive: {member.name}")
+            tar.extractall(directory, members=members)
+    return os.path.join(directory, top.pop())
+
+def restore(app, source, log=print):
+    """Restore the database and uploads from a snapshot directory or .tar.gz archive.
+
+    The database is written through the backup API into the live file, so
+    it stays consistent even if something still has it open, but the
+    server should be stopped: requests during the restore see a mix.
+    Uploads missing or different in the upload folder are copied back;
+    files added since the snapshot are left alone.
+    """
+    config = app.config
+    with tempfile.TemporaryDirectory(prefix='ssps-restore-') as workdir:
+        path = source if os.path.isdir(source) else _extract(source, workdir)
+        if not os.path.isfile(os.path.join(path, MANIFEST_FILE)):
+            raise BackupError(f"{source} is not a backup")
+
+        started = time.perf_counter()
+        size = backup_database(os.path.join(path, DATABASE_FILE), sqlite_path(app),
+                               pages=config['BACKUP_PAGES'], standalone=False)
+        log(f"✓ Database restored: {size / 1e6:,.1f} MB in {time.perf_counter() - started:.2f}s")
+
+        started = time.perf_counter()
+        uploads = os.path.join(path, 'uploads')
+        current = _scan(config['UPLOAD_FOLDER']) if os.path.isdir(config['UPLOAD_FOLDER']) else {}
+        restored = 0
+        for relpath, (size, mtime_ns) in _scan(uploads).items():
+            # Whole seconds: tar archives don't keep sub-second mtimes
+            existing = current.get(relpath)
+            if existing is None or (existing[0], existing[1] // 10**9) != (size, mtime_ns // 10**9):
+                target = os.path.join(config['UPLOAD_FOLDER'], relpath)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(uploads, relpath), target)
+                restored += 1
+        log(f"✓ Uploads restored: {restored:,} files in {time.perf_counter() - started:.2f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Back up and restore the database and uploads')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('create', help='take a new snapshot')
+    commands.add_parser('list', help='list snapshots')
+    archive = commands.add_parser('archive', help='write a snapshot as .tar.gz')
+    archive.add_argument('name')
+    archive.add_argument('-o', '--output', required=True, help="file, or '-' for stdout")
+    archive.add_argument('--level', type=int, default=6, help='gzip level (1 = fastest)')
+    restore_cmd = commands.add_parser('restore', help='restore from a snapshot or .tar.gz')
+    restore_cmd.add_argument('source', help='snapshot name or directory, or a .tar.gz archive')
+    restore_cmd.add_argument('--yes', action='store_true', help='confirm overwriting the current data')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from extensions import response_cache
+
+    app = create_app({'SCHEMA_CHECK': False})
+    config = app.config
+    # Status messages go to stderr so `archive -o -` can stream to stdout
+    log = lambda message: print(message, file=sys.stderr)
+
+    try:
+        if args.command == 'create':
+            manifest = create_snapshot(app, log)
+            log(f"✅ Backup {manifest['name']} created in {config['BACKUP_DIR']}")
+        elif args.command == 'list':
+            for name, manifest in list_snapshots(config['BACKUP_DIR']):
+                print(f"{name}  db {manifest['database_bytes'] / 1e6:>9,.1f} MB  "
+                      f"uploads {len(manifest['files']):>7,} files ({manifest['uploads_copied']:,} new)")
+        elif args.command == 'archive':
+            path = snapshot_dir(config['BACKUP_DIR'], args.name)
+            started = time.perf_counter()
+            out = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+            written = 0
+            try:
+                for chunk in stream_archive(path, args.level):
+                    out.write(chunk)
+                    written += len(chunk)
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+            log(f"✅ Wrote {written / 1e6:,.1f} MB in {time.perf_counter() - started:.2f}s")
+        else:
+            if not args.yes:
+                parser.error('restore overwrites the database and uploads; pass --yes to confirm')
+            source = args.source
+            if not os.path.exists(source):
+                source = snapshot_dir(config['BACKUP_DIR'], source)
+            restore(app, source, log)
+            with app.app_context():
+                response_cache.invalidate()
+            log("✅ Restore complete; restart the server")
+    except BackupError as e:
+        log(f"✗ {e}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Backup and restore timings for the Shri Shyam Public School data
+
+Builds a large throwaway dataset (generated rows plus incompressible
+"photos" in the upload folder), then times a full snapshot while a writer
+thread keeps inserting contact messages, an incremental snapshot after a
+few uploads change, streaming the snapshot as .tar.gz, and a restore.
+Writer latency during the backup is reported next to an idle baseline, to
+show the copy doesn't block the site.
+
+Usage:
+    python benchmarks/backup_restore.py                                   # ~3 GB
+    python benchmarks/backup_restore.py --admissions 200000 --uploads 100  # quick run
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import cleanup_environment, prepare_environment, print_summary, save_baseline, summarize
+from ids import uuid7
+
+def make_uploads(directory, count, size_kb):
+    os.makedirs(os.path.join(directory, 'gallery'), exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(directory, 'gallery', f'photo-{i:05d}.jpg'), 'wb') as f:
+            f.write(os.urandom(size_kb * 1024))
+
+class Writer(threading.Thread):
+    """Inserts a contact message every few milliseconds, recording commit latency"""
+
+    def __init__(self, path, interval=0.005):
+        super().__init__(daemon=True)
+        self.path = path
+        self.interval = interval
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        while not self.stopped.is_set():
+            started = time.perf_counter()
+            conn.execute(
+                "INSERT INTO contact_messages (id, name, email, subject, message, status, submitted_at) "
+                "VALUES (?, 'Visitor', 'visitor@example.com', 'Enquiry', 'Hello', 'unread', datetime('now'))",
+                (uuid7().bytes,))
+            conn.commit()
+            self.samples.append((time.perf_counter() - started, 200))
+            time.sleep(self.interval)
+        conn.close()
+
+    def measure(self, fn):
+        """Run ``fn`` while writing; returns (fn's result, seconds, writer samples)"""
+        self.start()
+        time.sleep(0.5)
+        self.samples.clear()
+        started = time.perf_counter()
+        try:
+            result = fn()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stopped.set()
+            self.join()
+        return result, elapsed, self.samples
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time backups, archives and restores on a large dataset')
+    parser.add_argument('--admissions', type=int, default=2000000)
+    parser.add_argument('--contacts', type=int, default=200000)
+    parser.add_argument('--uploads', type=int, default=500, help='number of upload files')
+    parser.add_argument('--upload-kb', type=int, default=2048, help='size of each upload file')
+    parser.add_argument('--level', type=int, default=6, help='gzip level for the archive')
+    parser.add_argument('--save-baseline', metavar='NAME')
+    args = parser.parse_args(argv)
+
+    workdir = prepare_environment()
+    os.environ['BACKUP_DIR'] = os.path.join(workdir, 'backups')
+    os.environ['UPLOAD_FOLDER'] = os.path.join(workdir, 'uploads')
+    report = {'meta': vars(args), 'timings': {}}
+    timings = report['timings']
+    try:
+        import backup
+        from app import create_app
+        from extensions import db
+        from generate_data import generate
+
+        app = create_app()
+        with app.app_context():
+            with db.engine.connect() as conn:
+                conn.exec_driver_sql('PRAGMA journal_mode=WAL')
+            started = time.perf_counter()
+            generate(db.engine, {'admissions': args.admissions, 'contacts': args.contacts})
+            make_uploads(app.config['UPLOAD_FOLDER'], args.uploads, args.upload_kb)
+            print(f"✓ Dataset built in {time.perf_counter() - started:.1f}s")
+        database = backup.sqlite_path(app)
+        db_mb = os.path.getsize(database) / 1e6
+        uploads_mb = args.uploads * args.upload_kb * 1024 / 1e6
+        print(f"  database {db_mb:,.0f} MB, uploads {uploads_mb:,.0f} MB")
+
+        _, idle_seconds, idle_samples = Writer(database).measure(lambda: time.sleep(2))
+
+        manifest, seconds, busy_samples = Writer(database).measure(lambda: backup.create_snapshot(app, log=print))
+        timings['full_snapshot_s'] = round(seconds, 2)
+        timings['full_snapshot_mb_s'] = round((db_mb + uploads_mb) / seconds, 1)
+
+        # Replace 1% of the photos, then snapshot again
+        make_uploads(app.config['UPLOAD_FOLDER'], max(1, args.uploads // 100), args.upload_kb)
+        started = time.perf_counter()
+        incremental = backup.create_snapshot(app, log=print)
+        timings['incremental_snapshot_s'] = round(time.perf_counter() - started, 2)
+
+        path = os.path.join(app.config['BACKUP_DIR'], incremental['name'])
+        started = time.perf_counter()
+        archive_bytes = sum(len(chunk) for chunk in backup.stream_archive(path, args.level))
+        timings['archive_s'] = round(time.perf_counter() - started, 2)
+        timings['archive_mb'] = round(archive_bytes / 1e6, 1)
+
+        started = time.perf_counter()
+        backup.restore(app, os.path.join(app.config['BACKUP_DIR'], manifest['name']), log=print)
+        timings['restore_s'] = round(time.perf_counter() - started, 2)
+
+        report['writes'] = dict(summarize({'write (idle)': idle_samples}, idle_seconds),
+                                **summarize({'write (during backup)': busy_samples}, seconds))
+        print_summary(report['writes'], 'Contact message commits, idle vs during the full snapshot')
+        print(f"\n{'step':<28}{'result':>14}")
+        for name, value in timings.items():
+            print(f"{name:<28}{value:>14,}")
+
+        if args.save_baseline:
+            save_baseline(args.save_baseline, report)
+    finally:
+        cleanup_environment(workdir)
+
+if __name__ == '__main__':
+    sys.exit(main())
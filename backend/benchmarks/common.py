@@ -0,0 +1,183 @@
+"""
+Shared helpers for the backend benchmarks: isolated database setup,
+HTTP targets (in-process Werkzeug client or a real gunicorn server),
+latency summaries and JSON baselines.
+"""
+
+import json
+import math
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+def prepare_environment(database_url=None):
+    """Point the app at a throwaway database and state directories.
+
+    Must run before ``app`` is imported, since the app reads its
+    configuration from the environment at import time.
+    """
+    workdir = tempfile.mkdtemp(prefix='ssps-bench-')
+    os.environ['DATABASE_URL'] = database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['METRICS_DIR'] = os.path.join(workdir, 'metrics')
+    os.environ['RESPONSE_CACHE_DIR'] = os.path.join(workdir, 'cache')
+    os.environ['RATE_LIMIT_DIR'] = os.path.join(workdir, 'ratelimit')
+    # A VACUUM or checkpoint mid-run would skew the numbers
+    os.environ['MAINTENANCE'] = '0'
+    os.environ['MAINTENANCE_DIR'] = os.path.join(workdir, 'maintenance')
+    return workdir
+
+def cleanup_environment(workdir):
+    shutil.rmtree(workdir, ignore_errors=True)
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+def summarize(samples, wall_time):
+    """Summarize {name: [(seconds, status), ...]} into per-endpoint statistics"""
+    summary = {}
+    for name, values in sorted(samples.items()):
+        latencies = sorted(seconds for seconds, _ in values)
+        errors = sum(1 for _, status in values if status >= 500 or status == 0)
+        summary[name] = {
+            'count': len(values),
+            'errors': errors,
+            'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'throughput_rps': round(len(values) / wall_time, 2) if wall_time else 0.0,
+        }
+    return summary
+
+def print_summary(summary, title):
+    print(f"\n{title}")
+    print(f"{'endpoint':<28}{'count':>8}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for name, stats in summary.items():
+        print(f"{name:<28}{stats['count']:>8}{stats['errors']:>6}{stats['p50_ms']:>10.2f}"
+              f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['throughput_rps']:>10.1f}")
+
+def baseline_path(name):
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f'{name}.json')
+
+def save_baseline(name, report):
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"✓ Saved baseline to {path}")
+
+def compare_baseline(name, summary):
+    """Print p95 and throughput changes relative to a stored baseline"""
+    with open(baseline_path(name)) as f:
+        baseline = json.load(f)['endpoints']
+
+    def change(new, old):
+        return f"{(new - old) / old * 100:+.1f}%" if old else 'n/a'
+
+    print(f"\nComparison with baseline '{name}'")
+    print(f"{'endpoint':<28}{'p95 ms':>12}{'Δ p95':>10}{'req/s':>12}{'Δ req/s':>10}")
+    for endpoint, stats in summary.items():
+        old = baseline.get(endpoint)
+        if old is None:
+            print(f"{endpoint:<28}{stats['p95_ms']:>12.2f}{'new':>10}{stats['throughput_rps']:>12.1f}{'new':>10}")
+            continue
+        print(f"{endpoint:<28}{stats['p95_ms']:>12.2f}{change(stats['p95_ms'], old['p95_ms']):>10}"
+              f"{stats['throughput_rps']:>12.1f}{change(stats['throughput_rps'], old['throughput_rps']):>10}")
+
+class ClientTarget:
+    """Sends requests through the in-process Werkzeug test client"""
+
+    name = 'client'
+
+    def __init__(self, app):
+        self.app = app
+
+    def session(self):
+        client = self.app.test_client()
+
+        def send(method, path, json_body=None, headers=None):
+            response = client.open(path, method=method, json=json_body, headers=headers)
+            return response.status_code, response.get_json(silent=True)
+        return send
+
+    def close(self):
+        pass
+
+class GunicornTarget:
+    """Starts ``gunicorn app:app`` on a free port and sends real HTTP requests"""
+
+    name = 'gunicorn'
+
+    def __init__(self, workers=4, extra_args=()):
+        if shutil.which('gunicorn') is None:
+            raise RuntimeError('gunicorn is not installed (pip install gunicorn)')
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        self.base_url = f'http://127.0.0.1:{port}'
+        self.process = subprocess.Popen(
+            ['gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}', *extra_args, 'app:app'],
+            cwd=BACKEND_DIR, env=os.environ.copy(),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        self._wait_until_ready()
+
+    def _wait_until_ready(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError('gunicorn exited during startup')
+            try:
+                urllib.request.urlopen(f'{self.base_url}/api/health', timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.1)
+        self.close()
+        raise RuntimeError('gunicorn did not become ready in time')
+
+    def session(self):
+        def send(method, path, json_body=None, headers=None):
+            data = json.dumps(json_body).encode() if json_body is not None else None
+            request = urllib.request.Request(f'{self.base_url}{path}', data=data, method=method)
+            if data is not None:
+                request.add_header('Content-Type', 'application/json')
+            for key, value in (headers or {}).items():
+                request.add_header(key, value)
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    body = response.read()
+                    status = response.status
+            except urllib.error.HTTPError as e:
+                body = e.read()
+                status = e.code
+            except OSError:
+                return 0, None
+            try:
+                return status, json.loads(body)
+            except ValueError:
+                return status, None
+        return send
+
+    def close(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
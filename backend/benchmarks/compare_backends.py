@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+SQLite vs PostgreSQL comparison for the Shri Shyam Public School API
+
+For each database backend this migrates a fresh schema, runs an API check
+matrix (every route with its expected status code, including the
+PostgreSQL-specific paths: RETURNING updates, server-side cursor exports
+and ON CONFLICT upserts), seeds the same data and replays the load_test.py
+traffic mix. The results are printed side by side.
+
+The PostgreSQL database must be a throwaway one: its application tables are
+dropped before the run. Its name has to contain "test" or "bench" unless
+--force is given.
+
+Usage:
+    python benchmarks/compare_backends.py --postgres-url postgresql://localhost/ssps_bench
+    python benchmarks/compare_backends.py --postgres-url postgresql://localhost/ssps_bench \\
+        --target gunicorn --concurrency 16 --requests 5000
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import (ClientTarget, GunicornTarget, cleanup_environment, prepare_environment,
+                    print_summary, save_baseline, summarize)
+
+APP_TABLES = ['schema_version', 'admins', 'news', 'admissions', 'contact_messages', 'admissions_archive',
+              'contact_messages_archive', 'events', 'results', 'toppers', 'gallery', 'faculty', 'faculty_subjects',
+              'maintenance_runs', 'idempotency_keys', 'admission_counts', 'admission_search',
+              'message_counts']
+
+def reset_database(url):
+    """Drop the application's tables so migrations start from scratch"""
+    import sqlalchemy as sa
+
+    engine = sa.create_engine(url)
+    meta = sa.MetaData()
+    with engine.begin() as conn:
+        meta.reflect(conn, only=[name for name in APP_TABLES if sa.inspect(conn).has_table(name)])
+        meta.drop_all(conn)
+    engine.dispose()
+
+def check_matrix(app):
+    """Call every route once; returns a list of (check, expected, actual) failures"""
+    from extensions import db
+    from models import Admission, ContactMessage
+
+    client = app.test_client()
+    token = client.post('/api/auth/login', json={'username': 'admin', 'password': 'admin123'}).get_json()
+    admin = {'Authorization': f"Bearer {token['access_token']}"}
+    with app.app_context():
+        admission_id = db.session.query(Admission.id).limit(1).scalar()
+        message_id = db.session.query(ContactMessage.id).limit(1).scalar()
+
+    news = {'title': 'Matrix check notice', 'content': 'Checking every route'}
+    event = {'title': 'Matrix check event', 'description': 'Check', 'event_date': '2030-01-15', 'location': 'Hall'}
+    result = {'class_level': '10', 'year': 2031, 'pass_rate': '99%'}
+    faculty = {'name': 'Matrix Check Teacher', 'position': 'Teacher', 'qualifications': 'M.Sc.',
+               'subjects': ['Physics', 'Chemistry']}
+    admission = {
+        'studentName': 'Matrix Student', 'classApplying': '5', 'dateOfBirth': '2015-06-15', 'gender': 'female',
+        'fatherName': 'Ramesh Kumar', 'motherName': 'Sita Devi', 'phone': '9876543210',
+        'email': 'parent@example.com', 'address': 'Kushalpura, Rajasthan',
+    }
+    contact = {'name': 'Visitor', 'email': 'visitor@example.com', 'subject': 'Enquiry', 'message': 'Hello'}
+
+    checks = [
+        ('health', 'GET', '/api/health', None, None, 200),
+        ('news', 'GET', '/api/news', None, None, 200),
+        ('news by priority', 'GET', '/api/news?order=priority&limit=5', None, None, 200),
+        ('events', 'GET', '/api/events', None, None, 200),
+        ('results', 'GET', '/api/results', None, None, 200),
+        ('result trends', 'GET', '/api/results/trends', None, None, 200),
+        ('gallery', 'GET', '/api/gallery', None, None, 200),
+        ('faculty', 'GET', '/api/faculty', None, None, 200),
+        ('faculty by subject', 'GET', '/api/faculty?subject=physics&position=Teacher', None, None, 200),
+        ('submit admission', 'POST', '/api/admissions', admission, None, 201),
+        ('duplicate admission', 'POST', '/api/admissions', admission, None, 409),
+        ('submit contact', 'POST', '/api/contact', contact, {'Idempotency-Key': 'matrix-contact'}, 201),
+        ('replay contact', 'POST', '/api/contact', contact, {'Idempotency-Key': 'matrix-contact'}, 201),
+        ('auth me', 'GET', '/api/auth/me', None, admin, 200),
+        ('create news', 'POST', '/api/news', news, admin, 201),
+        ('duplicate news', 'POST', '/api/news', news, admin, 409),
+        ('create event', 'POST', '/api/events', event, admin, 201),
+        ('duplicate event', 'POST', '/api/events', event, admin, 409),
+        ('create result', 'POST', '/api/results', result, admin, 201),
+        ('duplicate result', 'POST', '/api/results', result, admin, 409),
+        ('create faculty', 'POST', '/api/faculty', faculty, admin, 201),
+        ('duplicate faculty', 'POST', '/api/faculty', faculty, admin, 409),
+        ('list admissions', 'GET', '/api/admissions?status=pending&page=2&limit=20', None, admin, 200),
+        ('list contact', 'GET', '/api/contact?page=1&limit=20', None, admin, 200),
+        ('triage contact', 'PATCH', '/api/contact', {'ids': [message_id], 'status': 'read'}, admin, 200),
+        ('reply contact', 'PATCH', '/api/contact', {'ids': [message_id], 'reply': 'Thank you'}, admin, 200),
+        ('triage bad status', 'PATCH', '/api/contact', {'ids': [message_id], 'status': 'done'}, admin, 400),
+        ('update status', 'PUT', f'/api/admissions/{admission_id}/status', {'status': 'approved'}, admin, 200),
+        ('update missing', 'PUT', '/api/admissions/missing/status', {'status': 'approved'}, admin, 404),
+        ('export admissions', 'GET', '/api/admissions/export', None, admin, 200),
+        ('admission analytics', 'GET', '/api/admissions/analytics?from=2025-01-01', None, admin, 200),
+        ('search admissions', 'GET', '/api/admissions/search?q=matrx%20studnt', None, admin, 200),
+        ('dashboard stats', 'GET', '/api/dashboard/stats', None, admin, 200),
+        ('unknown route', 'GET', '/api/missing', None, None, 404),
+    ]
+    failures = []
+    for name, method, path, body, headers, expected in checks:
+        response = client.open(path, method=method, json=body, headers=headers)
+        response.get_data()  # drain streamed responses
+        if response.status_code != expected:
+            failures.append((name, expected, response.status_code))
+    return len(checks), failures
+
+def check_upsert(app):
+    """Re-import the same rows; the natural-key upsert must not duplicate them"""
+    from extensions import db
+    from init_database import upsert_rows
+    from models import News
+
+    rows = [{'title': f'Upsert check {i}', 'content': 'First'} for i in range(50)]
+    with app.app_context():
+        upsert_rows(News, rows)
+        upsert_rows(News, [dict(row, content='Second') for row in rows], update_existing=True)
+        count = News.query.filter(News.title.like('Upsert check %')).count()
+        updated = News.query.filter(News.title.like('Upsert check %'), News.content == 'Second').count()
+        db.session.remove()
+    return count == 50 and updated == 50
+
+def run_backend(name, url, args):
+    from app import create_app
+    from extensions import db
+    from load_test import build_operations, run, seed_database
+
+    print(f"\n=== {name}: {url.split('@')[-1]}")
+    os.environ['DATABASE_URL'] = url
+    if not url.startswith('sqlite'):
+        reset_database(url)
+    # Compare the databases, not the response cache or the rate limiter
+    app = create_app({'SQLALCHEMY_DATABASE_URI': url, 'RESPONSE_CACHE_BACKEND': 'none', 'RATE_LIMIT_ENABLED': False})
+    seed_database(app, db, args.scale, args.seed)
+
+    total, failures = check_matrix(app)
+    upsert_ok = check_upsert(app)
+    print(f"{'✓' if not failures else '✗'} {total - len(failures)}/{total} route checks passed")
+    for check, expected, actual in failures:
+        print(f"  ✗ {check}: expected {expected}, got {actual}")
+    print(f"{'✓' if upsert_ok else '✗'} natural-key upsert")
+
+    target = ClientTarget(app) if args.target == 'client' else GunicornTarget(args.workers)
+    try:
+        samples, wall_time = run(target, build_operations(args.requests, args.seed),
+                                 args.concurrency, args.seed, args.scale)
+    finally:
+        target.close()
+    summary = summarize(samples, wall_time)
+    print_summary(summary, f"{name}: {args.requests:,} operations in {wall_time:.2f}s")
+    return {'checks_failed': len(failures), 'upsert_ok': upsert_ok, 'endpoints': summary}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the check matrix and load profile on SQLite and PostgreSQL')
+    parser.add_argument('--postgres-url', required=True, help='throwaway PostgreSQL database URL')
+    parser.add_argument('--force', action='store_true', help='allow a database name without "test"/"bench"')
+    parser.add_argument('--target', choices=['client', 'gunicorn'], default='client')
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save-baseline', metavar='NAME')
+    args = parser.parse_args(argv)
+
+    import sqlalchemy as sa
+    from config import Config
+
+    postgres_url = sa.engine.make_url(args.postgres_url.replace('postgres://', 'postgresql://', 1))
+    if not args.force and not any(word in (postgres_url.database or '') for word in ('test', 'bench')):
+        parser.error('refusing to drop tables in a database whose name lacks "test" or "bench" (use --force)')
+
+    workdir = prepare_environment()
+    os.environ['RESPONSE_CACHE'] = 'none'
+    os.environ['RATE_LIMIT'] = '0'
+    try:
+        backends = {
+            'sqlite': Config.SQLALCHEMY_DATABASE_URI,  # the throwaway file from prepare_environment
+            'postgresql': postgres_url.render_as_string(hide_password=False),
+        }
+        report = {'meta': {k: v for k, v in vars(args).items() if k != 'postgres_url'}, 'backends': {}}
+        for name, url in backends.items():
+            report['backends'][name] = run_backend(name, url, args)
+
+        sqlite, postgres = report['backends']['sqlite']['endpoints'], report['backends']['postgresql']['endpoints']
+        print(f"\n{'endpoint':<28}{'sqlite p95':>12}{'pg p95':>10}{'sqlite req/s':>14}{'pg req/s':>10}")
+        for endpoint in sorted(set(sqlite) | set(postgres)):
+            a, b = sqlite.get(endpoint, {}), postgres.get(endpoint, {})
+            print(f"{endpoint:<28}{a.get('p95_ms', 0):>12.2f}{b.get('p95_ms', 0):>10.2f}"
+                  f"{a.get('throughput_rps', 0):>14.1f}{b.get('throughput_rps', 0):>10.1f}")
+
+        if args.save_baseline:
+            save_baseline(args.save_baseline, report)
+        failed = any(r['checks_failed'] or not r['upsert_ok'] for r in report['backends'].values())
+        return 1 if failed else 0
+    finally:
+        cleanup_environment(workdir)
+
+if __name__ == '__main__':
+    sys.exit(main())
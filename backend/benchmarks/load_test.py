@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Load test for the Shri Shyam Public School API
+
+Seeds a throwaway database at a configurable scale and replays a
+deterministic traffic mix against either the in-process Werkzeug test
+client or a real gunicorn server, then reports p50/p95/p99 latency and
+throughput per endpoint.
+
+Usage:
+    python benchmarks/load_test.py --target client --scale 1 --requests 2000
+    python benchmarks/load_test.py --target gunicorn --workers 4 --concurrency 16
+    python benchmarks/load_test.py --save-baseline main
+    python benchmarks/load_test.py --compare main
+    python benchmarks/load_test.py --target gunicorn --cache mmap
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import (ClientTarget, GunicornTarget, cleanup_environment, compare_baseline,
+                    prepare_environment, print_summary, save_baseline, summarize)
+
+# Traffic phases: share of all operations and operation weights within the phase
+PHASES = [
+    ('normal', 0.60, {'homepage': 70, 'gallery': 6, 'faculty': 6, 'admission': 3,
+                      'contact': 5, 'admin_admissions': 5, 'admin_contact': 3, 'admin_stats': 2}),
+    ('results_day', 0.25, {'results': 70, 'homepage': 25, 'contact': 5}),
+    ('admission_burst', 0.15, {'admission': 45, 'contact': 20, 'homepage': 30, 'admin_admissions': 5}),
+]
+
+CLASSES = ['Nursery', 'LKG', 'UKG'] + [str(n) for n in range(1, 12)]
+
+def seed_database(app, db, scale, seed):
+    """Insert scale-proportional content into the freshly migrated database"""
+    from generate_data import generate
+
+    counts = {'admissions': 1000 * scale, 'contacts': 500 * scale, 'news': 50 * scale,
+              'events': 20 * scale, 'gallery': 100 * scale, 'toppers': 10 * scale}
+    with app.app_context():
+        for table, (rows, seconds) in generate(db.engine, counts, seed=seed).items():
+            print(f"✓ Seeded {rows:,} {table} in {seconds:.2f}s")
+
+def build_operations(total, seed):
+    """Expand the phase mix into a deterministic list of operations"""
+    rng = random.Random(seed)
+    operations = []
+    for _, share, weights in PHASES:
+        names = list(weights)
+        operations.extend(rng.choices(names, weights=[weights[n] for n in names], k=int(total * share)))
+    return operations
+
+def make_requests(operation, rng, admin_headers, scale):
+    """Return the (label, method, path, body, headers) requests an operation sends"""
+    if operation == 'homepage':
+        # The homepage fetches news, events and results on load
+        return [('GET /api/news', 'GET', '/api/news', None, None),
+                ('GET /api/events', 'GET', '/api/events', None, None),
+                ('GET /api/results', 'GET', '/api/results', None, None)]
+    if operation == 'results':
+        return [('GET /api/results', 'GET', '/api/results', None, None)]
+    if operation == 'gallery':
+        return [('GET /api/gallery', 'GET', '/api/gallery', None, None)]
+    if operation == 'faculty':
+        return [('GET /api/faculty', 'GET', '/api/faculty', None, None)]
+    if operation == 'admission':
+        body = {
+            'studentName': f'Student {rng.randint(1, 10**9)}', 'classApplying': rng.choice(CLASSES),
+            'dateOfBirth': '2015-06-15', 'gender': 'female', 'fatherName': 'Ramesh Kumar',
+            'motherName': 'Sita Devi', 'phone': f'98{rng.randint(10000000, 99999999)}',
+            'email': 'parent@example.com', 'address': 'Kushalpura, Rajasthan',
+        }
+        return [('POST /api/admissions', 'POST', '/api/admissions', body, None)]
+    if operation == 'contact':
+        body = {'name': 'Visitor', 'email': 'visitor@example.com',
+                'subject': 'Enquiry', 'message': f'Question {rng.randint(1, 10**9)}'}
+        return [('POST /api/contact', 'POST', '/api/contact', body, None)]
+    if operation == 'admin_admissions':
+        page = rng.randint(1, max(1, 50 * scale))
+        return [('GET /api/admissions', 'GET', f'/api/admissions?page={page}&limit=20', None, admin_headers)]
+    if operation == 'admin_contact':
+        page = rng.randint(1, max(1, 25 * scale))
+        return [('GET /api/contact', 'GET', f'/api/contact?page={page}&limit=20', None, admin_headers)]
+    if operation == 'admin_stats':
+        return [('GET /api/dashboard/stats', 'GET', '/api/dashboard/stats', None, admin_headers)]
+    raise ValueError(operation)
+
+def run(target, operations, concurrency, seed, scale):
+    send = target.session()
+    status, body = send('POST', '/api/auth/login', {'username': 'admin', 'password': 'admin123'})
+    if status != 200:
+        raise RuntimeError(f'Admin login failed with status {status}')
+    admin_headers = {'Authorization': f"Bearer {body['access_token']}"}
+
+    samples = {}
+    samples_lock = threading.Lock()
+    local = threading.local()
+
+    def execute(index):
+        if not hasattr(local, 'send'):
+            local.send = target.session()
+        rng = random.Random(seed * 1_000_003 + index)
+        for label, method, path, body, headers in make_requests(operations[index], rng, admin_headers, scale):
+            start = time.perf_counter()
+            status, _ = local.send(method, path, body, headers)
+            elapsed = time.perf_counter() - start
+            with samples_lock:
+                samples.setdefault(label, []).append((elapsed, status))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(execute, range(len(operations))))
+    return samples, time.perf_counter() - started
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a realistic traffic mix against the API')
+    parser.add_argument('--target', choices=['client', 'gunicorn'], default='client')
+    parser.add_argument('--scale', type=int, default=1, help='content scale factor (1 = 1,000 admissions)')
+    parser.add_argument('--requests', type=int, default=2000, help='number of operations to replay')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker count')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache', choices=['memory', 'sqlite', 'mmap', 'none'], default='memory',
+                        help='response cache backend')
+    parser.add_argument('--rate-limit', action='store_true',
+                        help='keep per-IP rate limits on (all traffic comes from one IP)')
+    parser.add_argument('--save-baseline', metavar='NAME', help='store the report as a JSON baseline')
+    parser.add_argument('--compare', metavar='NAME', help='compare against a stored baseline')
+    args = parser.parse_args(argv)
+
+    workdir = prepare_environment()
+    os.environ['RESPONSE_CACHE'] = args.cache
+    os.environ['RATE_LIMIT'] = '1' if args.rate_limit else '0'
+    target = None
+    try:
+        from app import create_app
+        from extensions import db
+
+        app = create_app()
+        seed_database(app, db, args.scale, args.seed)
+        operations = build_operations(args.requests, args.seed)
+
+        target = ClientTarget(app) if args.target == 'client' else GunicornTarget(args.workers)
+        samples, wall_time = run(target, operations, args.concurrency, args.seed, args.scale)
+        summary = summarize(samples, wall_time)
+
+        total = sum(stats['count'] for stats in summary.values())
+        print_summary(summary, f"{args.target}: {total:,} requests in {wall_time:.2f}s "
+                               f"({total / wall_time:.1f} req/s, concurrency {args.concurrency})")
+
+        report = {
+            'meta': {
+                'target': args.target, 'scale': args.scale, 'requests': args.requests,
+                'concurrency': args.concurrency, 'workers': args.workers if args.target == 'gunicorn' else 1,
+                'seed': args.seed, 'cache': args.cache, 'wall_time_s': round(wall_time, 3),
+                'recorded_at': datetime.utcnow().isoformat(),
+            },
+            'endpoints': summary,
+        }
+        if args.compare:
+            compare_baseline(args.compare, summary)
+        if args.save_baseline:
+            save_baseline(args.save_baseline, report)
+    finally:
+        if target is not None:
+            target.close()
+        cleanup_environment(workdir)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Primary key layout: 36-character UUIDv4 strings vs 16-byte UUIDv7 keys
+
+Builds two throwaway SQLite databases with the same generated admissions:
+one at schema version 6 (random UUIDv4 keys stored as text, as before
+migration 7) and one at version 7 (UUIDv7 keys of each row's submission
+time, in 16 bytes), so nothing but the keys differs. For each it times the
+bulk load, then single-row commits into the full table (how POST
+/api/admissions writes) and primary key lookups, and reports table and
+index sizes from ``dbstat``. Finally the version 6 database is upgraded in
+place to version 7 to time migration 7 alone.
+
+Usage:
+    python benchmarks/primary_keys.py                        # 1M admissions
+    python benchmarks/primary_keys.py --admissions 100000    # quick run
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import cleanup_environment, prepare_environment, print_summary, save_baseline, summarize
+from ids import uuid7
+
+# Both layouts are built at the versions either side of migration 7, which changed the keys
+KEY_MIGRATION = 7
+
+LAYOUTS = {
+    # name: (schema version, key for a new row, stored key of a generated row's UUIDv7)
+    'uuid4-text': (KEY_MIGRATION - 1, lambda: str(uuid.uuid4()), lambda value: str(uuid.uuid4())),
+    'uuid7-blob': (KEY_MIGRATION, lambda: uuid7().bytes, lambda value: value.bytes),
+}
+
+def build(path, version, generated_key, count, seed):
+    """Migrate a fresh database to ``version`` and bulk-load ``count`` admissions; returns seconds"""
+    import sqlalchemy as sa
+    from generate_data import ADMISSION_COLUMNS, _Picker, admission_rows, bulk_insert
+    from migrations import upgrade
+
+    engine = sa.create_engine(f'sqlite:///{path}')
+    upgrade(engine, target=version, log=lambda message: None)
+    picker = _Picker(random.Random(seed), lambda value: value.isoformat(' ', 'microseconds'),
+                     lambda value: value.isoformat(), generated_key)
+    started = time.perf_counter()
+    bulk_insert(engine, sa.table('admissions'), ADMISSION_COLUMNS, admission_rows(picker, count, datetime(2025, 6, 1)))
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+    return elapsed
+
+def table_sizes(path):
+    """{btree name: bytes} for the admissions table and its indexes"""
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat WHERE name = 'admissions' "
+                                 "OR name IN (SELECT name FROM sqlite_master WHERE tbl_name = 'admissions') "
+                                 "GROUP BY name ORDER BY name"))
+
+def single_inserts(path, new_key, count):
+    """Commit ``count`` one-row inserts into the loaded table; returns latency samples"""
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    row = conn.execute('SELECT * FROM admissions LIMIT 1').fetchone()
+    sql = f"INSERT INTO admissions VALUES ({', '.join('?' * len(row))})"
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        conn.execute(sql, (new_key(),) + row[1:])
+        conn.commit()
+        samples.append((time.perf_counter() - started, 200))
+    conn.close()
+    return samples
+
+def lookups(path, count, seed):
+    """Fetch ``count`` random admissions by primary key from a cold connection"""
+    conn = sqlite3.connect(path)
+    ids = [row[0] for row in conn.execute('SELECT id FROM admissions')]
+    keys = random.Random(seed).sample(ids, min(count, len(ids)))
+    conn.close()
+    conn = sqlite3.connect(path)
+    samples = []
+    for key in keys:
+        started = time.perf_counter()
+        conn.execute('SELECT * FROM admissions WHERE id = ?', (key,)).fetchone()
+        samples.append((time.perf_counter() - started, 200))
+    conn.close()
+    return samples
+
+def _summary(samples):
+    # Sequential samples: the wall time is just their sum
+    return summarize({'': samples}, sum(seconds for seconds, _ in samples))['']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare UUIDv4 text keys with 16-byte UUIDv7 keys')
+    parser.add_argument('--admissions', type=int, default=1000000)
+    parser.add_argument('--inserts', type=int, default=5000, help='single-row commits after the bulk load')
+    parser.add_argument('--lookups', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save-baseline', metavar='NAME')
+    args = parser.parse_args(argv)
+
+    workdir = prepare_environment()
+    try:
+        report = {'meta': vars(args), 'layouts': {}}
+        for name, (version, new_key, generated_key) in LAYOUTS.items():
+            path = os.path.join(workdir, f'{name}.db')
+            load_seconds = build(path, version, generated_key, args.admissions, args.seed)
+            sizes = table_sizes(path)
+            insert_summary = _summary(single_inserts(path, new_key, args.inserts))
+            lookup_summary = _summary(lookups(path, args.lookups, args.seed))
+            report['layouts'][name] = {
+                'load_seconds': round(load_seconds, 2),
+                'load_rows_per_second': round(args.admissions / load_seconds),
+                'sizes_mb': {btree: round(size / 1e6, 1) for btree, size in sizes.items()},
+                'insert': insert_summary,
+                'lookup': lookup_summary,
+            }
+            print(f"\n=== {name}: {args.admissions:,} admissions loaded in {load_seconds:.2f}s "
+                  f"({args.admissions / load_seconds:,.0f} rows/s)")
+            for btree, size in sizes.items():
+                print(f"  {btree:<45} {size / 1e6:>8.1f} MB")
+            print(f"  {'total':<45} {sum(sizes.values()) / 1e6:>8.1f} MB")
+            print_summary({'single-row insert': insert_summary, 'lookup by id': lookup_summary}, name)
+
+        import sqlalchemy as sa
+        from migrations import upgrade
+
+        engine = sa.create_engine(f"sqlite:///{os.path.join(workdir, 'uuid4-text.db')}")
+        started = time.perf_counter()
+        upgrade(engine, target=KEY_MIGRATION, log=lambda message: None)
+        migrate_seconds = time.perf_counter() - started
+        engine.dispose()
+        migrated = sum(table_sizes(os.path.join(workdir, 'uuid4-text.db')).values())
+        report['migration_7_seconds'] = round(migrate_seconds, 2)
+        print(f"\n✓ Migration 7 on {args.admissions:,} admissions: {migrate_seconds:.2f}s, "
+              f"admissions and indexes now {migrated / 1e6:.1f} MB")
+
+        if args.save_baseline:
+            save_baseline(args.save_baseline, report)
+    finally:
+        cleanup_environment(workdir)
+
+if __name__ == '__main__':
+    main()
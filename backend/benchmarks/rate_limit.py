@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Rate limiter benchmark for the Shri Shyam Public School API
+
+Measures the cost of one limiter check on its own, the aggregate check rate
+when several processes share the bucket table (as gunicorn workers do), the
+latency it adds to POST /api/contact, and how a single flooding IP is held
+back while other visitors still get through.
+
+Usage:
+    python benchmarks/rate_limit.py
+    python benchmarks/rate_limit.py --checks 200000 --processes 4
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import cleanup_environment, percentile, prepare_environment, save_baseline
+
+def _table(slots=65536):
+    from ratelimit import BucketTable
+    os.makedirs(os.environ['RATE_LIMIT_DIR'], exist_ok=True)
+    return BucketTable(os.path.join(os.environ['RATE_LIMIT_DIR'], 'bench-buckets'), slots)
+
+def check_loop(args):
+    """Run ``checks`` limiter checks over ``keys`` client IPs; returns elapsed seconds"""
+    worker, checks, keys = args
+    table = _table()
+    started = time.perf_counter()
+    for i in range(checks):
+        table.take(f'public.submit_contact|10.{worker}.{i % keys // 256}.{i % 256}', 5, 5 / 60)
+    return time.perf_counter() - started
+
+def post_contact_latencies(app, requests):
+    client = app.test_client()
+    body = {'name': 'Visitor', 'email': 'visitor@example.com', 'subject': 'Enquiry', 'message': 'Hello'}
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        client.post('/api/contact', json=body, environ_base={'REMOTE_ADDR': f'10.1.{i // 256 % 256}.{i % 256}'})
+        latencies.append(time.perf_counter() - started)
+    return sorted(latencies)
+
+def flood(app, bot_requests, visitors):
+    """One IP posts ``bot_requests`` times; each visitor IP posts once"""
+    client = app.test_client()
+    body = {'name': 'Visitor', 'email': 'visitor@example.com', 'subject': 'Enquiry', 'message': 'Hello'}
+    bot = {}
+    for _ in range(bot_requests):
+        status = client.post('/api/contact', json=body, environ_base={'REMOTE_ADDR': '203.0.113.9'}).status_code
+        bot[status] = bot.get(status, 0) + 1
+    served = sum(client.post('/api/contact', json=body,
+                             environ_base={'REMOTE_ADDR': f'198.51.100.{i}'}).status_code == 201
+                 for i in range(1, visitors + 1))
+    return bot, served
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure rate limiter overhead')
+    parser.add_argument('--checks', type=int, default=100000, help='limiter checks per process')
+    parser.add_argument('--keys', type=int, default=10000, help='distinct client IPs')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=1000, help='POST /api/contact requests per variant')
+    parser.add_argument('--save-baseline', metavar='NAME')
+    args = parser.parse_args(argv)
+
+    workdir = prepare_environment()
+    try:
+        from app import create_app
+        results = {}
+
+        elapsed = check_loop((0, args.checks, args.keys))
+        results['check_us'] = round(elapsed / args.checks * 1e6, 3)
+
+        with Pool(args.processes) as pool:
+            started = time.perf_counter()
+            pool.map(check_loop, [(w, args.checks, args.keys) for w in range(args.processes)])
+            wall = time.perf_counter() - started
+        results[f'shared_checks_per_s_{args.processes}_procs'] = round(args.processes * args.checks / wall)
+
+        # Same requests with the limiter off and with a limit too high to trigger
+        for name, overrides in (('off', {'RATE_LIMIT_ENABLED': False}),
+                                ('on', {'RATE_LIMIT_CONTACT': '1000000/second'})):
+            latencies = post_contact_latencies(create_app(overrides), args.requests)
+            results[f'contact_p50_ms_limiter_{name}'] = round(percentile(latencies, 50) * 1000, 3)
+            results[f'contact_mean_ms_limiter_{name}'] = round(statistics.mean(latencies) * 1000, 3)
+
+        bot, served = flood(create_app({'RATE_LIMIT_CONTACT': '5/minute'}), 200, 50)
+        results['flood_bot_accepted'] = bot.get(201, 0)
+        results['flood_bot_rejected_429'] = bot.get(429, 0)
+        results['flood_visitors_served_of_50'] = served
+
+        print("\nRate limiter")
+        for key, value in results.items():
+            print(f"{key:<36}{value:>14}")
+
+        if args.save_baseline:
+            save_baseline(args.save_baseline, {'meta': vars(args), 'ratelimit': results})
+    finally:
+        cleanup_environment(workdir)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Mixed read/write concurrency benchmark for the Shri Shyam Public School API
+
+Runs reader threads (public GETs, response cache off) next to writer
+threads (admission submissions and admin news posts) for a fixed time,
+once with the read/write engine split and once with a single shared pool,
+and reports read latency and write throughput for both.
+
+Usage:
+    python benchmarks/read_write.py --readers 8 --writers 2 --duration 10
+    python benchmarks/read_write.py --target gunicorn --workers 2 --threads 8
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import (ClientTarget, GunicornTarget, cleanup_environment, prepare_environment,
+                    print_summary, save_baseline, summarize)
+
+READS = ['/api/news', '/api/events', '/api/results', '/api/faculty']
+
+def run_variant(target, readers, writers, duration):
+    send = target.session()
+    status, body = send('POST', '/api/auth/login', {'username': 'admin', 'password': 'admin123'})
+    if status != 200:
+        raise RuntimeError(f'Admin login failed with status {status}')
+    admin_headers = {'Authorization': f"Bearer {body['access_token']}"}
+
+    samples = {}
+    lock = threading.Lock()
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration
+
+    def record(label, started, status):
+        elapsed = time.perf_counter() - started
+        with lock:
+            samples.setdefault(label, []).append((elapsed, status))
+
+    def reader(index):
+        send = target.session()
+        for path in itertools.cycle(READS[index % len(READS):] + READS[:index % len(READS)]):
+            if time.perf_counter() >= deadline:
+                return
+            started = time.perf_counter()
+            status, _ = send('GET', path)
+            record(f'GET {path}', started, status)
+
+    def writer(index):
+        send = target.session()
+        while time.perf_counter() < deadline:
+            n = next(counter)
+            started = time.perf_counter()
+            if n % 4:
+                status, _ = send('POST', '/api/admissions', {
+                    'studentName': f'Student {n}', 'classApplying': '5', 'dateOfBirth': '2015-06-15',
+                    'gender': 'female', 'fatherName': 'Ramesh Kumar', 'motherName': 'Sita Devi',
+                    'phone': f'98{n:08d}', 'email': 'parent@example.com', 'address': 'Kushalpura, Rajasthan',
+                })
+                record('POST /api/admissions', started, status)
+            else:
+                status, _ = send('POST', '/api/news', {'title': f'Notice {n} {time.time()}', 'content': 'Update'},
+                                 admin_headers)
+                record('POST /api/news', started, status)
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, time.perf_counter() - started)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare read latency under concurrent writes, split vs shared pool')
+    parser.add_argument('--target', choices=['client', 'gunicorn'], default='client')
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per variant')
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn worker count')
+    parser.add_argument('--threads', type=int, default=8, help='threads per gunicorn worker')
+    parser.add_argument('--save-baseline', metavar='NAME')
+    args = parser.parse_args(argv)
+
+    workdir = prepare_environment()
+    # Measure the database, not the response cache or the rate limiter
+    os.environ['RESPONSE_CACHE'] = 'none'
+    os.environ['RATE_LIMIT'] = '0'
+    report = {'meta': vars(args), 'variants': {}}
+    try:
+        from app import create_app
+        from extensions import db
+        from load_test import seed_database
+
+        seed_database(create_app(), db, args.scale, seed=42)
+
+        for variant, split in (('split', True), ('shared', False)):
+            os.environ['DB_READ_SPLIT'] = '1' if split else '0'
+            if args.target == 'client':
+                target = ClientTarget(create_app({'DB_READ_SPLIT': split}))
+            else:
+                target = GunicornTarget(args.workers, ['-k', 'gthread', '--threads', str(args.threads)])
+            try:
+                summary = run_variant(target, args.readers, args.writers, args.duration)
+            finally:
+                target.close()
+            report['variants'][variant] = summary
+            print_summary(summary, f"{variant} pools: {args.readers} readers, {args.writers} writers, "
+                                   f"{args.duration:.0f}s on {args.target}")
+
+        print(f"\n{'endpoint':<28}{'split p95':>12}{'shared p95':>12}{'split req/s':>13}{'shared req/s':>14}")
+        split, shared = report['variants']['split'], report['variants']['shared']
+        for endpoint in sorted(set(split) | set(shared)):
+            a, b = split.get(endpoint, {}), shared.get(endpoint, {})
+            print(f"{endpoint:<28}{a.get('p95_ms', 0):>12.2f}{b.get('p95_ms', 0):>12.2f}"
+                  f"{a.get('throughput_rps', 0):>13.1f}{b.get('throughput_rps', 0):>14.1f}")
+
+        if args.save_baseline:
+            save_baseline(args.save_baseline, report)
+    finally:
+        cleanup_environment(workdir)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the Shri Shyam Public School API
+
+Measures, each in a fresh interpreter, how long it takes to import the app
+module, build the application with ``create_app()`` and serve the first and
+second request. Optionally measures gunicorn boot-to-ready time with and
+without ``--preload``.
+
+Usage:
+    python benchmarks/startup.py --runs 10
+    python benchmarks/startup.py --runs 5 --gunicorn --workers 4
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from common import BACKEND_DIR, GunicornTarget, cleanup_environment, prepare_environment, save_baseline
+
+# Runs in a fresh interpreter so import caches don't hide the cost
+PROBE = '''
+import json, time
+t0 = time.perf_counter()
+import app as app_module
+t1 = time.perf_counter()
+app = app_module.create_app()
+t2 = time.perf_counter()
+client = app.test_client()
+client.get('/api/news')
+t3 = time.perf_counter()
+client.get('/api/news')
+t4 = time.perf_counter()
+print(json.dumps({'import_ms': (t1 - t0) * 1000, 'create_app_ms': (t2 - t1) * 1000,
+                  'first_request_ms': (t3 - t2) * 1000, 'second_request_ms': (t4 - t3) * 1000}))
+'''
+
+def probe_once():
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=os.environ.copy(),
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def gunicorn_ready_ms(workers, preload):
+    os.environ['GUNICORN_PRELOAD'] = '1' if preload else '0'
+    started = time.perf_counter()
+    target = GunicornTarget(workers)
+    elapsed = (time.perf_counter() - started) * 1000
+    target.close()
+    return elapsed
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure import, app creation and first-request latency')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--gunicorn', action='store_true', help='also measure gunicorn boot-to-ready time')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--save-baseline', metavar='NAME')
+    args = parser.parse_args(argv)
+
+    workdir = prepare_environment()
+    try:
+        from app import create_app
+        create_app()  # applies migrations so the probes measure a current schema
+
+        samples = [probe_once() for _ in range(args.runs)]
+        results = {key: round(statistics.median(s[key] for s in samples), 2) for key in samples[0]}
+
+        if args.gunicorn:
+            for preload in (False, True):
+                key = f"gunicorn_{'preload' if preload else 'no_preload'}_ready_ms"
+                results[key] = round(statistics.median(
+                    gunicorn_ready_ms(args.workers, preload) for _ in range(args.runs)), 2)
+
+        print(f"\nStartup (median of {args.runs} runs)")
+        for key, value in results.items():
+            print(f"{key:<36}{value:>10.2f}")
+
+        if args.save_baseline:
+            save_baseline(args.save_baseline, {'meta': {'runs': args.runs, 'workers': args.workers},
+                                               'startup': results})
+    finally:
+        cleanup_environment(workdir)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Frontend asset build script for Shri Shyam Public School
+Minifies and bundles the CSS/JS referenced by the HTML pages, writes
+content-hashed filenames with gzip/brotli copies and rewrites the HTML
+so the assets can be served with immutable caching.
+
+Usage:
+    python build_assets.py [--src ../frontend] [--out ../frontend/dist]
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import sys
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always written
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SRC = os.path.join(BASE_DIR, '..', 'frontend')
+
+# Pages whose local assets are bundled
+PAGES = ['index.html', 'admin/login.html']
+
+# Static directories copied as-is into the build output
+STATIC_DIRS = ['images']
+
+LINK_RE = re.compile(r'<link\b[^>]*\brel=["\']stylesheet["\'][^>]*>', re.IGNORECASE)
+SCRIPT_RE = re.compile(r'<script\b[^>]*\bsrc=["\']([^"\']+)["\'][^>]*>\s*</script>', re.IGNORECASE)
+HREF_RE = re.compile(r'\bhref=["\']([^"\']+)["\']', re.IGNORECASE)
+
+def is_local(url):
+    """Return True for relative URLs that point into the frontend tree"""
+    return not re.match(r'^([a-z][a-z0-9+.-]*:)?//', url, re.IGNORECASE) and not url.startswith('data:')
+
+def minify_css(source):
+    """Minify CSS by removing comments and redundant whitespace"""
+    # Protect string literals so their contents are left untouched
+    strings = []
+    def stash(match):
+        strings.append(match.group(0))
+        return f'\x00{len(strings) - 1}\x00'
+    source = re.sub(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'', stash, source)
+
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.DOTALL)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    # Only collapse after ':' so descendant selectors like "a :hover" keep their meaning
+    source = re.sub(r':\s+', ':', source)
+    source = source.replace(';}', '}')
+
+    source = re.sub(r'\x00(\d+)\x00', lambda m: strings[int(m.group(1))], source)
+    return source.strip()
+
+# Tokens after which a '/' starts a regular expression rather than a division
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'delete', 'throw')
+
+def minify_js(source):
+    """Minify JavaScript by removing comments and indentation.
+
+    Line breaks are kept so automatic semicolon insertion behaves exactly
+    as in the original file.
+    """
+    out = []
+    i = 0
+    n = len(source)
+    last = ''  # last significant character emitted
+
+    def regex_allowed():
+        if not last or last in _REGEX_PRECEDERS or last == '\n':
+            return True
+        tail = ''.join(out[-12:]).rstrip()
+        return any(tail.endswith(keyword) and not (tail[:-len(keyword)][-1:].isalnum())
+                   for keyword in _REGEX_KEYWORDS)
+
+    while i < n:
+        ch = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+
+        if ch == '/' and nxt == '/':
+            while i < n and source[i] != '\n':
+                i += 1
+            continue
+        if ch == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+
+        if ch in '"\'`':
+            start = i
+            i += 1
+            while i < n and source[i] != ch:
+                i += 2 if source[i] == '\\' else 1
+            i += 1
+            out.append(source[start:i])
+            last = ch
+            continue
+
+        if ch == '/' and regex_allowed():
+            start = i
+            i += 1
+            in_class = False
+            while i < n and source[i] != '\n':
+                c = source[i]
+                if c == '\\':
+                    i += 2
+                    continue
+                if c == '[':
+                    in_class = True
+                elif c == ']':
+                    in_class = False
+                elif c == '/' and not in_class:
+                    break
+                i += 1
+            i += 1
+            while i < n and source[i].isalpha():
+                i += 1
+            out.append(source[start:i])
+            last = '/'
+            continue
+
+        if ch in ' \t\r\n':
+            # Collapse a whitespace run into a single newline or space
+            has_newline = False
+            while i < n and source[i] in ' \t\r\n':
+                has_newline = has_newline or source[i] == '\n'
+                i += 1
+            if not out or last == '\n':
+                continue
+            if has_newline:
+                out.append('\n')
+                last = '\n'
+            elif i < n and (re.match(r'[\w$]', last) and re.match(r'[\w$]', source[i])
+                            or last in '+-' and source[i] == last):
+                out.append(' ')
+            continue
+
+        out.append(ch)
+        last = ch
+        i += 1
+
+    return ''.join(out).strip() + '\n'
+
+def content_hash(data):
+    """Short content hash used in asset filenames"""
+    return hashlib.sha256(data).hexdigest()[:12]
+
+def write_compressed(path, data):
+    """Write pre-compressed gzip and brotli siblings of an asset"""
+    with open(path + '.gz', 'wb') as f:
+        # mtime=0 keeps the output byte-for-byte reproducible
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(data, quality=11))
+
+class AssetBuilder:
+    """Collects bundles for all pages and writes them once"""
+
+    def __init__(self, src, out):
+        self.src = os.path.abspath(src)
+        self.out = os.path.abspath(out)
+        self.assets_dir = os.path.join(self.out, 'assets')
+        self.manifest = {}
+        self.stats = []
+
+    def read_asset(self, page, url):
+        page_dir = posixpath.dirname(page)
+        rel = posixpath.normpath(posixpath.join(page_dir, url.split('?')[0].split('#')[0]))
+        with open(os.path.join(self.src, rel), encoding='utf-8') as f:
+            return rel, f.read()
+
+    def emit_bundle(self, page, kind, urls):
+        """Minify, bundle and write one asset kind for a page. Returns the output path."""
+        sources = [self.read_asset(page, url) for url in urls]
+        minify = minify_css if kind == 'css' else minify_js
+        separator = '\n' if kind == 'css' else ';\n'
+        original = sum(len(text.encode('utf-8')) for _, text in sources)
+        data = separator.join(minify(text) for _, text in sources).encode('utf-8')
+
+        if len(sources) == 1:
+            stem = posixpath.splitext(posixpath.basename(sources[0][0]))[0]
+        else:
+            stem = posixpath.splitext(posixpath.basename(page))[0]
+        filename = f'{stem}.{content_hash(data)}.{kind}'
+        asset_path = posixpath.join('assets', filename)
+
+        if asset_path not in self.manifest.values():
+            path = os.path.join(self.assets_dir, filename)
+            with open(path, 'wb') as f:
+                f.write(data)
+            write_compressed(path, data)
+            self.stats.append((asset_path, original, len(data), len(gzip.compress(data, 9, mtime=0))))
+
+        for rel, _ in sources:
+            self.manifest[rel] = asset_path
+        return asset_path
+
+    def build_page(self, page):
+        with open(os.path.join(self.src, page), encoding='utf-8') as f:
+            html = f.read()
+
+        css_tags = [(tag, HREF_RE.search(tag).group(1)) for tag in LINK_RE.findall(html)
+                    if HREF_RE.search(tag) and is_local(HREF_RE.search(tag).group(1))]
+        js_tags = [(m.group(0), m.group(1)) for m in SCRIPT_RE.finditer(html) if is_local(m.group(1))]
+
+        page_dir = posixpath.dirname(page)
+        for kind, tags, template in (
+            ('css', css_tags, '<link rel="stylesheet" href="{}">'),
+            ('js', js_tags, '<script src="{}"></script>'),
+        ):
+            if not tags:
+                continue
+            asset_path = self.emit_bundle(page, kind, [url for _, url in tags])
+            href = posixpath.relpath(asset_path, page_dir or '.')
+            # The bundle replaces the first tag; the rest are folded into it
+            html = html.replace(tags[0][0], template.format(href), 1)
+            for tag, _ in tags[1:]:
+                html = html.replace(tag, '', 1)
+
+        out_path = os.path.join(self.out, page)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, 'w', encoding='utf-8') as f:
+            f.write(html)
+
+    def build(self, pages):
+        if os.path.isdir(self.out):
+            shutil.rmtree(self.out)
+        os.makedirs(self.assets_dir)
+
+        for page in pages:
+            self.build_page(page)
+            print(f"✓ Built {page}")
+
+        for name in STATIC_DIRS:
+            static_src = os.path.join(self.src, name)
+            if os.path.isdir(static_src):
+                shutil.copytree(static_src, os.path.join(self.out, name))
+                print(f"✓ Copied {name}/")
+
+        with open(os.path.join(self.out, 'asset-manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+        for asset_path, original, minified, gzipped in self.stats:
+            print(f"  {asset_path}: {original:,} → {minified:,} bytes ({gzipped:,} gzipped)")
+        if brotli is None:
+            print("⚠️  brotli not installed, skipped .br files (pip install brotli)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build minified, content-hashed frontend assets')
+    parser.add_argument('--src', default=DEFAULT_SRC, help='frontend source directory')
+    parser.add_argument('--out', default=None, help='output directory (default: <src>/dist)')
+    args = parser.parse_args(argv)
+
+    out = args.out or os.path.join(args.src, 'dist')
+    AssetBuilder(args.src, out).build(PAGES)
+    print(f"✅ Assets built in {os.path.abspath(out)}")
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,311 @@
+"""
+Shared response cache for the Shri Shyam Public School API
+
+Cached GET responses are stored in one of three backends:
+
+* ``memory`` - an LRU dict inside each worker process
+* ``sqlite`` - a cache database file shared by all workers
+* ``mmap``   - a fixed-size memory-mapped segment shared by all workers
+
+Whatever the backend, every entry is tagged with the value of a version
+counter that lives in a small memory-mapped file in ``RESPONSE_CACHE_DIR``.
+An admin write bumps the counter, which makes every entry written under the
+old version a miss in every worker at once, without a cache server.
+
+By default the directory is named after the database and instance folder,
+so two deployments on one host (staging and production) never share
+cached responses or invalidations.
+"""
+
+import hashlib
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, request
+
+from shared_state import locked, open_mapped
+
+# ttl for responses that only change through admin writes: kept until the next invalidation
+NO_EXPIRY = float('inf')
+
+def seconds_until_midnight(now=None):
+    """ttl for responses that depend on today's (server-local) date"""
+    now = now or datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max((midnight - now).total_seconds(), 1.0)
+
+def default_cache_dir(database_uri='', instance_path=''):
+    """RESPONSE_CACHE_DIR, or a temporary directory of the deployment using this database"""
+    if os.environ.get('RESPONSE_CACHE_DIR'):
+        return os.environ['RESPONSE_CACHE_DIR']
+    # Relative SQLite URIs resolve against the instance folder, so it is part of the name too
+    scope = hashlib.blake2b(f'{instance_path}\0{database_uri}'.encode('utf-8'), digest_size=6).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f'ssps-cache-{scope}')
+
+def invalidate_cache_dir(path):
+    """Make responses cached by a previous server run stale.
+
+    Bumping the counter rather than deleting files keeps it safe to call
+    after the app has already opened them (gunicorn --preload).
+    """
+    os.makedirs(path, exist_ok=True)
+    VersionCounter(path).bump()
+
+def _digest(key):
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+
+class VersionCounter:
+    """Invalidation counter shared by every process using the same directory"""
+
+    FORMAT = struct.Struct('<Q')
+
+    def __init__(self, directory):
+        self.fd, self.map = open_mapped(os.path.join(directory, 'version'), self.FORMAT.size)
+
+    def get(self):
+        return self.FORMAT.unpack_from(self.map, 0)[0]
+
+    def bump(self):
+        with locked(self.fd):
+            version = self.get() + 1
+            self.FORMAT.pack_into(self.map, 0, version)
+        return version
+
+class MemoryBackend:
+    """Per-process LRU; entries of an older version are dropped when read"""
+
+    def __init__(self, max_entries=512, **_):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # key -> (version, expires, value)
+        self.lock = threading.Lock()
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version or entry[1] < time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, version, value, ttl):
+        with self.lock:
+            self.entries[key] = (version, time.time() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class SQLiteBackend:
+    """Cache table in a WAL-mode SQLite file shared by all workers"""
+
+    PRUNE_EVERY = 100
+
+    def __init__(self, directory, max_entries=512, **_):
+        self.path = os.path.join(directory, 'responses.db')
+        self.max_entries = max_entries
+        self.local = threading.local()
+        self.writes = 0
+        with self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS responses ('
+                         'key TEXT PRIMARY KEY, version INTEGER NOT NULL, '
+                         'expires REAL NOT NULL, value BLOB NOT NULL)')
+
+    def _connection(self):
+        # One connection per thread, reopened after a fork
+        conn = getattr(self.local, 'conn', None)
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA synchronous=OFF')  # losing a cache entry on power loss is fine
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def get(self, key, version):
+        row = self._connection().execute(
+            'SELECT value FROM responses WHERE key = ? AND version = ? AND expires > ?',
+            (key, version, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key, version, value, ttl):
+        conn = self._connection()
+        try:
+            conn.execute('INSERT OR REPLACE INTO responses (key, version, expires, value) VALUES (?, ?, ?, ?)',
+                         (key, version, time.time() + ttl, value))
+            self.writes += 1
+            if self.writes % self.PRUNE_EVERY == 0:
+                self._prune(conn, version)
+        except sqlite3.OperationalError:
+            pass  # busy: skip caching this response rather than slowing the request
+
+    def _prune(self, conn, version):
+        conn.execute('DELETE FROM responses WHERE version < ? OR expires < ?', (version, time.time()))
+        conn.execute('DELETE FROM responses WHERE key NOT IN '
+                     '(SELECT key FROM responses ORDER BY expires DESC LIMIT ?)', (self.max_entries,))
+
+    def clear(self):
+        self._connection().execute('DELETE FROM responses')
+
+class MmapBackend:
+    """Direct-mapped slots in a shared memory-mapped file.
+
+    Each slot holds one entry: a header (sequence number, key digest,
+    version, expiry, length) followed by the value. Writers lock the slot's
+    byte range; readers take no lock and instead check that the sequence
+    number was even and unchanged around their copy (a seqlock), treating a
+    concurrent write as a miss. Values larger than a slot are not
+    cached.
+    """
+
+    HEADER = struct.Struct('<Q16sQdI')
+    SEQ = struct.Struct('<Q')
+
+    def __init__(self, directory, slots=256, slot_size=64 * 1024, **_):
+        self.slots = slots
+        self.slot_size = slot_size
+        self.capacity = slot_size - self.HEADER.size
+        self.fd, self.map = open_mapped(os.path.join(directory, 'responses.mmap'), slots * slot_size)
+
+    def _slot(self, digest):
+        return int.from_bytes(digest[:8], 'little') % self.slots * self.slot_size
+
+    def get(self, key, version):
+        digest = _digest(key)
+        offset = self._slot(digest)
+        seq, entry_digest, entry_version, expires, length = self.HEADER.unpack_from(self.map, offset)
+        if (seq & 1 or entry_digest != digest or entry_version != version
+                or expires < time.time() or length > self.capacity):
+            return None
+        start = offset + self.HEADER.size
+        value = self.map[start:start + length]
+        if self.SEQ.unpack_from(self.map, offset)[0] != seq:
+            return None  # overwritten while copying
+        return value
+
+    def set(self, key, version, value, ttl):
+        if len(value) > self.capacity:
+            return
+        digest = _digest(key)
+        offset = self._slot(digest)
+        with locked(self.fd, self.slot_size, offset):
+            seq = self.SEQ.unpack_from(self.map, offset)[0]
+            self.SEQ.pack_into(self.map, offset, seq + 1)
+            start = offset + self.HEADER.size
+            self.map[start:start + len(value)] = value
+            self.HEADER.pack_into(self.map, offset, seq + 2, digest, version, time.time() + ttl, len(value))
+
+    def clear(self):
+        with locked(self.fd):
+            for offset in range(0, self.slots * self.slot_size, self.slot_size):
+                seq = self.SEQ.unpack_from(self.map, offset)[0]
+                self.HEADER.pack_into(self.map, offset, seq + (seq & 1) + 2, b'\0' * 16, 0, 0.0, 0)
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'sqlite': SQLiteBackend,
+    'mmap': MmapBackend,
+}
+
+class ResponseCache:
+    """Flask extension caching JSON GET responses across workers"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self.counter = None
+        self.views = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RESPONSE_CACHE_BACKEND', 'memory')
+        app.config.setdefault('RESPONSE_CACHE_DIR', default_cache_dir(app.config.get('SQLALCHEMY_DATABASE_URI', ''),
+                                                                      app.instance_path))
+        app.config.setdefault('RESPONSE_CACHE_TTL', 300)
+        app.config.setdefault('RESPONSE_CACHE_MAX_ENTRIES', 512)
+        app.config.setdefault('RESPONSE_CACHE_MMAP_SLOTS', 256)
+        app.config.setdefault('RESPONSE_CACHE_MMAP_SLOT_SIZE', 64 * 1024)
+        app.extensions['response_cache'] = self
+
+        name = app.config['RESPONSE_CACHE_BACKEND']
+        if name in (None, '', 'none'):
+            self.backend = None
+            return
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND '{name}' (choose from {', '.join(BACKENDS)}, none)")
+
+        directory = app.config['RESPONSE_CACHE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        self.counter = VersionCounter(directory)
+        self.backend = BACKENDS[name](
+            directory=directory,
+            max_entries=app.config['RESPONSE_CACHE_MAX_ENTRIES'],
+            slots=app.config['RESPONSE_CACHE_MMAP_SLOTS'],
+            slot_size=app.config['RESPONSE_CACHE_MMAP_SLOT_SIZE'],
+        )
+
+    def cached(self, ttl=None):
+        """Decorator for GET views returning JSON; keyed by path and query string.
+
+        ``ttl`` may be a callable returning the lifetime when the response is stored.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return view(*args, **kwargs)
+                key = request.full_path
+                version = self.counter.get()
+                value = self.backend.get(key, version)
+                if value is not None:
+                    response = current_app.response_class(value, mimetype='application/json')
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200 and response.mimetype == 'application/json':
+                    lifetime = ttl() if callable(ttl) else ttl
+                    self.backend.set(key, version, response.get_data(),
+                                     lifetime or current_app.config['RESPONSE_CACHE_TTL'])
+                    response.headers['X-Cache'] = 'MISS'
+                return response
+            self.views.add(wrapper)
+            return wrapper
+        return decorator
+
+    def invalidate(self):
+        """Make every cached response stale in all workers"""
+        if self.counter is not None:
+            self.counter.bump()
+
+    def warm(self, app):
+        """Fill the cache by requesting every cached route that takes no URL arguments.
+
+        Returns ``{path: status}``. The memory backend is per process, so
+        only the calling worker's copy is warmed.
+        """
+        if self.backend is None:
+            return {}
+        client = app.test_client()
+        statuses = {}
+        for rule in app.url_map.iter_rules():
+            if 'GET' in rule.methods and not rule.arguments and app.view_functions[rule.endpoint] in self.views:
+                statuses[rule.rule] = client.get(rule.rule).status_code
+        return statuses
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
@@ -0,0 +1,73 @@
+import os
+from datetime import timedelta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def database_url(default='sqlite:///school.db'):
+    """DATABASE_URL with the legacy ``postgres://`` scheme (Heroku, Railway) accepted"""
+    url = os.environ.get('DATABASE_URL', default)
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+class Config:
+    """Default configuration, read from the environment"""
+
+    SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-change-this-in-production')
+    SQLALCHEMY_DATABASE_URI = database_url()
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pools: the writer, and a read-only pool for public GETs
+    DB_READ_SPLIT = os.environ.get('DB_READ_SPLIT', '1') != '0'
+    DATABASE_READ_URL = os.environ.get('DATABASE_READ_URL')
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_READ_POOL_SIZE = int(os.environ.get('DB_READ_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+    # Unset: recycle after 30 minutes and pre-ping on server databases only
+    DB_POOL_RECYCLE = int(os.environ['DB_POOL_RECYCLE']) if os.environ.get('DB_POOL_RECYCLE') else None
+    DB_POOL_PRE_PING = {'1': True, '0': False}.get(os.environ.get('DB_POOL_PRE_PING'))
+    DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 0))  # PostgreSQL only
+    DB_SQLITE_WAL = os.environ.get('DB_SQLITE_WAL', '1') != '0'
+    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-string')
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    UPLOAD_FOLDER = os.path.join(BASE_DIR, os.environ.get('UPLOAD_FOLDER', 'uploads'))
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    # Check the schema version when the app starts and apply pending
+    # migrations (or only log a warning when AUTO_MIGRATE=0)
+    SCHEMA_CHECK = True
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', '1') != '0'
+    # Admissions and contact messages from before the academic year starting
+    # in this month (keeping ARCHIVE_KEEP_YEARS years) move to archive tables
+    ACADEMIC_YEAR_START_MONTH = int(os.environ.get('ACADEMIC_YEAR_START_MONTH', 4))
+    ARCHIVE_KEEP_YEARS = int(os.environ.get('ARCHIVE_KEEP_YEARS', 1))
+    # In-process maintenance (VACUUM, ANALYZE, checkpoints); one worker leads
+    MAINTENANCE_ENABLED = os.environ.get('MAINTENANCE', '1') != '0'
+    MAINTENANCE_WINDOW = os.environ.get('MAINTENANCE_WINDOW', '01:00-05:00')
+    # Snapshots made by backup.py and /api/backups
+    BACKUP_DIR = os.path.join(BASE_DIR, os.environ.get('BACKUP_DIR', 'backups'))
+    BACKUP_KEEP = int(os.environ.get('BACKUP_KEEP', 7))
+    BACKUP_PAGES = int(os.environ.get('BACKUP_PAGES', 1024))  # pages copied per online backup step
+    SQL_SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS', 100))
+
+    # memory, sqlite, mmap or none; all backends share one invalidation counter
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE', 'memory')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))
+
+    # Per-IP limits for public writes, shared by all workers
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT', '1') != '0'
+    RATE_LIMIT_ADMISSIONS = os.environ.get('RATE_LIMIT_ADMISSIONS', '5/minute')
+    RATE_LIMIT_CONTACT = os.environ.get('RATE_LIMIT_CONTACT', '5/minute')
+    RATE_LIMIT_LOGIN = os.environ.get('RATE_LIMIT_LOGIN', '10/minute')
+    # How long a POST's Idempotency-Key replays its first response
+    IDEMPOTENCY_TTL_HOURS = int(os.environ.get('IDEMPOTENCY_TTL_HOURS', 24))
+    # Number of reverse proxies in front of the app whose X-Forwarded-For is trusted
+    TRUSTED_PROXIES = int(os.environ.get('TRUSTED_PROXIES', 0))
+
+    CORS_ORIGINS = [
+        "http://localhost:3000",
+        "http://localhost:8080",
+        "http://127.0.0.1:5500",
+        "http://localhost:5000",
+        "file://"  # For local file access
+    ]
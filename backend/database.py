@@ -0,0 +1,108 @@
+"""
+Database engine configuration for the Shri Shyam Public School API
+
+The default engine is the writer. When ``DB_READ_SPLIT`` is on, a second
+``read`` bind gets its own connection pool and is opened read-only: SQLite
+connections use ``mode=ro`` plus ``PRAGMA query_only``, other databases a
+read-only default transaction (or ``DATABASE_READ_URL``, e.g. a replica).
+Requests that mark themselves read-only with ``use_read_engine()`` run their
+queries on that pool, so slow admin writes never hold the connections that
+public pages are waiting for. Flushes always go to the writer.
+"""
+
+import sqlalchemy as sa
+from flask import g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+READ_BIND = 'read'
+
+class RoutingSession(Session):
+    """Session sending queries of read-only requests to the read bind"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context()
+                and g.get('_db_read_only')):
+            engine = self._db.engines.get(READ_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def use_read_engine():
+    """Route the rest of this request's queries to the read-only pool"""
+    g._db_read_only = True
+
+def _is_file_sqlite(url):
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+def _pool_options(app, url, pool_size):
+    server = url.get_backend_name() != 'sqlite'
+    pre_ping = app.config['DB_POOL_PRE_PING']
+    recycle = app.config['DB_POOL_RECYCLE']
+    options = {
+        # Server connections can be dropped by the server or a proxy while idle
+        'pool_pre_ping': server if pre_ping is None else pre_ping,
+        'pool_recycle': (1800 if server else -1) if recycle is None else recycle,
+    }
+    # Size limits only apply to QueuePool, which SQLAlchemy picks for file
+    # databases and server databases alike
+    if pool_size:
+        options.update(pool_size=pool_size, max_overflow=app.config['DB_MAX_OVERFLOW'],
+                       pool_timeout=app.config['DB_POOL_TIMEOUT'])
+    if server:
+        # Reuse the most recent connection so surplus ones idle out server-side
+        options['pool_use_lifo'] = True
+    if url.get_backend_name() == 'postgresql':
+        settings = ['-c application_name=ssps']
+        if app.config['DB_STATEMENT_TIMEOUT_MS']:
+            settings.append(f"-c statement_timeout={app.config['DB_STATEMENT_TIMEOUT_MS']}")
+        options['connect_args'] = {'options': ' '.join(settings)}
+    return options
+
+def _read_url(url):
+    """Read-only variant of the writer URL"""
+    if url.get_backend_name() == 'sqlite':
+        database = url.database[5:] if url.query.get('uri') else url.database
+        return url.set(database=f'file:{database}', query={'mode': 'ro', 'uri': 'true'})
+    return url
+
+def configure_engines(app):
+    """Fill in engine options and the read bind; call before ``db.init_app``"""
+    url = sa.engine.make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    in_memory = url.get_backend_name() == 'sqlite' and not _is_file_sqlite(url)
+
+    if not in_memory:
+        options = _pool_options(app, url, app.config['DB_POOL_SIZE'])
+        options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+    # An in-memory database exists only on the writer's connection
+    if app.config['DB_READ_SPLIT'] and not in_memory:
+        read_url = sa.engine.make_url(app.config.get('DATABASE_READ_URL') or _read_url(url))
+        read_options = _pool_options(app, read_url, app.config['DB_READ_POOL_SIZE'])
+        if read_url.get_backend_name() == 'postgresql':
+            read_options['connect_args']['options'] += ' -c default_transaction_read_only=on'
+        app.config.setdefault('SQLALCHEMY_BINDS', {})[READ_BIND] = dict(read_options, url=read_url)
+
+def install_connection_hooks(app, db):
+    """Per-connection settings; call after ``db.init_app``"""
+    with app.app_context():
+        engines = db.engines
+
+    writer = engines[None]
+    if writer.dialect.name == 'sqlite' and _is_file_sqlite(writer.url):
+        @event.listens_for(writer, 'connect')
+        def _writer_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            if app.config['DB_SQLITE_WAL']:
+                # Readers keep reading while a write is in progress
+                cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.close()
+
+    reader = engines.get(READ_BIND)
+    if reader is not None and reader.dialect.name == 'sqlite':
+        @event.listens_for(reader, 'connect')
+        def _reader_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA query_only=ON')
+            cursor.close()
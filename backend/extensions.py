@@ -0,0 +1,24 @@
+"""
+Flask extension instances for the Shri Shyam Public School API
+
+They are created unbound here and attached to an app in ``create_app``, so
+models and blueprints can import them without building an application.
+"""
+
+from flask_sqlalchemy import SQLAlchemy
+from flask_bcrypt import Bcrypt
+
+from cache import ResponseCache
+from database import RoutingSession
+from maintenance import MaintenanceScheduler
+from metrics import RequestMetrics
+from query_stats import QueryStats
+from ratelimit import RateLimiter
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+bcrypt = Bcrypt()
+metrics = RequestMetrics()
+query_stats = QueryStats()
+response_cache = ResponseCache()
+rate_limiter = RateLimiter()
+maintenance = MaintenanceScheduler()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for Shri Shyam Public School
+Produces large, realistic and fully deterministic volumes of admissions,
+contact messages, news, events, gallery images and toppers (mixed Hindi and
+English text) using bulk Core inserts (COPY on PostgreSQL), for
+benchmarking at real volumes.
+
+Usage:
+    python generate_data.py --admissions 1000000 --contacts 200000 --seed 42
+    python generate_data.py --scale 10 --database-url sqlite:////tmp/bench.db
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ids import uuid7
+
+BATCH_SIZE = 20000
+
+EPOCH = datetime(1970, 1, 1)
+
+# Names are kept within one script so a Hindi first name never gets an English surname
+NAMES = {
+    'en': {
+        'first': ['Aarav', 'Vivaan', 'Aditya', 'Arjun', 'Rohan', 'Kabir', 'Ishaan', 'Dev', 'Yash', 'Harsh',
+                  'Priya', 'Ananya', 'Kavya', 'Isha', 'Neha', 'Pooja', 'Sneha', 'Diya', 'Riya', 'Meera'],
+        'last': ['Sharma', 'Verma', 'Patel', 'Singh', 'Gupta', 'Yadav', 'Meena', 'Joshi', 'Kumar', 'Choudhary'],
+        'father': ['Ramesh', 'Suresh', 'Mahesh', 'Rajesh', 'Dinesh', 'Mukesh'],
+        'mother': ['Sita', 'Gita', 'Sunita', 'Anita', 'Kamla', 'Savita'],
+    },
+    'hi': {
+        'first': ['आरव', 'अर्जुन', 'रोहन', 'विकास', 'प्रिया', 'अनन्या', 'काव्या', 'नेहा', 'सीता', 'गीता'],
+        'last': ['शर्मा', 'वर्मा', 'सिंह', 'गुप्ता', 'यादव', 'मीणा', 'जोशी', 'कुमार'],
+        'father': ['रमेश', 'सुरेश', 'महेश', 'राजेश'],
+        'mother': ['सीता', 'गीता', 'सुनीता', 'कमला'],
+    },
+}
+# Roughly one in four names is written in Devanagari
+SCRIPTS = ['en', 'en', 'en', 'hi']
+VILLAGES = ['Kushalpura', 'Banswara', 'Garhi', 'Partapur', 'Ghatol', 'कुशलपुरा', 'बांसवाड़ा', 'गढ़ी']
+CLASSES = ['Nursery', 'LKG', 'UKG'] + [str(n) for n in range(1, 12)]
+GENDERS = ['male', 'female']
+ADMISSION_STATUSES = ['pending'] * 5 + ['approved'] * 3 + ['rejected', 'waitlisted']
+MESSAGE_STATUSES = ['unread'] * 2 + ['read'] * 3 + ['replied'] * 5
+SCHOOLS = ['Government Primary School', 'Saraswati Shishu Mandir', 'राजकीय उच्च प्राथमिक विद्यालय', None]
+SUBJECTS = [
+    'Admission enquiry', 'Fee structure', 'Transport facility', 'Transfer certificate',
+    'प्रवेश संबंधी जानकारी', 'फीस की जानकारी', 'बस सुविधा', 'परिणाम के बारे में',
+]
+MESSAGES = [
+    'Please share the admission process and the documents required.',
+    'What is the fee for Class {cls} this year?',
+    'Is school transport available from {village}?',
+    'कृपया कक्षा {cls} के प्रवेश की अंतिम तिथि बताएं।',
+    'क्या {village} से बस सुविधा उपलब्ध है?',
+]
+NEWS_TITLES = [
+    'Class {cls} Results Declared', 'Admissions Open for {year}-{next_year}', 'Annual Sports Day Winners',
+    'New Science Lab Inaugurated', 'कक्षा {cls} के परिणाम घोषित', 'प्रवेश प्रारंभ {year}-{next_year}',
+    'वार्षिक खेल दिवस', 'विज्ञान प्रदर्शनी में प्रथम स्थान',
+]
+NEWS_EMOJIS = ['📢', '🏆', '🎓', '🔬', '🥇', '📚', '🎉']
+PRIORITIES = ['normal'] * 7 + ['high'] * 2 + ['urgent']
+EVENT_TITLES = [
+    'Annual Sports Day', 'Science Exhibition', 'Parent-Teacher Meeting', 'Republic Day Celebration',
+    'वार्षिकोत्सव', 'गणतंत्र दिवस समारोह', 'अभिभावक-शिक्षक बैठक', 'विज्ञान मेला',
+]
+EVENT_CATEGORIES = ['academic', 'sports', 'cultural', 'general']
+LOCATIONS = ['School Playground', 'School Auditorium', 'Science Labs', 'विद्यालय प्रांगण']
+GALLERY_CATEGORIES = ['events', 'facilities', 'sports', 'academic']
+STREAMS = {'10': ['General'], '12': ['Science', 'Commerce', 'Arts']}
+ACHIEVEMENTS = ['School Topper', 'District Topper', 'Stream Topper', 'State Merit List', 'जिला टॉपर']
+
+class _Picker:
+    """Fast seeded helpers; ``random.choice`` dominates the profile at 1M rows"""
+
+    def __init__(self, rng, stamp, day, key):
+        self.random = rng.random
+        self.getrandbits = rng.getrandbits
+        self.stamp = stamp  # datetime -> stored value
+        self.day = day      # date -> stored value
+        self.key = key      # UUID -> stored value
+
+    def choice(self, pool):
+        return pool[int(self.random() * len(pool))]
+
+    def below(self, n):
+        return int(self.random() * n)
+
+    def uuid(self, moment):
+        # UUIDv7 as ids.new_id() gives a row created at ``moment``, with seeded random bits
+        return self.key(uuid7((moment - EPOCH) // timedelta(milliseconds=1), self.getrandbits(80)))
+
+    def name(self):
+        names = NAMES[self.choice(SCRIPTS)]
+        return f"{self.choice(names['first'])} {self.choice(names['last'])}"
+
+    def phone(self):
+        return f'{self.choice("6789")}{10**8 + self.below(9 * 10**8)}'
+
+    def past(self, now, years):
+        return now - timedelta(seconds=self.below(years * 365 * 86400), microseconds=self.below(10**6))
+
+ADMISSION_COLUMNS = (
+    'id', 'student_name', 'class_applying', 'date_of_birth', 'gender', 'father_name', 'mother_name',
+    'phone', 'email', 'address', 'previous_school', 'previous_percentage', 'application_status',
+    'submitted_at', 'updated_at', 'admin_notes',
+)
+
+def admission_rows(p, count, now):
+    # The hot loop binds everything locally: this table is generated at millions of rows
+    rnd, uuid, stamp, day, choice = p.random, p.uuid, p.stamp, p.day, p.choice
+    families = [
+        ([f'{first} {last}' for first in names['first']],
+         [f'{father} {last}' for father in names['father']],
+         [f'{mother} {last}' for mother in names['mother']])
+        for script in SCRIPTS for names in [NAMES[script]] for last in names['last']
+    ]
+    addresses = [f'Ward {ward}, {village}, Rajasthan' for ward in range(1, 31) for village in VILLAGES]
+    birthdays = [day(date(2006, 1, 1) + timedelta(days=n)) for n in range(6000)]
+    span = 3 * 365 * 86400
+    for i in range(count):
+        moment = now - timedelta(seconds=rnd() * span)
+        submitted = stamp(moment)
+        students, fathers, mothers = choice(families)
+        yield (
+            uuid(moment),
+            choice(students),
+            choice(CLASSES),
+            birthdays[int(rnd() * 6000)],
+            GENDERS[rnd() < 0.5],
+            choice(fathers),
+            choice(mothers),
+            f'{6 + int(rnd() * 4)}{100000000 + int(rnd() * 900000000)}',
+            f'parent{i}@example.com',
+            choice(addresses),
+            choice(SCHOOLS),
+            round(45 + rnd() * 54, 1),
+            choice(ADMISSION_STATUSES),
+            submitted,
+            submitted,
+            None,
+        )
+
+CONTACT_COLUMNS = (
+    'id', 'name', 'email', 'phone', 'subject', 'message', 'status',
+    'submitted_at', 'replied_at', 'admin_reply',
+)
+
+def contact_rows(p, count, now):
+    reply = 'Thank you for contacting us. / संपर्क करने के लिए धन्यवाद।'
+    for i in range(count):
+        submitted = p.past(now, 3)
+        status = p.choice(MESSAGE_STATUSES)
+        replied = status == 'replied'
+        yield (
+            p.uuid(submitted),
+            p.name(),
+            f'visitor{i}@example.com',
+            p.phone(),
+            p.choice(SUBJECTS),
+            p.choice(MESSAGES).format(cls=p.choice(CLASSES), village=p.choice(VILLAGES)),
+            status,
+            p.stamp(submitted),
+            p.stamp(submitted + timedelta(hours=1 + p.below(72))) if replied else None,
+            reply if replied else None,
+        )
+
+NEWS_COLUMNS = ('id', 'title', 'content', 'emoji', 'priority', 'priority_rank', 'is_active', 'created_at', 'updated_at')
+
+def news_rows(p, count, now):
+    from models import PRIORITY_RANKS
+
+    body = 'Students and parents are informed accordingly. सभी को सूचित किया जाता है। '
+    for i in range(count):
+        created = p.past(now, 5)
+        year = created.year
+        title = p.choice(NEWS_TITLES).format(cls=p.choice(['X', 'XII', '10', '12']), year=year, next_year=year % 100 + 1)
+        # News titles are unique (natural key), number the repeats
+        title = f'{title} #{i + 1}'
+        priority = p.choice(PRIORITIES)
+        yield (
+            p.uuid(created),
+            title,
+            f'{title}. ' + body * (1 + p.below(4)),
+            p.choice(NEWS_EMOJIS),
+            priority,
+            PRIORITY_RANKS[priority],
+            p.random() < 0.9,
+            p.stamp(created),
+            p.stamp(created),
+        )
+
+EVENT_COLUMNS = (
+    'id', 'title', 'description', 'event_date', 'event_time', 'location', 'category',
+    'is_featured', 'image_url', 'created_at', 'updated_at',
+)
+
+def event_rows(p, count, now):
+    for i in range(count):
+        created = p.past(now, 5)
+        yield (
+            p.uuid(created),
+            f'{p.choice(EVENT_TITLES)} #{i + 1}',
+            'All students and parents are invited. सभी आमंत्रित हैं।',
+            p.day((created + timedelta(days=p.below(210) - 30)).date()),
+            f'{8 + p.below(8)}:00',
+            p.choice(LOCATIONS),
+            p.choice(EVENT_CATEGORIES),
+            p.random() < 0.1,
+            None,
+            p.stamp(created),
+            p.stamp(created),
+        )
+
+GALLERY_COLUMNS = ('id', 'title', 'description', 'image_url', 'category', 'is_active', 'created_at',
+                   'width', 'height', 'dominant_color')
+
+# Camera photos in landscape and portrait, and phone screenshots
+PHOTO_SIZES = [(4000, 3000), (3000, 4000), (1920, 1080), (1080, 1920), (1600, 1200)]
+
+def gallery_rows(p, count, now):
+    descriptions = [None, 'School activities / विद्यालय गतिविधियां']
+    for i in range(count):
+        category = p.choice(GALLERY_CATEGORIES)
+        width, height = p.choice(PHOTO_SIZES)
+        created = p.past(now, 5)
+        yield (
+            p.uuid(created),
+            f'{category.title()} photo {i}',
+            p.choice(descriptions),
+            f'/api/uploads/{category}-{i}.jpg',
+            category,
+            p.random() < 0.95,
+            p.stamp(created),
+            width,
+            height,
+            '#%06x' % p.getrandbits(24),
+        )
+
+TOPPER_COLUMNS = ('id', 'name', 'class_level', 'year', 'percentage', 'stream', 'achievement', 'photo_url', 'created_at')
+
+def topper_rows(p, count, now):
+    seen = set()
+    for _ in range(count):
+        # (name, class, year) is the natural key, draw again on a collision
+        while True:
+            name, class_level, year = p.name(), p.choice(['10', '12']), now.year - p.below(20)
+            if (name, class_level, year) not in seen:
+                seen.add((name, class_level, year))
+                break
+        created = datetime(year, 6, 1)
+        yield (
+            p.uuid(created),
+            name,
+            class_level,
+            year,
+            round(90 + p.random() * 9.8, 1),
+            p.choice(STREAMS[class_level]),
+            p.choice(ACHIEVEMENTS),
+            None,
+            p.stamp(created),
+        )
+
+def _copy_text(value):
+    """Encode one value in PostgreSQL's COPY text format"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def _copy_batches(conn, table, columns, rows, batch_size):
+    """Load rows with COPY FROM STDIN, much faster than INSERTs on PostgreSQL"""
+    cursor = conn.connection.driver_connection.cursor()
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        data = ''.join('\t'.join(map(_copy_text, row)) + '\n' for row in batch)
+        cursor.copy_expert(sql, io.StringIO(data))
+        total += len(batch)
+    cursor.close()
+    return total
+
+def bulk_insert(engine, table, columns, rows, batch_size=BATCH_SIZE):
+    """Insert row tuples with executemany (COPY on PostgreSQL) in one transaction. Returns the row count."""
+    if engine.dialect.name == 'postgresql' and engine.dialect.driver == 'psycopg2':
+        with engine.begin() as conn:
+            return _copy_batches(conn, table, columns, rows, batch_size)
+    if engine.dialect.name == 'sqlite':
+        # Values are already in SQLite's storage format, skip SQLAlchemy's per-value processing
+        sql = f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        execute = lambda conn, batch: conn.exec_driver_sql(sql, batch)
+    else:
+        statement = table.insert()
+        execute = lambda conn, batch: conn.execute(statement, [dict(zip(columns, row)) for row in batch])
+
+    total = 0
+    with engine.begin() as conn:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            execute(conn, batch)
+            total += len(batch)
+    return total
+
+def generate(engine, counts, seed=42, now=None):
+    """Generate and insert ``{'admissions': n, ...}`` rows. Returns {table: (rows, seconds)}."""
+    from models import Admission, ContactMessage, News, Event, Gallery, Topper
+
+    generators = {
+        'admissions': (Admission, ADMISSION_COLUMNS, admission_rows),
+        'contacts': (ContactMessage, CONTACT_COLUMNS, contact_rows),
+        'news': (News, NEWS_COLUMNS, news_rows),
+        'events': (Event, EVENT_COLUMNS, event_rows),
+        'gallery': (Gallery, GALLERY_COLUMNS, gallery_rows),
+        'toppers': (Topper, TOPPER_COLUMNS, topper_rows),
+    }
+    if engine.dialect.name == 'sqlite':
+        # Same text format SQLAlchemy's SQLite DateTime/Date types store
+        stamp = lambda value: value.isoformat(' ', 'microseconds')
+        day = date.isoformat
+        uuid_key = lambda value: value.bytes  # ids.UUIDKey stores 16 bytes
+    else:
+        stamp = day = lambda value: value
+        uuid_key = str
+
+    now = now or datetime(2025, 6, 1)
+    timings = {}
+    for offset, (key, (model, columns, make_rows)) in enumerate(generators.items()):
+        count = counts.get(key, 0)
+        if not count:
+            continue
+        # Each table gets its own stream so changing one count doesn't reshuffle the others
+        picker = _Picker(random.Random(seed * 100 + offset), stamp, day, uuid_key)
+        started = time.perf_counter()
+        inserted = bulk_insert(engine, model.__table__, columns, make_rows(picker, count, now))
+        timings[model.__tablename__] = (inserted, time.perf_counter() - started)
+    # Bulk inserts bypass the per-row counting and indexing
+    import analytics
+    import inbox
+    import search
+    rebuilds = []
+    if counts.get('admissions'):
+        rebuilds += [('admission_counts', analytics.rebuild), ('admission_search', search.rebuild)]
+    if counts.get('contacts'):
+        rebuilds.append(('message_counts', inbox.rebuild))
+    for table, rebuild in rebuilds:
+        started = time.perf_counter()
+        timings[table] = (rebuild(engine), time.perf_counter() - started)
+    return timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate synthetic school data for benchmarking')
+    parser.add_argument('--scale', type=int, default=1,
+                        help='multiplier for the default counts (1 = 100,000 admissions)')
+    parser.add_argument('--admissions', type=int)
+    parser.add_argument('--contacts', type=int)
+    parser.add_argument('--news', type=int)
+    parser.add_argument('--events', type=int)
+    parser.add_argument('--gallery', type=int)
+    parser.add_argument('--toppers', type=int)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--database-url', help='target database (default: DATABASE_URL or school.db)')
+    args = parser.parse_args(argv)
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+
+    defaults = {'admissions': 100000, 'contacts': 20000, 'news': 2000,
+                'events': 500, 'gallery': 5000, 'toppers': 200}
+    counts = {key: getattr(args, key) if getattr(args, key) is not None else value * args.scale
+              for key, value in defaults.items()}
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            with db.engine.connect() as conn:
+                conn.exec_driver_sql('PRAGMA journal_mode=WAL')
+
+        started = time.perf_counter()
+        timings = generate(db.engine, counts, seed=args.seed)
+        for table, (rows, seconds) in timings.items():
+            rate = rows / seconds if seconds else 0
+            print(f"✓ {table}: {rows:,} rows in {seconds:.2f}s ({rate:,.0f} rows/s)")
+        print(f"✅ Generated {sum(r for r, _ in timings.values()):,} rows in {time.perf_counter() - started:.2f}s")
+
+if __name__ == '__main__':
+    main()
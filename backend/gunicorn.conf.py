@@ -0,0 +1,39 @@
+"""
+Gunicorn configuration for the Shri Shyam Public School API
+
+Usage:
+    gunicorn app:app
+"""
+
+import os
+
+from cache import default_cache_dir, invalidate_cache_dir
+from config import Config
+from metrics import clear_metrics_dir
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+
+# Build the app once in the master; workers share it copy-on-write after fork
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+def on_starting(server):
+    # Workers write their metric snapshots under the master's pid; with preload_app the app,
+    # built in the master, already chose that directory
+    os.environ['METRICS_RUN_ID'] = str(os.getpid())
+    clear_metrics_dir()
+    # Cached responses may predate changes made while the server was down. This is the
+    # directory create_app picks: Flask's instance folder of app.py is next to it
+    instance_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance')
+    invalidate_cache_dir(default_cache_dir(Config.SQLALCHEMY_DATABASE_URI, instance_path))
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master must not be shared between workers
+    from extensions import db, maintenance
+
+    app = server.app.wsgi()
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    # Every worker runs the scheduler thread; the one holding the lock file leads
+    maintenance.start(app)
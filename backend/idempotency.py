@@ -0,0 +1,89 @@
+"""
+Idempotency-Key support for public form submissions
+
+A client that may retry a POST (a parent's phone dropping off the network
+mid-submit) sends an ``Idempotency-Key`` header, any string up to 255
+characters that is new for each submission. The first successful response
+is stored under the key for ``IDEMPOTENCY_TTL_HOURS``; retries with the
+same key get that response back, marked ``Idempotent-Replayed: true``,
+without running the view again. Reusing a key with a different body is
+refused with 422.
+
+Keys are stored as 16-byte digests of the route and the client's key, one
+primary key probe per request; expired keys are deleted by the hourly
+``idempotency`` maintenance task. Two retries racing each other can both
+run the view, so routes that must not double-write also need a unique
+constraint, like ``admissions.fingerprint``. That constraint also covers a
+key that couldn't be stored (a locked database): the view's response is
+returned anyway, and a retry runs the view again.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+def _digest(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.digest()
+
+def idempotent(view):
+    """Replay the stored response of a request whose Idempotency-Key was seen before"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        from extensions import db
+        from models import IdempotencyKey
+
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not 0 < len(key) <= MAX_KEY_LENGTH:
+            return jsonify({'error': f'{HEADER} must be 1 to {MAX_KEY_LENGTH} characters'}), 400
+
+        digest = _digest(request.path, key)
+        request_hash = _digest(request.get_data())
+        now = datetime.utcnow()
+        stored = db.session.get(IdempotencyKey, digest)
+        if stored is not None and stored.expires_at > now:
+            if stored.request_hash != request_hash:
+                return jsonify({'error': f'{HEADER} was already used for a different request'}), 422
+            response = current_app.response_class(stored.response, status=stored.status_code,
+                                                  mimetype='application/json')
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+
+        response = current_app.make_response(view(*args, **kwargs))
+        # Only successes are kept; a rejected submission can be corrected and resent under the same key
+        if 200 <= response.status_code < 300:
+            ttl = timedelta(hours=current_app.config['IDEMPOTENCY_TTL_HOURS'])
+            try:
+                db.session.merge(IdempotencyKey(key=digest, request_hash=request_hash,
+                                                status_code=response.status_code,
+                                                response=response.get_data(as_text=True), expires_at=now + ttl))
+                db.session.commit()
+            except IntegrityError:
+                # A concurrent retry stored its response first
+                db.session.rollback()
+            except SQLAlchemyError:
+                # The view's work is already committed; failing now would make the client's retry a duplicate
+                db.session.rollback()
+                current_app.logger.warning('Could not store the response for an %s', HEADER, exc_info=True)
+        return response
+    return wrapper
+
+def delete_expired(engine, now=None):
+    """Delete keys past their expiry; returns the number deleted"""
+    from models import IdempotencyKey
+
+    keys = IdempotencyKey.__table__
+    with engine.begin() as conn:
+        result = conn.execute(keys.delete().where(keys.c.expires_at <= (now or datetime.utcnow())))
+    return result.rowcount
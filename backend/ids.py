@@ -0,0 +1,57 @@
+"""
+Primary keys for the Shri Shyam Public School models
+
+Keys are UUIDv7: a 48-bit millisecond timestamp followed by random bits,
+so new rows land at the end of the primary key index instead of at a
+random page. They are stored in 16 bytes (a BLOB on SQLite, the native
+``uuid`` type on PostgreSQL) rather than as 36-character strings, but the
+application and the API still see the usual ``xxxxxxxx-xxxx-...`` string.
+"""
+
+import os
+import time
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+def uuid7(timestamp_ms=None, random_bits=None):
+    """Time-ordered UUID (RFC 9562 version 7); ``random_bits`` (80 bits) makes it reproducible"""
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    if random_bits is None:
+        random_bits = int.from_bytes(os.urandom(10), 'big')
+    value = (timestamp_ms & (2**48 - 1)) << 80 | random_bits & (2**80 - 1)
+    # Version 7 in bits 76-79, RFC variant in bits 62-63
+    value = value & ~(0xF << 76) | 7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return uuid.UUID(int=value)
+
+def new_id():
+    return str(uuid7())
+
+class UUIDKey(sa.TypeDecorator):
+    """UUID column exchanged as a string and stored in 16 bytes"""
+
+    impl = sa.LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(sa.LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            parsed = value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+        except ValueError:
+            # Not a UUID, so it can't be the key of any row (e.g. a mistyped URL)
+            return None
+        return str(parsed) if dialect.name == 'postgresql' else parsed.bytes
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == 'postgresql':
+            return value
+        return str(uuid.UUID(bytes=value))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Gallery image metadata for Shri Shyam Public School
+
+Width, height and dominant colour are read once, when an image is
+uploaded, and stored on the gallery row. The site uses them to reserve
+each image's space and paint a placeholder before the image is loaded.
+
+Usage:
+    python images.py backfill     # fill in metadata for uploads that lack it
+"""
+
+import argparse
+import os
+import sys
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Colours are counted on a thumbnail no larger than this
+SAMPLE_SIZE = (64, 64)
+
+EXIF_ORIENTATION = 0x0112
+
+class InvalidImage(ValueError):
+    pass
+
+def image_metadata(path):
+    """{'width', 'height', 'dominant_color'} of an image file, as displayed (EXIF rotation applied)"""
+    try:
+        with Image.open(path) as image:
+            width, height = image.size
+            # EXIF orientations 5-8 are displayed rotated by 90 degrees
+            if image.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8):
+                width, height = height, width
+            # Decode JPEGs at a reduced scale; only the thumbnail is needed
+            image.draft('RGB', SAMPLE_SIZE)
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(SAMPLE_SIZE)
+            sample = image.convert('RGB').quantize(colors=8)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise InvalidImage('Not a readable image file') from None
+    _, index = max(sample.getcolors())
+    r, g, b = sample.getpalette()[index * 3:index * 3 + 3]
+    return {'width': width, 'height': height, 'dominant_color': f'#{r:02x}{g:02x}{b:02x}'}
+
+def upload_path(app, image_url):
+    """Local file behind an /api/uploads/ URL, or None for external images"""
+    prefix = '/api/uploads/'
+    if not image_url or not image_url.startswith(prefix):
+        return None
+    return os.path.join(app.config['UPLOAD_FOLDER'], os.path.basename(image_url[len(prefix):]))
+
+def backfill(app, log=print):
+    """Compute metadata for gallery rows that have none; returns (updated, skipped)"""
+    from extensions import db, response_cache
+    from models import Gallery
+
+    updated = skipped = 0
+    for item in Gallery.query.filter(Gallery.width.is_(None)).all():
+        path = upload_path(app, item.image_url)
+        try:
+            if path is None or not os.path.exists(path):
+                raise InvalidImage('file not found')
+            metadata = image_metadata(path)
+        except InvalidImage as e:
+            log(f"- Skipped {item.image_url}: {e}")
+            skipped += 1
+            continue
+        for name, value in metadata.items():
+            setattr(item, name, value)
+        updated += 1
+    db.session.commit()
+    if updated:
+        response_cache.invalidate()
+    return updated, skipped
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Gallery image metadata')
+    parser.add_argument('command', choices=['backfill'])
+    parser.parse_args(argv)
+
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        updated, skipped = backfill(app)
+    print(f"✅ Metadata added to {updated:,} images ({skipped:,} skipped)")
+
+if __name__ == '__main__':
+    main()
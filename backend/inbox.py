@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Contact message triage for Shri Shyam Public School
+
+Staff mark messages read, unread or replied many at a time: one request
+updates a whole selection in one transaction. ``message_counts`` holds the
+number of messages per status; sending a message adds one to ``unread``
+and triage moves messages between statuses in the same transaction, so
+the dashboard's unread count is a single primary key read. Archived
+messages stay counted.
+
+Rows written around the API (bulk loads, manual SQL) aren't counted; a
+rebuild recomputes the table from the messages.
+
+Usage:
+    python inbox.py rebuild     # recount from contact messages and their archive
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+STATUSES = ('unread', 'read', 'replied')
+# Most messages one triage request may change
+MAX_BATCH = 500
+
+def _counts_table():
+    from models import MessageCount
+    return MessageCount.__table__
+
+def count_messages(session, status, delta=1):
+    """Add ``delta`` to the messages counted under ``status``; call inside the messages' transaction"""
+    table = _counts_table()
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        statement = sqlite.insert(table)
+    elif dialect == 'postgresql':
+        statement = postgresql.insert(table)
+    else:
+        raise RuntimeError(f"Message counts are not supported on {dialect}")
+    statement = statement.values(status=status, messages=delta)
+    session.execute(statement.on_conflict_do_update(
+        index_elements=['status'], set_={'messages': table.c.messages + delta}))
+
+def unread_count(session):
+    table = _counts_table()
+    return session.execute(sa.select(table.c.messages).where(table.c.status == 'unread')).scalar() or 0
+
+def triage(session, ids, status, reply=None, now=None):
+    """Set ``status`` (and a reply) on the messages ``ids``; returns (updated rows, unchanged ids, missing ids).
+
+    Messages already in ``status`` are left alone unless there is a reply to
+    store. Each old status is updated by its own statement whose WHERE holds
+    the old status, so a concurrent change can't make the counts drift.
+    Doesn't commit.
+    """
+    from models import ContactMessage
+
+    table = ContactMessage.__table__
+    values = {'status': status}
+    if reply is not None:
+        values.update(admin_reply=reply, replied_at=now or datetime.utcnow())
+
+    updated = []
+    # Messages already in ``status`` first, before the others are moved into it
+    for old in sorted(STATUSES, key=lambda old: old != status):
+        if old == status and reply is None:
+            continue
+        rows = session.execute(
+            sa.update(table).where(table.c.id.in_(ids), table.c.status == old).values(**values)
+            .returning(*table.c)
+        ).all()
+        if rows and old != status:
+            count_messages(session, old, -len(rows))
+            count_messages(session, status, len(rows))
+        updated += rows
+
+    changed = {row.id for row in updated}
+    rest = [message_id for message_id in ids if message_id not in changed]
+    existing = set(session.execute(sa.select(table.c.id).where(table.c.id.in_(rest))).scalars()) if rest else set()
+    return (updated, [message_id for message_id in rest if message_id in existing],
+            [message_id for message_id in rest if message_id not in existing])
+
+def rebuild(engine):
+    """Recount message_counts from contact_messages and contact_messages_archive; returns the messages counted"""
+    from models import ContactMessage, contact_messages_archive
+
+    table = _counts_table()
+    rows = sa.union_all(*[sa.select(source.c.status) for source in
+                          (ContactMessage.__table__, contact_messages_archive)]).subquery()
+    groups = (sa.select(rows.c.status, sa.func.count()).where(rows.c.status.is_not(None))
+              .group_by(rows.c.status))
+    with engine.begin() as conn:
+        conn.execute(table.delete())
+        conn.execute(table.insert().from_select(['status', 'messages'], groups))
+        return conn.execute(sa.select(sa.func.coalesce(sa.func.sum(table.c.messages), 0))).scalar()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Contact message counts')
+    parser.add_argument('command', choices=['rebuild'])
+    parser.parse_args(argv)
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app()
+    with app.app_context():
+        messages = rebuild(db.engine)
+        unread = unread_count(db.session)
+    print(f"✅ Message counts rebuilt: {messages:,} messages, {unread:,} unread")
+
+if __name__ == '__main__':
+    main()
@@ -1,36 +1,274 @@
 #!/usr/bin/env python3
 """
 Database initialization script for Shri Shyam Public School
-This script creates the database tables and adds sample data
+This script applies schema migrations and adds sample data.
+It can also bulk-import any JSON file shaped like sample-data/sample_data.json.
+
+Usage:
+    python init_database.py
+    python init_database.py --reset
+    python init_database.py --import ../sample-data/sample_data.json
 """
 
+import argparse
+import json
 import os
 import sys
+import time
 from datetime import datetime, date
-import sqlite3
+
+from sqlalchemy.dialects import postgresql, sqlite
 
 # Add the current directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app import app, db, Admin, News, Event, Result, Topper, Faculty
+from app import create_app
+from extensions import db, response_cache
+from migrations import drop_schema_version, upgrade
+from models import News, Event, Result, Topper, Faculty, FacultySubject
+from utils import parse_number, parse_subjects
+
+# Migrations are applied explicitly below, after an optional reset
+app = create_app({'SCHEMA_CHECK': False})
+
+# Natural keys used to match incoming rows against existing ones.
+# Each has a unique index (migration 2) so upserts can use ON CONFLICT.
+NATURAL_KEYS = {
+    News: ('title',),
+    Event: ('title', 'event_date'),
+    Result: ('class_level', 'year'),
+    Topper: ('name', 'class_level', 'year'),
+    Faculty: ('name',),
+}
+
+def _write_faculty_subjects(conn, subjects_by_id):
+    """Replace the subjects of the given faculty members"""
+    table = FacultySubject.__table__
+    conn.execute(table.delete().where(table.c.faculty_id.in_(list(subjects_by_id))))
+    rows = [{'faculty_id': faculty_id, 'position': position, 'subject': subject}
+            for faculty_id, value in subjects_by_id.items()
+            for position, subject in enumerate(parse_subjects(value))]
+    if rows:
+        conn.execute(table.insert(), rows)
+
+# Input fields stored in a child table rather than a column: model -> (field, writer)
+CHILD_FIELDS = {
+    Faculty: ('subjects', _write_faculty_subjects),
+}
+
+# Columns filled in by the database layer rather than by imported data
+GENERATED_COLUMNS = {'id', 'created_at', 'updated_at'}
+
+DEFAULT_BATCH_SIZE = 1000
+
+def _insert(table):
+    """Dialect-specific INSERT supporting ON CONFLICT"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        return sqlite.insert(table)
+    if dialect == 'postgresql':
+        return postgresql.insert(table)
+    raise RuntimeError(f"Upserts are not supported on {dialect}")
+
+def _content_columns(model):
+    return [column for column in model.__table__.columns if column.name not in GENERATED_COLUMNS]
+
+def _normalize(model, data):
+    """Map an input dict onto the model's content columns with defaults and types applied"""
+    row = {}
+    for column in _content_columns(model):
+        value = data.get(column.name)
+        if value is None and column.default is not None and column.default.is_callable:
+            # Computed per row by the column default, e.g. News.priority_rank
+            continue
+        if value is None and column.default is not None and column.default.is_scalar:
+            value = column.default.arg
+        elif isinstance(value, str) and column.type.python_type is date:
+            value = datetime.strptime(value, '%Y-%m-%d').date()
+        elif isinstance(value, str) and column.type.python_type in (int, float):
+            # e.g. Result.pass_rate '98%' and district_rank '2nd'
+            value = parse_number(value, column.type.python_type)
+        elif isinstance(value, (list, dict)):
+            # Structured values in a text column are stored as JSON
+            value = json.dumps(value, ensure_ascii=False)
+        row[column.name] = value
+    return row
+
+def upsert_rows(model, rows, update_existing=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Insert rows in batched transactions, matching existing rows by natural key.
+
+    Existing rows are left alone unless ``update_existing`` is set, in which
+    case their content columns are overwritten. Returns the number of rows
+    processed.
+    """
+    table = model.__table__
+    keys = NATURAL_KEYS[model]
+    statement = _insert(table)
+    if update_existing:
+        updates = {column.name: statement.excluded[column.name]
+                   for column in _content_columns(model) if column.name not in keys}
+        if 'updated_at' in table.columns:
+            updates['updated_at'] = datetime.utcnow()
+        statement = statement.on_conflict_do_update(index_elements=keys, set_=updates)
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=keys)
+
+    child = CHILD_FIELDS.get(model)
+    if child:
+        # Only rows actually inserted or updated come back, so skipped ones keep their children
+        statement = statement.returning(table.c.id, *[table.c[key] for key in keys])
+
+    def write(batch, children):
+        with db.engine.begin() as conn:
+            result = conn.execute(statement, batch)
+            if child:
+                child[1](conn, {row[0]: children[tuple(row[1:])] for row in result})
+
+    total = 0
+    batch, children = [], {}
+    for data in rows:
+        row = _normalize(model, data)
+        batch.append(row)
+        if child:
+            children[tuple(row[key] for key in keys)] = data.get(child[0])
+        if len(batch) >= batch_size:
+            write(batch, children)
+            total += len(batch)
+            batch, children = [], {}
+    if batch:
+        write(batch, children)
+        total += len(batch)
+    return total
+
+class JSONStream:
+    """Incremental reader for a top-level JSON object whose values are mostly arrays.
+
+    Array elements are decoded one at a time, so files far larger than
+    memory can be imported.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, f):
+        self.file = f
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.file.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' at offset {self.pos} in JSON input")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value ending exactly at the buffer end (e.g. a number) may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+    def sections(self):
+        """Yield (key, items) for each top-level member; non-array values yield a single item"""
+        self.expect('{')
+        while self.peek() != '}':
+            key = self.value()
+            self.expect(':')
+            if self.peek() == '[':
+                self.pos += 1
+                items = self._array_items()
+                yield key, items
+                for _ in items:  # skip whatever the caller didn't consume
+                    pass
+            else:
+                yield key, iter([self.value()])
+            if self.peek() == ',':
+                self.pos += 1
+        self.expect('}')
+
+    def _array_items(self):
+        while self.peek() != ']':
+            yield self.value()
+            if self.peek() == ',':
+                self.pos += 1
+        self.pos += 1
+
+def _result_rows(items):
+    """Flatten {"class_12": [...], "class_10": [...]} into Result rows"""
+    for results_by_class in items:
+        for key, rows in results_by_class.items():
+            class_level = key.replace('class_', '')
+            for row in rows:
+                yield dict(row, class_level=class_level)
+
+# Top-level JSON sections and how they map onto models
+IMPORT_SECTIONS = {
+    'news': (News, lambda items: items),
+    'events': (Event, lambda items: items),
+    'results': (Result, _result_rows),
+    'toppers': (Topper, lambda items: items),
+    'faculty': (Faculty, lambda items: items),
+}
+
+def import_json(path, batch_size=DEFAULT_BATCH_SIZE):
+    """Upsert every supported section of a JSON file in one streaming pass"""
+    with app.app_context():
+        upgrade(db.engine)
+
+        started = time.perf_counter()
+        total = 0
+        with open(path, encoding='utf-8') as f:
+            for key, items in JSONStream(f).sections():
+                if key not in IMPORT_SECTIONS:
+                    print(f"- Skipped '{key}' (no matching table)")
+                    continue
+                model, to_rows = IMPORT_SECTIONS[key]
+                section_started = time.perf_counter()
+                count = upsert_rows(model, to_rows(items), update_existing=True, batch_size=batch_size)
+                elapsed = time.perf_counter() - section_started
+                rate = count / elapsed if elapsed else 0
+                print(f"✓ Imported {count:,} {key} rows in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+                total += count
+
+        # Running servers sharing the cache directory drop their cached responses
+        response_cache.invalidate()
+
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        print(f"✅ Imported {total:,} rows from {path} in {elapsed:.2f}s ({rate:,.0f} rows/s)")
 
 def init_database():
     """Initialize the database with tables and sample data"""
     
     with app.app_context():
-        print("Creating database tables...")
-        db.create_all()
-        
-        # Create admin user if doesn't exist
-        if not Admin.query.filter_by(username='admin').first():
-            admin = Admin(
-                username='admin',
-                email='admin@shrishyamschool.edu',
-                full_name='System Administrator'
-            )
-            admin.set_password('admin123')
-            db.session.add(admin)
-            print("✓ Created admin user: admin/admin123")
+        print("Applying schema migrations...")
+        # Creates the tables and the default admin user (admin/admin123)
+        upgrade(db.engine)
         
         # Add sample news
         sample_news = [
@@ -60,11 +298,7 @@ def init_database():
             }
         ]
         
-        for news_data in sample_news:
-            if not News.query.filter_by(title=news_data['title']).first():
-                news = News(**news_data)
-                db.session.add(news)
-        
+        upsert_rows(News, sample_news)
         print("✓ Added sample news items")
         
         # Add sample events
@@ -105,11 +339,7 @@ def init_database():
             }
         ]
         
-        for event_data in sample_events:
-            if not Event.query.filter_by(title=event_data['title']).first():
-                event = Event(**event_data)
-                db.session.add(event)
-        
+        upsert_rows(Event, sample_events)
         print("✓ Added sample events")
         
         # Add sample results
@@ -118,68 +348,61 @@ def init_database():
             {
                 'class_level': '12',
                 'year': 2024,
-                'pass_rate': '98%',
+                'pass_rate': 98,
                 'above_90': 45,
                 'above_95': 15,
-                'district_rank': '2nd',
-                'state_rank': '15th'
+                'district_rank': 2,
+                'state_rank': 15
             },
             {
                 'class_level': '12',
                 'year': 2023,
-                'pass_rate': '96%',
+                'pass_rate': 96,
                 'above_90': 38,
                 'above_95': 12,
-                'district_rank': '3rd',
-                'state_rank': '18th'
+                'district_rank': 3,
+                'state_rank': 18
             },
             {
                 'class_level': '12',
                 'year': 2022,
-                'pass_rate': '94%',
+                'pass_rate': 94,
                 'above_90': 35,
                 'above_95': 10,
-                'district_rank': '4th',
-                'state_rank': '22nd'
+                'district_rank': 4,
+                'state_rank': 22
             },
             # Class X Results
             {
                 'class_level': '10',
                 'year': 2024,
-                'pass_rate': '100%',
+                'pass_rate': 100,
                 'above_90': 52,
                 'above_95': 18,
-                'district_rank': '1st',
-                'state_rank': '8th'
+                'district_rank': 1,
+                'state_rank': 8
             },
             {
                 'class_level': '10',
                 'year': 2023,
-                'pass_rate': '98%',
+                'pass_rate': 98,
                 'above_90': 48,
                 'above_95': 15,
-                'district_rank': '2nd',
-                'state_rank': '12th'
+                'district_rank': 2,
+                'state_rank': 12
             },
             {
                 'class_level': '10',
                 'year': 2022,
-                'pass_rate': '96%',
+                'pass_rate': 96,
                 'above_90': 42,
                 'above_95': 13,
-                'district_rank': '3rd',
-                'state_rank': '16th'
+                'district_rank': 3,
+                'state_rank': 16
             }
         ]
         
-        for result_data in sample_results:
-            if not Result.query.filter_by(
-                class_level=result_data['class_level'],
-                year=result_data['year']
-            ).first():
-                result = Result(**result_data)
-                db.session.add(result)
-        
+        upsert_rows(Result, sample_results)
         print("✓ Added sample results")
         
         # Add sample toppers
@@ -226,14 +449,7 @@ def init_database():
             }
         ]
         
-        for topper_data in sample_toppers:
-            if not Topper.query.filter_by(
-                name=topper_data['name'],
-                year=topper_data['year']
-            ).first():
-                topper = Topper(**topper_data)
-                db.session.add(topper)
-        
+        upsert_rows(Topper, sample_toppers)
         print("✓ Added sample toppers")
         
         # Add sample faculty
@@ -243,7 +459,7 @@ def init_database():
                 'position': 'Principal',
                 'qualifications': 'M.Ed, B.Ed, M.A. (English)',
                 'experience': '25+ Years Experience',
-                'subjects': 'Educational Leadership, Administration',
+                'subjects': ['Educational Leadership', 'Administration'],
                 'description': 'Educational leadership and administration specialist with extensive experience in curriculum development.',
                 'position_order': 1
             },
@@ -252,7 +468,7 @@ def init_database():
                 'position': 'Vice Principal',
                 'qualifications': 'M.Sc. (Mathematics), B.Ed',
                 'experience': '20+ Years Experience',
-                'subjects': 'Mathematics, Statistics',
+                'subjects': ['Mathematics', 'Statistics'],
                 'description': 'Mathematics department head with expertise in advanced mathematics and analytical thinking.',
                 'position_order': 2
             },
@@ -261,7 +477,7 @@ def init_database():
                 'position': 'Science Department Head',
                 'qualifications': 'Ph.D. (Chemistry), M.Sc., B.Ed',
                 'experience': '15+ Years Experience',
-                'subjects': 'Chemistry, Physics',
+                'subjects': ['Chemistry', 'Physics'],
                 'description': 'Research-oriented chemistry teacher focusing on practical applications and scientific methodology.',
                 'position_order': 3
             },
@@ -270,7 +486,7 @@ def init_database():
                 'position': 'English Teacher',
                 'qualifications': 'M.A. (English), B.Ed',
                 'experience': '18+ Years Experience',
-                'subjects': 'English Literature, Communication',
+                'subjects': ['English Literature', 'Communication'],
                 'description': 'Language specialist with focus on communication skills and literature appreciation.',
                 'position_order': 4
             },
@@ -279,7 +495,7 @@ def init_database():
                 'position': 'Computer Science Teacher',
                 'qualifications': 'MCA, B.Tech (IT)',
                 'experience': '12+ Years Experience',
-                'subjects': 'Computer Science, Programming',
+                'subjects': ['Computer Science', 'Programming'],
                 'description': 'Technology educator specializing in programming, web development, and digital literacy.',
                 'position_order': 5
             },
@@ -288,29 +504,26 @@ def init_database():
                 'position': 'Hindi Teacher',
                 'qualifications': 'M.A. (Hindi), B.Ed',
                 'experience': '16+ Years Experience',
-                'subjects': 'Hindi Literature, Grammar',
+                'subjects': ['Hindi Literature', 'Grammar'],
                 'description': 'Hindi language and literature expert with focus on cultural values and communication skills.',
                 'position_order': 6
             }
         ]
         
-        for faculty_data in sample_faculty:
-            if not Faculty.query.filter_by(name=faculty_data['name']).first():
-                faculty = Faculty(**faculty_data)
-                db.session.add(faculty)
-        
+        upsert_rows(Faculty, sample_faculty)
         print("✓ Added sample faculty")
         
         # Commit all changes
         try:
             db.session.commit()
+            response_cache.invalidate()
             print("✅ Database initialization completed successfully!")
             print("\nDatabase file created at: school.db")
             print("\nAdmin login credentials:")
             print("Username: admin")
             print("Password: admin123")
             print("\nYou can now start the Flask application:")
-            print("python app_sqlite.py")
+            print("python app.py")
             
         except Exception as e:
             db.session.rollback()
@@ -322,12 +535,24 @@ def reset_database():
     with app.app_context():
         print("Dropping all tables...")
         db.drop_all()
+        drop_schema_version(db.engine)
         print("✓ All tables dropped")
         
         init_database()
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1 and sys.argv[1] == "--reset":
+    parser = argparse.ArgumentParser(description='Initialize the school database')
+    parser.add_argument('--reset', action='store_true', help='drop all tables before seeding')
+    parser.add_argument('--import', dest='import_path', metavar='JSON',
+                        help='upsert content from a JSON file shaped like sample_data.json')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    if args.import_path:
+        if args.reset:
+            reset_database()
+        import_json(args.import_path, batch_size=args.batch_size)
+    elif args.reset:
         reset_database()
     else:
         init_database()
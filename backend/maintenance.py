@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Database maintenance for Shri Shyam Public School
+
+A small scheduler thread runs in every gunicorn worker, but only the worker
+holding ``<MAINTENANCE_DIR>/leader.lock`` does any work; if it dies, the
+lock is released and another worker takes over at its next poll. Tasks:
+
+* ``checkpoint`` - hourly passive WAL checkpoint (SQLite)
+* ``optimize``   - hourly ``PRAGMA optimize`` (SQLite)
+* ``idempotency`` - hourly: delete expired Idempotency-Key responses
+* ``analyze``    - daily, off-peak: refresh planner statistics
+* ``vacuum``     - weekly, off-peak: rebuild the file and truncate the WAL
+  (SQLite), ``VACUUM (ANALYZE)`` on PostgreSQL
+
+Off-peak tasks only start inside ``MAINTENANCE_WINDOW`` and are followed by
+warming the public response cache. Every run is recorded with its duration
+in ``maintenance_runs``, which is also how the schedule survives restarts
+and leader changes.
+
+Usage:
+    python maintenance.py status          # last run of each task
+    python maintenance.py run vacuum      # run one task now
+    python maintenance.py run --due       # run whatever is due, ignoring the window
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from shared_state import try_lock
+
+Task = namedtuple('Task', 'name interval off_peak fn')
+
+TASKS = {}
+
+# A failed task is retried after this long rather than after its full interval
+RETRY_AFTER = timedelta(hours=1)
+
+# Run records older than this are deleted after each off-peak round
+KEEP_RUNS = timedelta(days=90)
+
+def default_maintenance_dir():
+    return os.environ.get('MAINTENANCE_DIR', os.path.join(tempfile.gettempdir(), 'ssps-maintenance'))
+
+def task(name, interval, off_peak=True):
+    """Register a task function taking the engine and returning a short detail string"""
+    def register(fn):
+        TASKS[name] = Task(name, interval, off_peak, fn)
+        return fn
+    return register
+
+def parse_window(window):
+    """'01:00-05:00' -> (time(1, 0), time(5, 0)); the window may wrap past midnight"""
+    start, _, end = window.partition('-')
+    try:
+        return (datetime.strptime(start.strip(), '%H:%M').time(),
+                datetime.strptime(end.strip(), '%H:%M').time())
+    except ValueError:
+        raise ValueError(f"Invalid maintenance window '{window}', expected e.g. '01:00-05:00'") from None
+
+def in_window(window, now):
+    start, end = parse_window(window)
+    moment = now.time()
+    if start <= end:
+        return start <= moment < end
+    return moment >= start or moment < end
+
+def _autocommit(engine):
+    # VACUUM cannot run inside a transaction
+    return engine.connect().execution_options(isolation_level='AUTOCOMMIT')
+
+# Tasks
+
+@task('checkpoint', timedelta(hours=1), off_peak=False)
+def _checkpoint(engine):
+    if engine.dialect.name != 'sqlite':
+        return None
+    with _autocommit(engine) as conn:
+        busy, log_pages, checkpointed = conn.exec_driver_sql('PRAGMA wal_checkpoint(PASSIVE)').first()
+    return f'{checkpointed}/{log_pages} WAL pages checkpointed' + (' (busy)' if busy else '')
+
+@task('optimize', timedelta(hours=1), off_peak=False)
+def _optimize(engine):
+    if engine.dialect.name != 'sqlite':
+        return None
+    with _autocommit(engine) as conn:
+        conn.exec_driver_sql('PRAGMA optimize')
+    return 'ok'
+
+@task('idempotency', timedelta(hours=1), off_peak=False)
+def _expire_idempotency_keys(engine):
+    from idempotency import delete_expired
+    return f'{delete_expired(engine)} expired keys deleted'
+
+@task('analyze', timedelta(days=1))
+def _analyze(engine):
+    with _autocommit(engine) as conn:
+        if engine.dialect.name == 'sqlite':
+            # Sample each index instead of reading all of it
+            conn.exec_driver_sql('PRAGMA analysis_limit=1000')
+        conn.exec_driver_sql('ANALYZE')
+    return 'ok'
+
+@task('vacuum', timedelta(days=7))
+def _vacuum(engine):
+    with _autocommit(engine) as conn:
+        if engine.dialect.name == 'sqlite':
+            before = _sqlite_size(conn)
+            conn.exec_driver_sql('VACUUM')
+            # VACUUM rewrites every page through the WAL; give that space back
+            conn.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+            return f'{before / 1e6:.1f} MB -> {_sqlite_size(conn) / 1e6:.1f} MB'
+        if engine.dialect.name == 'postgresql':
+            conn.exec_driver_sql('VACUUM (ANALYZE)')
+            return 'ok'
+    return None
+
+def _sqlite_size(conn):
+    page_count = conn.exec_driver_sql('PRAGMA page_count').scalar()
+    return page_count * conn.exec_driver_sql('PRAGMA page_size').scalar()
+
+# Scheduling
+
+def _runs_table():
+    # Imported late: extensions.py imports this module before the models exist
+    from models import MaintenanceRun
+    return MaintenanceRun.__table__
+
+def last_runs(conn):
+    """{task: (started_at, duration_ms, status, detail)} for the latest run of each task"""
+    runs = _runs_table()
+    latest = (sa.select(runs.c.task, sa.func.max(runs.c.started_at).label('started_at'))
+              .group_by(runs.c.task).subquery())
+    rows = conn.execute(sa.select(runs.c.task, runs.c.started_at, runs.c.duration_ms, runs.c.status, runs.c.detail)
+                        .join(latest, sa.and_(runs.c.task == latest.c.task,
+                                              runs.c.started_at == latest.c.started_at)))
+    return {row.task: tuple(row[1:]) for row in rows}
+
+def due_tasks(engine, window=None):
+    """Tasks due now; off-peak ones only inside ``window`` (None: ignore the window).
+
+    Runs are recorded in UTC; the window is in the server's local time.
+    """
+    with engine.connect() as conn:
+        latest = last_runs(conn)
+    now = datetime.utcnow()
+    off_peak_ok = window is None or in_window(window, datetime.now())
+    due = []
+    for name, entry in TASKS.items():
+        if entry.off_peak and not off_peak_ok:
+            continue
+        last = latest.get(name)
+        if last is not None:
+            started_at, _, status, _ = last
+            if now < started_at + (entry.interval if status != 'error' else RETRY_AFTER):
+                continue
+        due.append(name)
+    return due
+
+def run_task(engine, name, log=print):
+    """Run one task and record it; returns (status, duration_ms, detail)"""
+    started_at = datetime.utcnow()
+    started = time.perf_counter()
+    try:
+        detail = TASKS[name].fn(engine)
+        status = 'ok' if detail is not None else 'skipped'
+    except Exception as e:
+        status, detail = 'error', str(e)
+    duration_ms = (time.perf_counter() - started) * 1000
+    with engine.begin() as conn:
+        conn.execute(_runs_table().insert().values(task=name, started_at=started_at, duration_ms=duration_ms,
+                                                   status=status, detail=detail))
+    log(f"Maintenance {name}: {status} in {duration_ms:.1f} ms" + (f" ({detail})" if detail else ''))
+    return status, duration_ms, detail
+
+def run_due(app, engine, window=None, log=print):
+    """Run due tasks; after off-peak ones, prune old run records and warm the response cache"""
+    from extensions import response_cache
+
+    ran = [name for name in due_tasks(engine, window)
+           if run_task(engine, name, log)[0] != 'skipped']
+    if any(TASKS[name].off_peak for name in ran):
+        runs = _runs_table()
+        with engine.begin() as conn:
+            conn.execute(runs.delete().where(runs.c.started_at < datetime.utcnow() - KEEP_RUNS))
+        started = time.perf_counter()
+        warmed = response_cache.warm(app)
+        log(f"Maintenance warm_cache: {len(warmed)} routes in {(time.perf_counter() - started) * 1000:.1f} ms")
+    return ran
+
+class MaintenanceScheduler:
+    """Flask extension running due maintenance tasks in the leader worker"""
+
+    def __init__(self, app=None):
+        self.thread = None
+        self.lock_fd = None
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MAINTENANCE_ENABLED', True)
+        app.config.setdefault('MAINTENANCE_DIR', default_maintenance_dir())
+        app.config.setdefault('MAINTENANCE_WINDOW', '01:00-05:00')
+        app.config.setdefault('MAINTENANCE_POLL_SECONDS', 60)
+        parse_window(app.config['MAINTENANCE_WINDOW'])  # fail at startup, not at 1 a.m.
+        app.extensions['maintenance'] = self
+
+    def start(self, app):
+        """Start the scheduler thread (once per process, after forking)"""
+        if not app.config['MAINTENANCE_ENABLED'] or (self.thread and self.thread.is_alive()):
+            return
+        self._stop.clear()
+        self.thread = threading.Thread(target=self._run, args=(app,), name='maintenance', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_leader(self, app):
+        if self.lock_fd is None:
+            os.makedirs(app.config['MAINTENANCE_DIR'], exist_ok=True)
+            fd = os.open(os.path.join(app.config['MAINTENANCE_DIR'], 'leader.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+            if not try_lock(fd):
+                os.close(fd)
+                return False
+            os.ftruncate(fd, 0)
+            os.write(fd, str(os.getpid()).encode())
+            self.lock_fd = fd
+            app.logger.info(f"Maintenance scheduler leader: pid {os.getpid()}")
+        return True
+
+    def _run(self, app):
+        from extensions import db
+
+        while not self._stop.wait(app.config['MAINTENANCE_POLL_SECONDS']):
+            try:
+                if not self.is_leader(app):
+                    continue
+                with app.app_context():
+                    run_due(app, db.engine, window=app.config['MAINTENANCE_WINDOW'], log=app.logger.info)
+            except Exception:
+                # Keep the thread alive; the failure is retried at the next poll
+                app.logger.exception("Maintenance scheduler error")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run or inspect database maintenance tasks')
+    parser.add_argument('command', choices=['status', 'run'], nargs='?', default='status')
+    parser.add_argument('tasks', nargs='*', help=f"tasks to run ({', '.join(TASKS)})")
+    parser.add_argument('--due', action='store_true', help='run the tasks that are due, ignoring the window')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from extensions import db, maintenance
+
+    app = create_app()
+    with app.app_context():
+        if args.command == 'status':
+            with db.engine.connect() as conn:
+                latest = last_runs(conn)
+            print(f"Window: {app.config['MAINTENANCE_WINDOW']}")
+            for name, entry in TASKS.items():
+                if name not in latest:
+                    print(f"  {name:<11} never run")
+                    continue
+                started_at, duration_ms, status, detail = latest[name]
+                print(f"  {name:<11} {started_at:%Y-%m-%d %H:%M}  {status:<7} {duration_ms:>9.1f} ms  {detail or ''}")
+            return 0
+
+        unknown = [name for name in args.tasks if name not in TASKS]
+        if unknown or not (args.tasks or args.due):
+            parser.error(f"choose tasks from {', '.join(TASKS)} or pass --due")
+        # Don't overlap with a running server's scheduler
+        if not maintenance.is_leader(app):
+            print("✗ Another process holds the maintenance lock (a running server's scheduler)")
+            return 1
+        if args.due:
+            run_due(app, db.engine)
+        for name in args.tasks:
+            run_task(db.engine, name)
+        print("✅ Maintenance complete")
+        return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Request metrics for the Shri Shyam Public School API
+
+Each worker process keeps its counters in memory and periodically writes a
+snapshot to ``<METRICS_DIR>/run-<id>/worker-<pid>.json``. The ``/api/metrics``
+endpoint merges the snapshots of all workers and renders them in the
+Prometheus text exposition format, so the numbers are the same whichever
+gunicorn worker answers the scrape.
+
+The run id is the gunicorn master's pid (``METRICS_RUN_ID``, set in
+gunicorn.conf.py), or the process's own pid without gunicorn, so
+processes that aren't workers of the same server never share counts.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+
+from flask import g, request
+
+# Latency histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def default_metrics_dir():
+    return os.environ.get('METRICS_DIR', os.path.join(tempfile.gettempdir(), 'ssps-metrics'))
+
+def run_id():
+    return os.environ.get('METRICS_RUN_ID') or str(os.getpid())
+
+def _remove_snapshots(path):
+    for name in os.listdir(path):
+        if name.startswith('worker-') and name.endswith('.json'):
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+
+def clear_metrics_dir(path=None):
+    """Remove the snapshots of server runs whose process has exited"""
+    path = path or default_metrics_dir()
+    if not os.path.isdir(path):
+        return
+    # Snapshots written directly into METRICS_DIR by older versions
+    _remove_snapshots(path)
+    for name in os.listdir(path):
+        run = name[len('run-'):]
+        if name.startswith('run-') and run.isdigit() and run != run_id() and not _pid_alive(int(run)):
+            shutil.rmtree(os.path.join(path, name), ignore_errors=True)
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class RequestMetrics:
+    """Flask extension recording per-endpoint request metrics"""
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._reset()
+        if app is not None:
+            self.init_app(app)
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.histograms = {}     # "endpoint|method" -> [bucket counts..., +Inf count, sum]
+        self.requests = {}       # "endpoint|method|status" -> count
+        self.request_bytes = {}  # "endpoint|method" -> bytes received
+        self.response_bytes = {} # "endpoint|method" -> bytes sent
+        self.in_flight = {}      # "endpoint|method" -> currently running
+        self._last_flush = 0.0
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_DIR', default_metrics_dir())
+        app.config.setdefault('METRICS_FLUSH_INTERVAL', 1.0)
+        app.config.setdefault('METRICS_BUCKETS', DEFAULT_BUCKETS)
+        self.directory = os.path.join(app.config['METRICS_DIR'], f'run-{run_id()}')
+        self.flush_interval = app.config['METRICS_FLUSH_INTERVAL']
+        self.buckets = tuple(app.config['METRICS_BUCKETS'])
+        clear_metrics_dir(app.config['METRICS_DIR'])
+        os.makedirs(self.directory, exist_ok=True)
+        if run_id() == str(os.getpid()):
+            # This process starts the run; files here are from an exited process that had the same pid
+            _remove_snapshots(self.directory)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.extensions['request_metrics'] = self
+
+    # Request hooks
+
+    def _key(self):
+        return f"{request.endpoint or 'unmatched'}|{request.method}"
+
+    def _before_request(self):
+        if os.getpid() != self.pid:
+            # Forked after the app was created (gunicorn --preload): start clean
+            with self._lock:
+                self._reset()
+        key = self._key()
+        g._metrics_key = key
+        g._metrics_start = time.perf_counter()
+        with self._lock:
+            self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def _after_request(self, response):
+        start = g.pop('_metrics_start', None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        key = g._metrics_key
+        sent = response.calculate_content_length() or 0
+        received = request.content_length or 0
+
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            histogram[bisect_left(self.buckets, elapsed)] += 1
+            histogram[-1] += elapsed
+            status_key = f'{key}|{response.status_code}'
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            self.request_bytes[key] = self.request_bytes.get(key, 0) + received
+            self.response_bytes[key] = self.response_bytes.get(key, 0) + sent
+        return response
+
+    def _teardown_request(self, exc):
+        key = g.pop('_metrics_key', None)
+        if key is None:
+            return
+        with self._lock:
+            self.in_flight[key] -= 1
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.flush(now)
+
+    # Storage
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'pid': self.pid,
+                'buckets': list(self.buckets),
+                'histograms': {k: list(v) for k, v in self.histograms.items()},
+                'requests': dict(self.requests),
+                'request_bytes': dict(self.request_bytes),
+                'response_bytes': dict(self.response_bytes),
+                'in_flight': dict(self.in_flight),
+            }
+
+    def flush(self, now=None):
+        """Write this worker's snapshot atomically to the metrics directory"""
+        self._last_flush = now if now is not None else time.monotonic()
+        path = os.path.join(self.directory, f'worker-{self.pid}.json')
+        tmp_path = f'{path}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # metrics must never break a request
+
+    def collect(self):
+        """Merge the snapshots of every worker, including this one"""
+        self.flush()
+        merged = {'histograms': {}, 'requests': {}, 'request_bytes': {},
+                  'response_bytes': {}, 'in_flight': {}}
+        for name in os.listdir(self.directory):
+            if not (name.startswith('worker-') and name.endswith('.json')):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if tuple(data.get('buckets', ())) != self.buckets:
+                continue
+
+            for key, values in data['histograms'].items():
+                total = merged['histograms'].setdefault(key, [0] * len(values))
+                for i, value in enumerate(values):
+                    total[i] += value
+            for field in ('requests', 'request_bytes', 'response_bytes'):
+                for key, value in data[field].items():
+                    merged[field][key] = merged[field].get(key, 0) + value
+            # Counters of exited workers stay, their in-flight requests do not
+            if data['pid'] == self.pid or _pid_alive(data['pid']):
+                for key, value in data['in_flight'].items():
+                    merged['in_flight'][key] = merged['in_flight'].get(key, 0) + value
+        return merged
+
+    def render(self):
+        """Render the merged metrics in the Prometheus text format"""
+        merged = self.collect()
+        lines = []
+
+        def labels(key, *extra):
+            endpoint, method = key.split('|')[:2]
+            pairs = [('endpoint', endpoint), ('method', method)] + list(extra)
+            return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+        lines.append('# HELP http_request_duration_seconds Request latency by endpoint')
+        lines.append('# TYPE http_request_duration_seconds histogram')
+        for key in sorted(merged['histograms']):
+            values = merged['histograms'][key]
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{labels(key, ("le", bound))} {cumulative}')
+            cumulative += values[len(self.buckets)]
+            lines.append(f'http_request_duration_seconds_bucket{labels(key, ("le", "+Inf"))} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{labels(key)} {values[-1]:.6f}')
+            lines.append(f'http_request_duration_seconds_count{labels(key)} {cumulative}')
+
+        lines.append('# HELP http_requests_total Completed requests by endpoint and status')
+        lines.append('# TYPE http_requests_total counter')
+        for key in sorted(merged['requests']):
+            status = key.rsplit('|', 1)[1]
+            lines.append(f'http_requests_total{labels(key, ("status", status))} {merged["requests"][key]}')
+
+        for field, name, help_text in (
+            ('request_bytes', 'http_request_bytes_total', 'Request body bytes received'),
+            ('response_bytes', 'http_response_bytes_total', 'Response body bytes sent'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for key in sorted(merged[field]):
+                lines.append(f'{name}{labels(key)} {merged[field][key]}')
+
+        lines.append('# HELP http_requests_in_flight Requests currently being handled')
+        lines.append('# TYPE http_requests_in_flight gauge')
+        for key in sorted(merged['in_flight']):
+            lines.append(f'http_requests_in_flight{labels(key)} {merged["in_flight"][key]}')
+
+        return '\n'.join(lines) + '\n'
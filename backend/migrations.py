@@ -0,0 +1,658 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for Shri Shyam Public School
+
+Applied migrations are recorded in the ``schema_version`` table. Checking
+whether the database is current is a single indexed lookup, so it is cheap
+enough to run at application startup. Each pending migration runs in its
+own transaction and is recorded in that same transaction.
+
+Migrations are frozen: they describe the schema change as it was made and
+must never import the current models, which keep evolving. Logic that
+writes data is copied into the migration for the same reason. The one
+exception is derived data that has to match the code reading it:
+migration 15 builds the search index with ``search.document``, and a
+change to that needs ``python search.py rebuild``, not a new migration.
+
+Usage:
+    python migrations.py upgrade      # apply pending migrations
+    python migrations.py status       # show current and latest version
+    python migrations.py history      # list all migrations
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+import unicodedata
+from contextlib import contextmanager
+from datetime import datetime
+
+import sqlalchemy as sa
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+MIGRATIONS = []
+
+# Arbitrary application-wide key for PostgreSQL's advisory lock
+MIGRATION_LOCK_KEY = 5_310_033
+
+schema_version = sa.Table(
+    'schema_version', sa.MetaData(),
+    sa.Column('version', sa.Integer, primary_key=True, autoincrement=False),
+    sa.Column('description', sa.String(200), nullable=False),
+    sa.Column('applied_at', sa.DateTime, nullable=False),
+    sa.Column('duration_ms', sa.Float),
+)
+
+def migration(version, description):
+    """Register a migration function taking an open connection"""
+    def register(fn):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f"Migration {version} is out of order")
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+@contextmanager
+def _transaction(engine):
+    """Transaction that also covers DDL.
+
+    pysqlite doesn't open a transaction before DDL on its own, so on SQLite
+    the transaction is managed explicitly. BEGIN IMMEDIATE also serializes
+    workers that start migrating at the same moment; PostgreSQL gets the
+    same from a transaction-scoped advisory lock.
+    """
+    if engine.dialect.name == 'sqlite':
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.exec_driver_sql('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.exec_driver_sql('ROLLBACK')
+                raise
+            conn.exec_driver_sql('COMMIT')
+    else:
+        with engine.begin() as conn:
+            if engine.dialect.name == 'postgresql':
+                # Held until commit; serializes workers migrating at once
+                conn.execute(sa.text('SELECT pg_advisory_xact_lock(:key)'), {'key': MIGRATION_LOCK_KEY})
+            yield conn
+
+def current_version(conn):
+    """Highest applied version, or 0 for an unversioned database"""
+    if not sa.inspect(conn).has_table('schema_version'):
+        return 0
+    return conn.execute(sa.select(schema_version.c.version)
+                        .order_by(schema_version.c.version.desc()).limit(1)).scalar() or 0
+
+def is_current(engine):
+    with engine.connect() as conn:
+        return current_version(conn) >= latest_version()
+
+def upgrade(engine, target=None, log=print):
+    """Apply pending migrations up to ``target`` (default: latest). Returns the number applied."""
+    target = latest_version() if target is None else target
+    schema_version.create(engine, checkfirst=True)
+
+    applied = 0
+    for version, description, fn in MIGRATIONS:
+        if version > target:
+            break
+        with _transaction(engine) as conn:
+            # Re-read inside the transaction: another worker may have applied it meanwhile
+            if current_version(conn) >= version:
+                continue
+            started = time.perf_counter()
+            fn(conn)
+            duration_ms = (time.perf_counter() - started) * 1000
+            conn.execute(schema_version.insert().values(
+                version=version, description=description,
+                applied_at=datetime.utcnow(), duration_ms=duration_ms,
+            ))
+        log(f"✓ Applied migration {version}: {description} ({duration_ms:.1f} ms)")
+        applied += 1
+    return applied
+
+def ensure_schema(app):
+    """Startup hook: migrate when AUTO_MIGRATE is set, otherwise only warn about pending migrations"""
+    from extensions import db
+
+    with app.app_context():
+        if is_current(db.engine):
+            return
+        if app.config.get('AUTO_MIGRATE', True):
+            upgrade(db.engine, log=app.logger.info)
+        else:
+            app.logger.warning("Database schema is behind; run `python migrations.py upgrade`")
+
+def drop_schema_version(engine):
+    schema_version.drop(engine, checkfirst=True)
+
+# Migrations
+
+@migration(1, 'Initial schema')
+def _initial_schema(conn):
+    # Tables as they existed before versioning; databases created by the
+    # old db.create_all() already have them and are adopted unchanged
+    meta = sa.MetaData()
+    pk = lambda: sa.Column('id', sa.String(36), primary_key=True)
+    sa.Table('admins', meta, pk(),
+             sa.Column('username', sa.String(80), unique=True, nullable=False),
+             sa.Column('email', sa.String(120), unique=True, nullable=False),
+             sa.Column('password_hash', sa.String(128), nullable=False),
+             sa.Column('full_name', sa.String(100), nullable=False),
+             sa.Column('is_active', sa.Boolean),
+             sa.Column('created_at', sa.DateTime),
+             sa.Column('last_login', sa.DateTime))
+    sa.Table('news', meta, pk(),
+             sa.Column('title', sa.String(200), nullable=False),
+             sa.Column('content', sa.Text, nullable=False),
+             sa.Column('emoji', sa.String(10)),
+             sa.Column('priority', sa.String(20)),
+             sa.Column('is_active', sa.Boolean),
+             sa.Column('created_at', sa.DateTime),
+             sa.Column('updated_at', sa.DateTime))
+    sa.Table('admissions', meta, pk(),
+             sa.Column('student_name', sa.String(100), nullable=False),
+             sa.Column('class_applying', sa.String(20), nullable=False),
+             sa.Column('date_of_birth', sa.Date, nullable=False),
+             sa.Column('gender', sa.String(20), nullable=False),
+             sa.Column('father_name', sa.String(100), nullable=False),
+             sa.Column('mother_name', sa.String(100), nullable=False),
+             sa.Column('phone', sa.String(20), nullable=False),
+             sa.Column('email', sa.String(120), nullable=False),
+             sa.Column('address', sa.Text, nullable=False),
+             sa.Column('previous_school', sa.String(200)),
+             sa.Column('previous_percentage', sa.Float),
+             sa.Column('application_status', sa.String(20)),
+             sa.Column('submitted_at', sa.DateTime),
+             sa.Column('updated_at', sa.DateTime),
+             sa.Column('admin_notes', sa.Text))
+    sa.Table('contact_messages', meta, pk(),
+             sa.Column('name', sa.String(100), nullable=False),
+             sa.Column('email', sa.String(120), nullable=False),
+             sa.Column('phone', sa.String(20)),
+             sa.Column('subject', sa.String(200), nullable=False),
+             sa.Column('message', sa.Text, nullable=False),
+             sa.Column('status', sa.String(20)),
+             sa.Column('submitted_at', sa.DateTime),
+             sa.Column('replied_at', sa.DateTime),
+             sa.Column('admin_reply', sa.Text))
+    sa.Table('events', meta, pk(),
+             sa.Column('title', sa.String(200), nullable=False),
+             sa.Column('description', sa.Text, nullable=False),
+             sa.Column('event_date', sa.Date, nullable=False),
+             sa.Column('event_time', sa.String(20)),
+             sa.Column('location', sa.String(200), nullable=False),
+             sa.Column('category', sa.String(50)),
+             sa.Column('is_featured', sa.Boolean),
+             sa.Column('image_url', sa.String(500)),
+             sa.Column('created_at', sa.DateTime),
+             sa.Column('updated_at', sa.DateTime))
+    sa.Table('results', meta, pk(),
+             sa.Column('class_level', sa.String(10), nullable=False),
+             sa.Column('year', sa.Integer, nullable=False),
+             sa.Column('pass_rate', sa.String(10), nullable=False),
+             sa.Column('above_90', sa.Integer),
+             sa.Column('above_95', sa.Integer),
+             sa.Column('district_rank', sa.String(20)),
+             sa.Column('state_rank', sa.String(20)),
+             sa.Column('created_at', sa.DateTime))
+    sa.Table('toppers', meta, pk(),
+             sa.Column('name', sa.String(100), nullable=False),
+             sa.Column('class_level', sa.String(10), nullable=False),
+             sa.Column('year', sa.Integer, nullable=False),
+             sa.Column('percentage', sa.Float, nullable=False),
+             sa.Column('stream', sa.String(50), nullable=False),
+             sa.Column('achievement', sa.String(200)),
+             sa.Column('photo_url', sa.String(500)),
+             sa.Column('created_at', sa.DateTime))
+    sa.Table('gallery', meta, pk(),
+             sa.Column('title', sa.String(200), nullable=False),
+             sa.Column('description', sa.Text),
+             sa.Column('image_url', sa.String(500), nullable=False),
+             sa.Column('category', sa.String(50)),
+             sa.Column('is_active', sa.Boolean),
+             sa.Column('created_at', sa.DateTime))
+    sa.Table('faculty', meta, pk(),
+             sa.Column('name', sa.String(100), nullable=False),
+             sa.Column('position', sa.String(100), nullable=False),
+             sa.Column('qualifications', sa.String(200), nullable=False),
+             sa.Column('experience', sa.String(100)),
+             sa.Column('subjects', sa.Text),
+             sa.Column('description', sa.Text),
+             sa.Column('photo_url', sa.String(500)),
+             sa.Column('position_order', sa.Integer),
+             sa.Column('is_active', sa.Boolean),
+             sa.Column('created_at', sa.DateTime))
+    meta.create_all(conn, checkfirst=True)
+
+@migration(2, 'Natural-key unique indexes')
+def _natural_key_indexes(conn):
+    conn.exec_driver_sql('CREATE UNIQUE INDEX IF NOT EXISTS uq_news_title ON news (title)')
+    conn.exec_driver_sql('CREATE UNIQUE INDEX IF NOT EXISTS uq_events_title_date ON events (title, event_date)')
+    conn.exec_driver_sql('CREATE UNIQUE INDEX IF NOT EXISTS uq_results_class_year ON results (class_level, year)')
+    conn.exec_driver_sql('CREATE UNIQUE INDEX IF NOT EXISTS uq_toppers_name_class_year ON toppers (name, class_level, year)')
+    conn.exec_driver_sql('CREATE UNIQUE INDEX IF NOT EXISTS uq_faculty_name ON faculty (name)')
+
+@migration(3, 'Default admin user')
+def _default_admin(conn):
+    if conn.exec_driver_sql("SELECT 1 FROM admins WHERE username = 'admin'").first():
+        return
+    import uuid
+    from flask_bcrypt import generate_password_hash
+    conn.execute(sa.text(
+        'INSERT INTO admins (id, username, email, password_hash, full_name, is_active, created_at) '
+        'VALUES (:id, :username, :email, :password_hash, :full_name, :is_active, :created_at)'
+    ), {
+        'id': str(uuid.uuid4()),
+        'username': 'admin',
+        'email': 'admin@shrishyamschool.edu',
+        'password_hash': generate_password_hash('admin123').decode('utf-8'),  # Change this in production
+        'full_name': 'System Administrator',
+        'is_active': True,
+        'created_at': datetime.utcnow(),
+    })
+    print("Default admin user created: admin/admin123")
+
+@migration(4, 'Indexes for list queries')
+def _query_indexes(conn):
+    # Partial indexes where the dialect supports them (SQLite and
+    # PostgreSQL both do); one definition renders for either
+    meta = sa.MetaData()
+    news = sa.Table('news', meta, sa.Column('created_at', sa.DateTime), sa.Column('is_active', sa.Boolean))
+    gallery = sa.Table('gallery', meta, sa.Column('created_at', sa.DateTime), sa.Column('is_active', sa.Boolean))
+    faculty = sa.Table('faculty', meta, sa.Column('position_order', sa.Integer), sa.Column('is_active', sa.Boolean))
+    events = sa.Table('events', meta, sa.Column('event_date', sa.Date))
+    toppers = sa.Table('toppers', meta, sa.Column('year', sa.Integer))
+    admissions = sa.Table('admissions', meta, sa.Column('application_status', sa.String(20)),
+                          sa.Column('submitted_at', sa.DateTime))
+    contacts = sa.Table('contact_messages', meta, sa.Column('status', sa.String(20)),
+                        sa.Column('submitted_at', sa.DateTime))
+
+    def active(table):
+        return {'sqlite_where': table.c.is_active == sa.true(),
+                'postgresql_where': table.c.is_active == sa.true()}
+
+    indexes = [
+        sa.Index('ix_news_active_created', news.c.created_at, **active(news)),
+        sa.Index('ix_gallery_active_created', gallery.c.created_at, **active(gallery)),
+        sa.Index('ix_faculty_active_order', faculty.c.position_order, **active(faculty)),
+        sa.Index('ix_events_date', events.c.event_date),
+        sa.Index('ix_toppers_year', toppers.c.year),
+        sa.Index('ix_admissions_submitted', admissions.c.submitted_at),
+        sa.Index('ix_admissions_status_submitted', admissions.c.application_status, admissions.c.submitted_at),
+        sa.Index('ix_contact_submitted', contacts.c.submitted_at),
+        sa.Index('ix_contact_status_submitted', contacts.c.status, contacts.c.submitted_at),
+    ]
+    for index in indexes:
+        index.create(conn, checkfirst=True)
+
+@migration(5, 'Archive tables for admissions and contact messages')
+def _archive_tables(conn):
+    meta = sa.MetaData()
+    pk = lambda: sa.Column('id', sa.String(36), primary_key=True)
+    admissions = sa.Table('admissions_archive', meta, pk(),
+                          sa.Column('student_name', sa.String(100), nullable=False),
+                          sa.Column('class_applying', sa.String(20), nullable=False),
+                          sa.Column('date_of_birth', sa.Date, nullable=False),
+                          sa.Column('gender', sa.String(20), nullable=False),
+                          sa.Column('father_name', sa.String(100), nullable=False),
+                          sa.Column('mother_name', sa.String(100), nullable=False),
+                          sa.Column('phone', sa.String(20), nullable=False),
+                          sa.Column('email', sa.String(120), nullable=False),
+                          sa.Column('address', sa.Text, nullable=False),
+                          sa.Column('previous_school', sa.String(200)),
+                          sa.Column('previous_percentage', sa.Float),
+                          sa.Column('application_status', sa.String(20)),
+                          sa.Column('submitted_at', sa.DateTime),
+                          sa.Column('updated_at', sa.DateTime),
+                          sa.Column('admin_notes', sa.Text),
+                          sa.Column('archived_at', sa.DateTime, nullable=False))
+    contacts = sa.Table('contact_messages_archive', meta, pk(),
+                        sa.Column('name', sa.String(100), nullable=False),
+                        sa.Column('email', sa.String(120), nullable=False),
+                        sa.Column('phone', sa.String(20)),
+                        sa.Column('subject', sa.String(200), nullable=False),
+                        sa.Column('message', sa.Text, nullable=False),
+                        sa.Column('status', sa.String(20)),
+                        sa.Column('submitted_at', sa.DateTime),
+                        sa.Column('replied_at', sa.DateTime),
+                        sa.Column('admin_reply', sa.Text),
+                        sa.Column('archived_at', sa.DateTime, nullable=False))
+    sa.Index('ix_admissions_archive_submitted', admissions.c.submitted_at)
+    sa.Index('ix_admissions_archive_status_submitted', admissions.c.application_status, admissions.c.submitted_at)
+    sa.Index('ix_contact_archive_submitted', contacts.c.submitted_at)
+    sa.Index('ix_contact_archive_status_submitted', contacts.c.status, contacts.c.submitted_at)
+    meta.create_all(conn, checkfirst=True)
+
+@migration(6, 'Maintenance run log')
+def _maintenance_runs(conn):
+    meta = sa.MetaData()
+    runs = sa.Table('maintenance_runs', meta,
+                    sa.Column('id', sa.Integer, primary_key=True),
+                    sa.Column('task', sa.String(50), nullable=False),
+                    sa.Column('started_at', sa.DateTime, nullable=False),
+                    sa.Column('duration_ms', sa.Float),
+                    sa.Column('status', sa.String(20), nullable=False),
+                    sa.Column('detail', sa.Text))
+    sa.Index('ix_maintenance_runs_task_started', runs.c.task, runs.c.started_at)
+    meta.create_all(conn, checkfirst=True)
+
+KEYED_TABLES = ['admins', 'news', 'admissions', 'contact_messages', 'events', 'results', 'toppers',
+                'gallery', 'faculty', 'admissions_archive', 'contact_messages_archive']
+
+@migration(7, 'Store UUID primary keys in 16 bytes')
+def _compact_keys(conn):
+    # Same ids, so URLs and API responses don't change; only the storage does
+    if conn.dialect.name == 'postgresql':
+        for table in KEYED_TABLES:
+            conn.exec_driver_sql(f'ALTER TABLE {table} ALTER COLUMN id TYPE uuid USING id::uuid')
+        return
+    if conn.dialect.name != 'sqlite':
+        raise RuntimeError(f"Key migration is not implemented for {conn.dialect.name}")
+
+    import uuid
+    conn.connection.driver_connection.create_function(
+        'uuid_blob', 1, lambda value: uuid.UUID(value).bytes, deterministic=True)
+    for table in KEYED_TABLES:
+        bad = conn.exec_driver_sql(f'SELECT id FROM {table} WHERE length(id) != 36 LIMIT 1').scalar()
+        if bad is not None:
+            raise RuntimeError(f"{table} has a row with non-UUID id {bad!r}; fix or delete it, then rerun")
+        _rebuild_sqlite_table(conn, table, {r'\bid VARCHAR\(36\) NOT NULL': 'id BLOB NOT NULL'},
+                              {'id': 'uuid_blob(id)'})
+
+def _rebuild_sqlite_table(conn, table, definitions, conversions):
+    """Change column types on SQLite, which has no ALTER COLUMN.
+
+    The table is rebuilt from its own DDL with each ``definitions`` pattern
+    replaced, rows are copied with ``conversions`` (column -> SQL expression)
+    applied, and its indexes are recreated.
+    """
+    import re
+    create_sql = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).scalar()
+    index_sql = conn.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)).scalars().all()
+    # A table renamed by an earlier rebuild has its name quoted in sqlite_master
+    new_sql = re.sub(rf'^CREATE TABLE "?{table}"?', f'CREATE TABLE {table}_rebuild', create_sql, count=1)
+    for pattern, replacement in definitions.items():
+        new_sql, found = re.subn(pattern, replacement, new_sql, count=1)
+        if not found:
+            raise RuntimeError(f"Unexpected definition of {table}: no match for {pattern}")
+    columns = [row[1] for row in conn.exec_driver_sql(f'PRAGMA table_info({table})')]
+    names = ', '.join(f'"{column}"' for column in columns)
+    selected = ', '.join(conversions.get(column, f'"{column}"') for column in columns)
+
+    conn.exec_driver_sql(new_sql)
+    conn.exec_driver_sql(f'INSERT INTO {table}_rebuild ({names}) SELECT {selected} FROM {table}')
+    conn.exec_driver_sql(f'DROP TABLE {table}')
+    conn.exec_driver_sql(f'ALTER TABLE {table}_rebuild RENAME TO {table}')
+    for sql in index_sql:
+        conn.exec_driver_sql(sql)
+
+@migration(8, 'Numeric result pass rates and ranks')
+def _numeric_results(conn):
+    # '98%' -> 98.0 and '2nd' -> 2, so results can be aggregated in SQL
+    if conn.dialect.name == 'postgresql':
+        conn.exec_driver_sql(
+            "ALTER TABLE results ALTER COLUMN pass_rate TYPE double precision "
+            "USING substring(pass_rate from '[0-9]+[.]?[0-9]*')::double precision")
+        for column in ('district_rank', 'state_rank'):
+            conn.exec_driver_sql(f"ALTER TABLE results ALTER COLUMN {column} TYPE integer "
+                                 f"USING substring({column} from '[0-9]+')::integer")
+        return
+    if conn.dialect.name != 'sqlite':
+        raise RuntimeError(f"Results migration is not implemented for {conn.dialect.name}")
+
+    import re
+
+    def leading_number(value):
+        match = re.match(r'\s*(\d+(?:\.\d+)?)', value or '')
+        return float(match.group(1)) if match else None
+
+    conn.connection.driver_connection.create_function('leading_number', 1, leading_number, deterministic=True)
+    bad = conn.exec_driver_sql(
+        'SELECT class_level, year, pass_rate FROM results WHERE leading_number(pass_rate) IS NULL LIMIT 1').first()
+    if bad is not None:
+        raise RuntimeError(f"Class {bad[0]} {bad[1]} has pass rate {bad[2]!r}, which isn't a number; "
+                           "fix it, then rerun")
+    _rebuild_sqlite_table(
+        conn, 'results',
+        {r'\bpass_rate VARCHAR\(10\) NOT NULL': 'pass_rate FLOAT NOT NULL',
+         r'\bdistrict_rank VARCHAR\(20\)': 'district_rank INTEGER',
+         r'\bstate_rank VARCHAR\(20\)': 'state_rank INTEGER'},
+        {'pass_rate': 'leading_number(pass_rate)',
+         'district_rank': 'CAST(leading_number(district_rank) AS INTEGER)',
+         'state_rank': 'CAST(leading_number(state_rank) AS INTEGER)'})
+
+@migration(9, 'Faculty subjects join table')
+def _faculty_subjects(conn):
+    # faculty.subjects held a JSON array or a comma-separated string
+    import json
+    from sqlalchemy.dialects import postgresql
+
+    meta = sa.MetaData()
+    key_type = postgresql.UUID(as_uuid=False) if conn.dialect.name == 'postgresql' else sa.LargeBinary(16)
+    sa.Table('faculty', meta, sa.Column('id', key_type, primary_key=True))
+    subjects = sa.Table('faculty_subjects', meta,
+                        sa.Column('faculty_id', key_type, sa.ForeignKey('faculty.id', ondelete='CASCADE'),
+                                  primary_key=True),
+                        sa.Column('position', sa.Integer, primary_key=True, autoincrement=False),
+                        sa.Column('subject', sa.String(100), nullable=False))
+    sa.Index('ix_faculty_subjects_subject', sa.func.lower(subjects.c.subject), subjects.c.faculty_id)
+    subjects.create(conn)
+    conn.exec_driver_sql('CREATE INDEX ix_faculty_position ON faculty (lower(position))')
+
+    rows = []
+    for faculty_id, value in conn.exec_driver_sql(
+            "SELECT id, subjects FROM faculty WHERE subjects IS NOT NULL AND subjects != ''"):
+        value = value.strip()
+        names = json.loads(value) if value.startswith('[') else value.split(',')
+        seen = set()
+        for name in (str(name).strip() for name in names):
+            if name and name.lower() not in seen:
+                seen.add(name.lower())
+                rows.append({'faculty_id': faculty_id, 'position': len(seen) - 1, 'subject': name})
+    if rows:
+        conn.execute(subjects.insert(), rows)
+    conn.exec_driver_sql('ALTER TABLE faculty DROP COLUMN subjects')
+
+@migration(10, 'Event indexes for windowed, filtered pages')
+def _event_page_indexes(conn):
+    # Keyset pages order by (event_date, id); the composite index replaces ix_events_date
+    meta = sa.MetaData()
+    events = sa.Table('events', meta, sa.Column('id', sa.LargeBinary(16)), sa.Column('event_date', sa.Date),
+                      sa.Column('category', sa.String(50)), sa.Column('is_featured', sa.Boolean))
+    featured = events.c.is_featured == sa.true()
+    indexes = [
+        sa.Index('ix_events_date_id', events.c.event_date, events.c.id),
+        sa.Index('ix_events_category_date_id', events.c.category, events.c.event_date, events.c.id),
+        sa.Index('ix_events_featured_date_id', events.c.event_date, events.c.id,
+                 sqlite_where=featured, postgresql_where=featured),
+    ]
+    for index in indexes:
+        index.create(conn, checkfirst=True)
+    conn.exec_driver_sql('DROP INDEX IF EXISTS ix_events_date')
+
+@migration(11, 'Gallery image metadata and page indexes')
+def _gallery_pages(conn):
+    for column, column_type in (('width', 'INTEGER'), ('height', 'INTEGER'), ('dominant_color', 'VARCHAR(7)')):
+        conn.exec_driver_sql(f'ALTER TABLE gallery ADD COLUMN {column} {column_type}')
+
+    # Keyset pages order by (created_at, id), newest first, optionally per category
+    meta = sa.MetaData()
+    gallery = sa.Table('gallery', meta, sa.Column('id', sa.LargeBinary(16)), sa.Column('created_at', sa.DateTime),
+                       sa.Column('category', sa.String(50)), sa.Column('is_active', sa.Boolean))
+    active = gallery.c.is_active == sa.true()
+    indexes = [
+        sa.Index('ix_gallery_active_created_id', gallery.c.created_at, gallery.c.id,
+                 sqlite_where=active, postgresql_where=active),
+        sa.Index('ix_gallery_active_category_created_id', gallery.c.category, gallery.c.created_at, gallery.c.id,
+                 sqlite_where=active, postgresql_where=active),
+    ]
+    for index in indexes:
+        index.create(conn, checkfirst=True)
+    conn.exec_driver_sql('DROP INDEX IF EXISTS ix_gallery_active_created')
+
+@migration(12, 'News priority rank and page indexes')
+def _news_pages(conn):
+    conn.exec_driver_sql('ALTER TABLE news ADD COLUMN priority_rank INTEGER NOT NULL DEFAULT 0')
+    conn.exec_driver_sql("UPDATE news SET priority_rank = CASE priority WHEN 'urgent' THEN 2 WHEN 'high' THEN 1 ELSE 0 END")
+
+    # Keyset pages order by (created_at, id) or (priority_rank, created_at, id), newest first
+    meta = sa.MetaData()
+    news = sa.Table('news', meta, sa.Column('id', sa.LargeBinary(16)), sa.Column('created_at', sa.DateTime),
+                    sa.Column('priority_rank', sa.Integer), sa.Column('is_active', sa.Boolean))
+    active = news.c.is_active == sa.true()
+    indexes = [
+        sa.Index('ix_news_active_created_id', news.c.created_at, news.c.id,
+                 sqlite_where=active, postgresql_where=active),
+        sa.Index('ix_news_active_priority_created_id', news.c.priority_rank, news.c.created_at, news.c.id,
+                 sqlite_where=active, postgresql_where=active),
+    ]
+    for index in indexes:
+        index.create(conn, checkfirst=True)
+    conn.exec_driver_sql('DROP INDEX IF EXISTS ix_news_active_created')
+
+def _fingerprint_v13(student_name, date_of_birth, phone):
+    # utils.admission_fingerprint as of migration 13; a change there needs a migration re-fingerprinting rows
+    name = ' '.join(unicodedata.normalize('NFKC', student_name).casefold().split())
+    digits = re.sub(r'\D', '', phone)[-10:]
+    return hashlib.blake2b('\x1f'.join((name, date_of_birth[:10], digits)).encode('utf-8'), digest_size=16).digest()
+
+@migration(13, 'Idempotency keys and admission fingerprints')
+def _duplicate_submissions(conn):
+    meta = sa.MetaData()
+    keys = sa.Table('idempotency_keys', meta,
+                    sa.Column('key', sa.LargeBinary(16), primary_key=True),
+                    sa.Column('request_hash', sa.LargeBinary(16), nullable=False),
+                    sa.Column('status_code', sa.Integer, nullable=False),
+                    sa.Column('response', sa.Text, nullable=False),
+                    sa.Column('expires_at', sa.DateTime, nullable=False))
+    sa.Index('ix_idempotency_keys_expires', keys.c.expires_at)
+    keys.create(conn)
+
+    binary = sa.LargeBinary(16).compile(dialect=conn.dialect)
+    for table in ('admissions', 'admissions_archive'):
+        conn.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN fingerprint {binary}')
+
+    # The oldest of any duplicates already submitted keeps the fingerprint
+    admissions = sa.table('admissions', sa.column('id'), sa.column('fingerprint'))
+    seen, updates = set(), []
+    for id, student_name, date_of_birth, phone in conn.exec_driver_sql(
+            'SELECT id, student_name, date_of_birth, phone FROM admissions ORDER BY submitted_at, id'):
+        fingerprint = _fingerprint_v13(student_name, str(date_of_birth), phone)
+        if fingerprint not in seen:
+            seen.add(fingerprint)
+            updates.append({'row_id': id, 'value': fingerprint})
+    if updates:
+        conn.execute(admissions.update().where(admissions.c.id == sa.bindparam('row_id'))
+                     .values(fingerprint=sa.bindparam('value')), updates)
+    conn.exec_driver_sql('CREATE UNIQUE INDEX uq_admissions_fingerprint ON admissions (fingerprint)')
+
+@migration(14, 'Admission counts for analytics')
+def _admission_counts(conn):
+    meta = sa.MetaData()
+    counts = sa.Table('admission_counts', meta,
+                      sa.Column('day', sa.Date, primary_key=True),
+                      sa.Column('class_applying', sa.String(20), primary_key=True),
+                      sa.Column('application_status', sa.String(20), primary_key=True),
+                      sa.Column('gender', sa.String(20), primary_key=True),
+                      sa.Column('applications', sa.Integer, nullable=False))
+    counts.create(conn)
+
+    day = 'date(submitted_at)' if conn.dialect.name == 'sqlite' else 'CAST(submitted_at AS DATE)'
+    conn.exec_driver_sql(f'''
+        INSERT INTO admission_counts (day, class_applying, application_status, gender, applications)
+        SELECT {day}, class_applying, application_status, gender, COUNT(*)
+        FROM (SELECT submitted_at, class_applying, application_status, gender FROM admissions
+              UNION ALL
+              SELECT submitted_at, class_applying, application_status, gender FROM admissions_archive) AS rows
+        GROUP BY 1, 2, 3, 4
+    ''')
+
+@migration(15, 'Applicant search index')
+def _admission_search(conn):
+    # Not frozen: the index must be built the way search.py reads it (see the module docstring)
+    from search import document
+
+    if conn.dialect.name == 'sqlite':
+        conn.exec_driver_sql("CREATE VIRTUAL TABLE admission_search "
+                             "USING fts5(admission_id UNINDEXED, document, tokenize='trigram')")
+    elif conn.dialect.name == 'postgresql':
+        # pg_trgm ships with PostgreSQL; creating it needs a role allowed to create extensions
+        conn.exec_driver_sql('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        conn.exec_driver_sql('CREATE TABLE admission_search (admission_id uuid PRIMARY KEY, document text NOT NULL)')
+        conn.exec_driver_sql('CREATE INDEX ix_admission_search_document ON admission_search '
+                             'USING gin (document gin_trgm_ops)')
+    else:
+        raise RuntimeError(f"Applicant search is not implemented for {conn.dialect.name}")
+
+    # Oldest first: on SQLite the FTS rowid order is what "newest first" means
+    search = sa.table('admission_search', sa.column('admission_id'), sa.column('document'))
+    columns = 'id, student_name, father_name, mother_name, phone, email, submitted_at'
+    result = conn.exec_driver_sql(f'SELECT {columns} FROM admissions UNION ALL '
+                                  f'SELECT {columns} FROM admissions_archive ORDER BY 7')
+    while True:
+        rows = result.fetchmany(5000)
+        if not rows:
+            break
+        conn.execute(search.insert(), [{'admission_id': row[0], 'document': document(*row[1:6])} for row in rows])
+
+@migration(16, 'Contact message counts')
+def _message_counts(conn):
+    counts = sa.Table('message_counts', sa.MetaData(),
+                      sa.Column('status', sa.String(20), primary_key=True),
+                      sa.Column('messages', sa.Integer, nullable=False))
+    counts.create(conn)
+
+    conn.exec_driver_sql('''
+        INSERT INTO message_counts (status, messages)
+        SELECT status, COUNT(*)
+        FROM (SELECT status FROM contact_messages
+              UNION ALL
+              SELECT status FROM contact_messages_archive) AS rows
+        WHERE status IS NOT NULL
+        GROUP BY status
+    ''')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage database schema migrations')
+    parser.add_argument('command', choices=['upgrade', 'status', 'history'], nargs='?', default='upgrade')
+    parser.add_argument('--target', type=int, help='upgrade only up to this version')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from extensions import db
+
+    app = create_app({'SCHEMA_CHECK': False})
+    with app.app_context():
+        if args.command == 'upgrade':
+            applied = upgrade(db.engine, target=args.target)
+            with db.engine.connect() as conn:
+                version = current_version(conn)
+            print(f"✅ Database at version {version} ({applied} migration(s) applied)")
+        elif args.command == 'status':
+            with db.engine.connect() as conn:
+                version = current_version(conn)
+            print(f"Current version: {version}")
+            print(f"Latest version:  {latest_version()}")
+            pending = [v for v, _, _ in MIGRATIONS if v > version]
+            print(f"Pending: {', '.join(map(str, pending)) if pending else 'none'}")
+        else:
+            with db.engine.connect() as conn:
+                version = current_version(conn)
+            for v, description, _ in MIGRATIONS:
+                print(f"{'✓' if v <= version else ' '} {v:>3}  {description}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,273 @@
+from datetime import datetime
+
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.ext.orderinglist import ordering_list
+from sqlalchemy.orm import validates
+
+from extensions import db, bcrypt
+from ids import UUIDKey, new_id
+
+def _archive_table(model):
+    """Table with ``model``'s columns plus ``archived_at``, filled by archive.py"""
+    columns = [db.Column(column.name, column.type, primary_key=column.primary_key, nullable=column.nullable)
+               for column in model.__table__.columns]
+    return db.Table(f'{model.__tablename__}_archive', *columns,
+                    db.Column('archived_at', db.DateTime, nullable=False))
+
+def _active_only(model):
+    """Partial-index condition, rendered by both SQLite and PostgreSQL"""
+    condition = model.is_active == db.true()
+    return {'sqlite_where': condition, 'postgresql_where': condition}
+
+# Database Models
+class Admin(db.Model):
+    __tablename__ = 'admins'
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(128), nullable=False)
+    full_name = db.Column(db.String(100), nullable=False)
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_login = db.Column(db.DateTime)
+    
+    def set_password(self, password):
+        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+    
+    def check_password(self, password):
+        return bcrypt.check_password_hash(self.password_hash, password)
+
+# News priorities, lowest first, and the number each is sorted by
+PRIORITY_RANKS = {'normal': 0, 'high': 1, 'urgent': 2}
+
+def _priority_rank(context):
+    """Column default: rank of the priority being inserted (Core inserts and upserts)"""
+    return PRIORITY_RANKS.get(context.get_current_parameters().get('priority'), 0)
+
+class News(db.Model):
+    __tablename__ = 'news'
+    __table_args__ = (db.Index('uq_news_title', 'title', unique=True),)
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    emoji = db.Column(db.String(10), default='📢')
+    priority = db.Column(db.String(20), default='normal')  # normal, high, urgent
+    # PRIORITY_RANKS[priority], stored so priority-first pages can be read from an index
+    priority_rank = db.Column(db.Integer, nullable=False, default=_priority_rank, server_default='0')
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @validates('priority')
+    def _set_priority_rank(self, key, priority):
+        self.priority_rank = PRIORITY_RANKS.get(priority, 0)
+        return priority
+
+db.Index('ix_news_active_created_id', News.created_at, News.id, **_active_only(News))
+db.Index('ix_news_active_priority_created_id', News.priority_rank, News.created_at, News.id, **_active_only(News))
+
+class Admission(db.Model):
+    __tablename__ = 'admissions'
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    student_name = db.Column(db.String(100), nullable=False)
+    class_applying = db.Column(db.String(20), nullable=False)
+    date_of_birth = db.Column(db.Date, nullable=False)
+    gender = db.Column(db.String(20), nullable=False)
+    father_name = db.Column(db.String(100), nullable=False)
+    mother_name = db.Column(db.String(100), nullable=False)
+    phone = db.Column(db.String(20), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    address = db.Column(db.Text, nullable=False)
+    previous_school = db.Column(db.String(200))
+    previous_percentage = db.Column(db.Float)
+    application_status = db.Column(db.String(20), default='pending')  # pending, approved, rejected, waitlisted
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    admin_notes = db.Column(db.Text)
+    # utils.admission_fingerprint(student name, date of birth, phone), unique so resubmissions are refused
+    fingerprint = db.Column(db.LargeBinary(16))
+
+db.Index('ix_admissions_submitted', Admission.submitted_at)
+db.Index('uq_admissions_fingerprint', Admission.fingerprint, unique=True)
+db.Index('ix_admissions_status_submitted', Admission.application_status, Admission.submitted_at)
+
+admissions_archive = _archive_table(Admission)
+db.Index('ix_admissions_archive_submitted', admissions_archive.c.submitted_at)
+db.Index('ix_admissions_archive_status_submitted', admissions_archive.c.application_status,
+         admissions_archive.c.submitted_at)
+
+class AdmissionCount(db.Model):
+    """Applications per submission day and group, kept current by analytics.py"""
+    __tablename__ = 'admission_counts'
+    
+    day = db.Column(db.Date, primary_key=True)
+    class_applying = db.Column(db.String(20), primary_key=True)
+    application_status = db.Column(db.String(20), primary_key=True)
+    gender = db.Column(db.String(20), primary_key=True)
+    applications = db.Column(db.Integer, nullable=False, default=0)
+
+# Applicant search (search.py): an FTS5 trigram table on SQLite, a pg_trgm GIN index on PostgreSQL.
+# Rows stay when an application is archived.
+admission_search = db.Table('admission_search',
+                            db.Column('admission_id', UUIDKey, primary_key=True),
+                            db.Column('document', db.Text, nullable=False))
+
+class ContactMessage(db.Model):
+    __tablename__ = 'contact_messages'
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    phone = db.Column(db.String(20))
+    subject = db.Column(db.String(200), nullable=False)
+    message = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), default='unread')  # unread, read, replied
+    submitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+    replied_at = db.Column(db.DateTime)
+    admin_reply = db.Column(db.Text)
+
+db.Index('ix_contact_submitted', ContactMessage.submitted_at)
+db.Index('ix_contact_status_submitted', ContactMessage.status, ContactMessage.submitted_at)
+
+contact_messages_archive = _archive_table(ContactMessage)
+db.Index('ix_contact_archive_submitted', contact_messages_archive.c.submitted_at)
+db.Index('ix_contact_archive_status_submitted', contact_messages_archive.c.status,
+         contact_messages_archive.c.submitted_at)
+
+class MessageCount(db.Model):
+    """Contact messages per status, kept current by inbox.py"""
+    __tablename__ = 'message_counts'
+    
+    status = db.Column(db.String(20), primary_key=True)
+    messages = db.Column(db.Integer, nullable=False, default=0)
+
+class Event(db.Model):
+    __tablename__ = 'events'
+    __table_args__ = (db.Index('uq_events_title_date', 'title', 'event_date', unique=True),)
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    event_date = db.Column(db.Date, nullable=False)
+    event_time = db.Column(db.String(20))
+    location = db.Column(db.String(200), nullable=False)
+    category = db.Column(db.String(50), default='general')  # academic, sports, cultural, general
+    is_featured = db.Column(db.Boolean, default=False)
+    image_url = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+db.Index('ix_events_date_id', Event.event_date, Event.id)
+db.Index('ix_events_category_date_id', Event.category, Event.event_date, Event.id)
+db.Index('ix_events_featured_date_id', Event.event_date, Event.id,
+         sqlite_where=Event.is_featured == db.true(), postgresql_where=Event.is_featured == db.true())
+
+class Result(db.Model):
+    __tablename__ = 'results'
+    __table_args__ = (db.Index('uq_results_class_year', 'class_level', 'year', unique=True),)
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    class_level = db.Column(db.String(10), nullable=False)  # 10, 12
+    year = db.Column(db.Integer, nullable=False)
+    pass_rate = db.Column(db.Float, nullable=False)  # percent, e.g. 98.0
+    above_90 = db.Column(db.Integer, default=0)
+    above_95 = db.Column(db.Integer, default=0)
+    district_rank = db.Column(db.Integer)  # 2 for '2nd'
+    state_rank = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class Topper(db.Model):
+    __tablename__ = 'toppers'
+    __table_args__ = (db.Index('uq_toppers_name_class_year', 'name', 'class_level', 'year', unique=True),)
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    name = db.Column(db.String(100), nullable=False)
+    class_level = db.Column(db.String(10), nullable=False)
+    year = db.Column(db.Integer, nullable=False)
+    percentage = db.Column(db.Float, nullable=False)
+    stream = db.Column(db.String(50), nullable=False)  # Science, Commerce, Arts
+    achievement = db.Column(db.String(200))  # District Topper, State Topper, etc.
+    photo_url = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+db.Index('ix_toppers_year', Topper.year)
+
+class Gallery(db.Model):
+    __tablename__ = 'gallery'
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    image_url = db.Column(db.String(500), nullable=False)
+    category = db.Column(db.String(50), default='general')  # events, facilities, sports, academic
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Read at upload (images.py) so pages can reserve space before loading
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    dominant_color = db.Column(db.String(7))  # '#rrggbb'
+
+db.Index('ix_gallery_active_created_id', Gallery.created_at, Gallery.id, **_active_only(Gallery))
+db.Index('ix_gallery_active_category_created_id', Gallery.category, Gallery.created_at, Gallery.id,
+         **_active_only(Gallery))
+
+class Faculty(db.Model):
+    __tablename__ = 'faculty'
+    __table_args__ = (db.Index('uq_faculty_name', 'name', unique=True),)
+    
+    id = db.Column(UUIDKey, primary_key=True, default=new_id)
+    name = db.Column(db.String(100), nullable=False)
+    position = db.Column(db.String(100), nullable=False)
+    qualifications = db.Column(db.String(200), nullable=False)
+    experience = db.Column(db.String(100))
+    description = db.Column(db.Text)
+    photo_url = db.Column(db.String(500))
+    position_order = db.Column(db.Integer, default=0)
+    is_active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Loaded with one extra query per list of faculty, not one per member
+    subject_rows = db.relationship('FacultySubject', order_by='FacultySubject.position', lazy='selectin',
+                                   collection_class=ordering_list('position'), cascade='all, delete-orphan')
+    # List of subject names, in the order they were given
+    subjects = association_proxy('subject_rows', 'subject', creator=lambda subject: FacultySubject(subject=subject))
+
+db.Index('ix_faculty_active_order', Faculty.position_order, **_active_only(Faculty))
+db.Index('ix_faculty_position', db.func.lower(Faculty.position))
+
+class FacultySubject(db.Model):
+    __tablename__ = 'faculty_subjects'
+    
+    faculty_id = db.Column(UUIDKey, db.ForeignKey('faculty.id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    subject = db.Column(db.String(100), nullable=False)
+
+# "Who teaches Physics" is answered from this index alone
+db.Index('ix_faculty_subjects_subject', db.func.lower(FacultySubject.subject), FacultySubject.faculty_id)
+
+class IdempotencyKey(db.Model):
+    __tablename__ = 'idempotency_keys'
+    
+    # Digests rather than the client's strings keep each row small (idempotency.py)
+    key = db.Column(db.LargeBinary(16), primary_key=True)
+    request_hash = db.Column(db.LargeBinary(16), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    response = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+db.Index('ix_idempotency_keys_expires', IdempotencyKey.expires_at)
+
+class MaintenanceRun(db.Model):
+    __tablename__ = 'maintenance_runs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(50), nullable=False)
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    duration_ms = db.Column(db.Float)
+    status = db.Column(db.String(20), nullable=False)  # ok, skipped, error
+    detail = db.Column(db.Text)
+
+db.Index('ix_maintenance_runs_task_started', MaintenanceRun.task, MaintenanceRun.started_at)
@@ -0,0 +1,107 @@
+"""
+SQL query instrumentation for the Shri Shyam Public School API
+
+Counts the queries issued while handling each request and how long they
+took, logs slow queries together with their query plan, flags statements
+that repeat within one request (the usual sign of an N+1 loop) and reports
+the totals in a ``Server-Timing`` response header.
+"""
+
+import time
+
+from flask import current_app, g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class QueryStats:
+    """Flask extension attributing SQL queries to the current request"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SQL_SLOW_QUERY_MS', 100.0)
+        app.config.setdefault('SQL_REPEAT_THRESHOLD', 5)
+        app.config.setdefault('SQL_EXPLAIN_SLOW_QUERIES', True)
+
+        # Listening on the Engine class covers every engine of every app; the handlers
+        # only act inside a request, and read the settings of that request's app
+        if not event.contains(Engine, 'before_cursor_execute', self._before_cursor_execute):
+            event.listen(Engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.extensions['query_stats'] = self
+
+    # Request hooks
+
+    def _before_request(self):
+        g._sql_count = 0
+        g._sql_time = 0.0
+        g._sql_statements = {}
+
+    def _after_request(self, response):
+        count = g.pop('_sql_count', None)
+        if count is None:
+            return response
+        elapsed_ms = g.pop('_sql_time') * 1000
+        statements = g.pop('_sql_statements')
+
+        threshold = current_app.config['SQL_REPEAT_THRESHOLD']
+        for statement, repeats in statements.items():
+            if repeats >= threshold:
+                current_app.logger.warning(
+                    'Possible N+1: statement ran %d times in one request: %s',
+                    repeats, ' '.join(statement.split())
+                )
+
+        timing = f'db;desc="{count} queries";dur={elapsed_ms:.2f}'
+        existing = response.headers.get('Server-Timing')
+        response.headers['Server-Timing'] = f'{existing}, {timing}' if existing else timing
+        return response
+
+    # Engine hooks
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('_query_start')
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        if not has_request_context() or '_sql_count' not in g:
+            return
+
+        g._sql_count += 1
+        g._sql_time += elapsed
+        g._sql_statements[statement] = g._sql_statements.get(statement, 0) + 1
+
+        elapsed_ms = elapsed * 1000
+        if elapsed_ms >= current_app.config['SQL_SLOW_QUERY_MS']:
+            plan = None
+            if current_app.config['SQL_EXPLAIN_SLOW_QUERIES'] and not executemany:
+                plan = self._explain(conn, statement, parameters)
+            current_app.logger.warning(
+                'Slow query (%.1f ms): %s%s', elapsed_ms, ' '.join(statement.split()),
+                f'\nQuery plan:\n{plan}' if plan else ''
+            )
+
+    def _explain(self, conn, statement, parameters):
+        """Return the query plan of a SELECT, or None when it can't be explained"""
+        if not statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return None
+        prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+        try:
+            # Use a raw DBAPI cursor so the EXPLAIN itself isn't instrumented
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters or ())
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+        except Exception:
+            return None
+        return '\n'.join('  ' + ' | '.join(str(col) for col in row) for row in rows)
@@ -0,0 +1,117 @@
+"""
+Rate limiting for the Shri Shyam Public School API
+
+Token buckets, one per client IP and route, live in a memory-mapped table
+shared by every gunicorn worker, so a client gets the same allowance
+whichever worker answers. A check is one hash, a byte-range lock and a few
+float operations; no database or cache server is involved.
+
+Limits are written as ``"<count>/<period>"``, e.g. ``"5/minute"``: a bucket
+holds up to ``count`` requests and refills at ``count`` per ``period``.
+"""
+
+import hashlib
+import math
+import os
+import struct
+import tempfile
+import time
+from functools import wraps
+
+from flask import current_app, jsonify, request
+
+from shared_state import locked, open_mapped
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+def default_rate_limit_dir():
+    return os.environ.get('RATE_LIMIT_DIR', os.path.join(tempfile.gettempdir(), 'ssps-ratelimit'))
+
+def parse_limit(limit):
+    """'5/minute' -> (capacity 5, refill rate per second)"""
+    count, _, period = limit.partition('/')
+    period = period.strip().rstrip('s')
+    if period not in PERIODS:
+        raise ValueError(f"Invalid rate limit '{limit}', expected e.g. '5/minute'")
+    count = int(count)
+    return count, count / PERIODS[period]
+
+class BucketTable:
+    """Fixed-size hash table of token buckets in a shared memory-mapped file.
+
+    Each slot stores a key digest, the token count and the last refill time.
+    A key that lands on a slot owned by another key takes it over with a
+    full bucket, so a collision can only make the limiter more lenient.
+    """
+
+    SLOT = struct.Struct('<16sdd')
+
+    def __init__(self, path, slots=65536):
+        self.slots = slots
+        self.fd, self.map = open_mapped(path, slots * self.SLOT.size)
+
+    def take(self, key, capacity, rate, now=None):
+        """Take one token; return 0 if allowed, else seconds until one is available"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        offset = int.from_bytes(digest[:8], 'little') % self.slots * self.SLOT.size
+        with locked(self.fd, self.SLOT.size, offset):
+            now = time.time() if now is None else now
+            owner, tokens, updated = self.SLOT.unpack_from(self.map, offset)
+            if owner != digest:
+                tokens = capacity
+            else:
+                tokens = min(capacity, tokens + (now - updated) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / rate
+            self.SLOT.pack_into(self.map, offset, digest, tokens, now)
+        return retry_after
+
+class RateLimiter:
+    """Flask extension providing the ``limit`` decorator"""
+
+    def __init__(self, app=None):
+        self.table = None
+        self._limits = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATE_LIMIT_ENABLED', True)
+        app.config.setdefault('RATE_LIMIT_DIR', default_rate_limit_dir())
+        app.config.setdefault('RATE_LIMIT_SLOTS', 65536)
+        app.extensions['rate_limiter'] = self
+
+        if not app.config['RATE_LIMIT_ENABLED']:
+            self.table = None
+            return
+        os.makedirs(app.config['RATE_LIMIT_DIR'], exist_ok=True)
+        self.table = BucketTable(os.path.join(app.config['RATE_LIMIT_DIR'], 'buckets'),
+                                 app.config['RATE_LIMIT_SLOTS'])
+        self._limits = {}
+
+    def _limit_for(self, config_key):
+        limit = self._limits.get(config_key)
+        if limit is None:
+            limit = self._limits[config_key] = parse_limit(current_app.config[config_key])
+        return limit
+
+    def limit(self, config_key):
+        """Limit a view per client IP to the rate named by ``config_key`` in the app config"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if self.table is None:
+                    return view(*args, **kwargs)
+                capacity, rate = self._limit_for(config_key)
+                retry_after = self.table.take(f'{request.endpoint}|{request.remote_addr}', capacity, rate)
+                if retry_after:
+                    response = jsonify({'error': 'Too many requests, please try again later'})
+                    response.status_code = 429
+                    response.headers['Retry-After'] = str(math.ceil(retry_after))
+                    return response
+                return view(*args, **kwargs)
+            return wrapper
+        return decorator
@@ -0,0 +1,12 @@
+"""
+API blueprints: public pages, admin content management and authentication
+"""
+
+def register_blueprints(app):
+    from routes.public import public_bp
+    from routes.admin import admin_bp
+    from routes.auth import auth_bp
+
+    app.register_blueprint(public_bp)
+    app.register_blueprint(admin_bp)
+    app.register_blueprint(auth_bp)
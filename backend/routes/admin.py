@@ -0,0 +1,664 @@
+import csv
+import io
+import os
+import threading
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+
+import backup
+from analytics import breakdowns, count_admission
+from archive import page_with_archived, with_archived
+from database import use_read_engine
+from extensions import db, response_cache
+from images import InvalidImage, image_metadata
+from inbox import MAX_BATCH, STATUSES as MESSAGE_STATUSES, triage, unread_count
+from search import search
+from models import PRIORITY_RANKS, News, Admission, ContactMessage, Event, Result, Gallery, Faculty
+from utils import (admin_required, validate_required_fields, sanitize_input, parse_number,
+                   parse_subjects, format_percentage, ordinal)
+
+admin_bp = Blueprint('admin', __name__)
+
+def include_archived():
+    """``include_archived=1`` query flag: also read rows moved by archive.py"""
+    return request.args.get('include_archived', '').lower() in ('1', 'true', 'yes')
+
+# News Routes
+@admin_bp.route('/api/news', methods=['POST'])
+@admin_required
+def create_news():
+    """Create new news item (Admin only)"""
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['title', 'content']
+        is_valid, error_message = validate_required_fields(data, required_fields)
+        if not is_valid:
+            return jsonify({'error': error_message}), 400
+        
+        priority = data.get('priority', 'normal')
+        if priority not in PRIORITY_RANKS:
+            return jsonify({'error': f"priority must be one of {', '.join(PRIORITY_RANKS)}"}), 400
+        
+        news = News(
+            title=sanitize_input(data['title']),
+            content=sanitize_input(data['content']),
+            emoji=data.get('emoji', '📢'),
+            priority=priority
+        )
+        
+        db.session.add(news)
+        db.session.commit()
+        response_cache.invalidate()
+        
+        return jsonify({
+            'id': news.id,
+            'title': news.title,
+            'content': news.content,
+            'emoji': news.emoji,
+            'priority': news.priority,
+            'created_at': news.created_at.isoformat()
+        }), 201
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A news item with this title already exists'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Admission Routes
+@admin_bp.route('/api/admissions', methods=['GET'])
+@admin_required
+def get_admissions():
+    """Get all admission applications (Admin only)"""
+    try:
+        status = request.args.get('status', 'all')
+        page = int(request.args.get('page', 1))
+        limit = int(request.args.get('limit', 20))
+        
+        filters = {} if status == 'all' else {'application_status': status}
+        
+        if include_archived():
+            admissions, total = page_with_archived(db.session, Admission, 'submitted_at',
+                                                   (page - 1) * limit, limit, **filters)
+        else:
+            query = Admission.query.filter_by(**filters)
+            total = query.count()
+            admissions = query.order_by(Admission.submitted_at.desc()).offset((page - 1) * limit).limit(limit).all()
+        
+        return jsonify({
+            'admissions': [{
+                'id': admission.id,
+                'student_name': admission.student_name,
+                'class_applying': admission.class_applying,
+                'date_of_birth': admission.date_of_birth.isoformat(),
+                'gender': admission.gender,
+                'father_name': admission.father_name,
+                'mother_name': admission.mother_name,
+                'phone': admission.phone,
+                'email': admission.email,
+                'address': admission.address,
+                'previous_school': admission.previous_school,
+                'previous_percentage': admission.previous_percentage,
+                'application_status': admission.application_status,
+                'submitted_at': admission.submitted_at.isoformat(),
+                'admin_notes': admission.admin_notes,
+                'archived': getattr(admission, 'archived', False)
+            } for admission in admissions],
+            'total': total,
+            'page': page,
+            'limit': limit,
+            'total_pages': (total + limit - 1) // limit
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+EXPORT_COLUMNS = [
+    'id', 'student_name', 'class_applying', 'date_of_birth', 'gender', 'father_name', 'mother_name',
+    'phone', 'email', 'address', 'previous_school', 'previous_percentage', 'application_status',
+    'submitted_at', 'updated_at', 'admin_notes',
+]
+
+@admin_bp.route('/api/admissions/export', methods=['GET'])
+@admin_required
+def export_admissions():
+    """Stream all admission applications as CSV (Admin only)"""
+    status = request.args.get('status', 'all')
+    filters = {} if status == 'all' else {'application_status': status}
+    if include_archived():
+        rows = with_archived(Admission, **filters)
+        query = select(*[rows.c[name] for name in EXPORT_COLUMNS]).order_by(rows.c.submitted_at)
+    else:
+        query = select(*[getattr(Admission, name) for name in EXPORT_COLUMNS]).order_by(Admission.submitted_at)
+        query = query.filter_by(**filters)
+    use_read_engine()
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        # yield_per streams rows: a server-side cursor on PostgreSQL, a plain cursor on SQLite
+        result = db.session.execute(query, execution_options={'yield_per': 1000})
+        for rows in result.partitions():
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    return Response(stream_with_context(generate()), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=admissions.csv'})
+
+@admin_bp.route('/api/admissions/search', methods=['GET'])
+@admin_required
+def search_admissions():
+    """Find applications by student, father or mother name, phone or email, archived years included (Admin only).
+
+    Tolerates a typo per word and Hindi names spelt in either script; see search.py.
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'q is required'}), 400
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+        except ValueError:
+            return jsonify({'error': 'Invalid limit'}), 400
+        use_read_engine()
+        
+        ids = search(db.session, query, limit)
+        rows = with_archived(Admission)
+        found = {row.id: row for row in db.session.execute(select(rows).where(rows.c.id.in_(ids)))} if ids else {}
+        
+        return jsonify({
+            'admissions': [{
+                'id': row.id,
+                'student_name': row.student_name,
+                'class_applying': row.class_applying,
+                'date_of_birth': row.date_of_birth.isoformat(),
+                'father_name': row.father_name,
+                'mother_name': row.mother_name,
+                'phone': row.phone,
+                'email': row.email,
+                'application_status': row.application_status,
+                'submitted_at': row.submitted_at.isoformat(),
+                'archived': row.archived
+            } for row in (found[admission_id] for admission_id in ids if admission_id in found)]
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/api/admissions/<admission_id>/status', methods=['PUT'])
+@admin_required
+def update_admission_status(admission_id):
+    """Update admission application status (Admin only)"""
+    try:
+        data = request.get_json()
+        new_status = data.get('status')
+        
+        if new_status not in ['pending', 'approved', 'rejected', 'waitlisted']:
+            return jsonify({'error': 'Invalid status'}), 400
+        
+        values = {'application_status': new_status, 'updated_at': datetime.utcnow()}
+        if 'notes' in data:
+            values['admin_notes'] = data['notes']
+        
+        # The old status is needed to move the application between admission_counts groups
+        current = db.session.execute(
+            select(Admission.application_status, Admission.class_applying, Admission.gender, Admission.submitted_at)
+            .where(Admission.id == admission_id)
+        ).first()
+        if current is None:
+            return jsonify({'error': 'Admission not found'}), 404
+        
+        # Only applies if nobody changed the status since it was read, so the counts can't drift
+        updated = db.session.execute(
+            update(Admission).where(Admission.id == admission_id,
+                                    Admission.application_status == current.application_status)
+            .values(**values).returning(Admission.id),
+            execution_options={'synchronize_session': False}
+        ).first()
+        if updated is None:
+            db.session.rollback()
+            return jsonify({'error': 'The application was just updated by someone else, please retry'}), 409
+        if new_status != current.application_status:
+            day = current.submitted_at.date()
+            count_admission(db.session, day, current.class_applying, current.application_status, current.gender, -1)
+            count_admission(db.session, day, current.class_applying, new_status, current.gender)
+        db.session.commit()
+        
+        return jsonify({'message': 'Status updated successfully'})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/api/admissions/analytics', methods=['GET'])
+@admin_required
+def get_admission_analytics():
+    """Applications by class, status, gender and submission day, archived years included (Admin only).
+
+    ``from``/``to`` limit the submission days (inclusive). Read from
+    admission_counts, so the cost follows the number of groups, not
+    applications.
+    """
+    try:
+        try:
+            start, end = (datetime.strptime(request.args[name], '%Y-%m-%d').date() if request.args.get(name) else None
+                          for name in ('from', 'to'))
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        use_read_engine()
+        return jsonify(breakdowns(db.session, start, end))
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Contact Routes
+def message_json(message):
+    return {
+        'id': message.id,
+        'name': message.name,
+        'email': message.email,
+        'phone': message.phone,
+        'subject': message.subject,
+        'message': message.message,
+        'status': message.status,
+        'submitted_at': message.submitted_at.isoformat(),
+        'replied_at': message.replied_at.isoformat() if message.replied_at else None,
+        'admin_reply': message.admin_reply,
+        'archived': getattr(message, 'archived', False)
+    }
+
+@admin_bp.route('/api/contact', methods=['GET'])
+@admin_required
+def get_contact_messages():
+    """Get all contact messages (Admin only)"""
+    try:
+        status = request.args.get('status', 'all')
+        page = int(request.args.get('page', 1))
+        limit = int(request.args.get('limit', 20))
+        
+        filters = {} if status == 'all' else {'status': status}
+        
+        if include_archived():
+            messages, total = page_with_archived(db.session, ContactMessage, 'submitted_at',
+                                                 (page - 1) * limit, limit, **filters)
+        else:
+            query = ContactMessage.query.filter_by(**filters)
+            total = query.count()
+            messages = query.order_by(ContactMessage.submitted_at.desc()).offset((page - 1) * limit).limit(limit).all()
+        
+        return jsonify({
+            'messages': [message_json(message) for message in messages],
+            'total': total,
+            'page': page,
+            'limit': limit,
+            'total_pages': (total + limit - 1) // limit
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/api/contact', methods=['PATCH'])
+@admin_required
+def triage_contact_messages():
+    """Set the status of, or reply to, many contact messages at once (Admin only).
+
+    Body: ``ids`` plus ``status`` (unread, read, replied) or ``reply``, which
+    also marks them replied. All change in one transaction; the response
+    holds the changed messages, the ids that were already in that status or
+    don't exist, and the new unread count, so a list can be patched in place.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        ids = data.get('ids')
+        if not isinstance(ids, list) or not 0 < len(ids) <= MAX_BATCH:
+            return jsonify({'error': f'ids must be a list of 1 to {MAX_BATCH} message ids'}), 400
+        try:
+            # Canonical form, as the ids are returned
+            ids = list(dict.fromkeys(str(uuid.UUID(message_id)) for message_id in ids))
+        except (TypeError, ValueError, AttributeError):
+            return jsonify({'error': 'Invalid message id'}), 400
+        
+        reply = data.get('reply')
+        status = data.get('status', 'replied' if reply is not None else None)
+        if reply is not None:
+            reply = sanitize_input(reply) if isinstance(reply, str) else ''
+            if not reply:
+                return jsonify({'error': 'reply must be non-empty text'}), 400
+            if status != 'replied':
+                return jsonify({'error': 'A reply always sets the status to replied'}), 400
+        elif status not in MESSAGE_STATUSES:
+            return jsonify({'error': f"status must be one of {', '.join(MESSAGE_STATUSES)}"}), 400
+        
+        updated, unchanged, missing = triage(db.session, ids, status, reply)
+        db.session.commit()
+        
+        return jsonify({
+            'messages': [message_json(message) for message in updated],
+            'unchanged': unchanged,
+            'not_found': missing,
+            'unread': unread_count(db.session)
+        })
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Event Routes
+@admin_bp.route('/api/events', methods=['POST'])
+@admin_required
+def create_event():
+    """Create new event (Admin only)"""
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['title', 'description', 'event_date', 'location']
+        is_valid, error_message = validate_required_fields(data, required_fields)
+        if not is_valid:
+            return jsonify({'error': error_message}), 400
+        
+        # Parse event date
+        try:
+            event_date = datetime.strptime(data['event_date'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        event = Event(
+            title=sanitize_input(data['title']),
+            description=sanitize_input(data['description']),
+            event_date=event_date,
+            event_time=data.get('event_time', ''),
+            location=sanitize_input(data['location']),
+            category=sanitize_input(data.get('category', 'general')),
+            is_featured=data.get('is_featured', False),
+            image_url=data.get('image_url', '')
+        )
+        
+        db.session.add(event)
+        db.session.commit()
+        response_cache.invalidate()
+        
+        return jsonify({
+            'id': event.id,
+            'title': event.title,
+            'description': event.description,
+            'date': event.event_date.isoformat(),
+            'time': event.event_time,
+            'location': event.location,
+            'category': event.category,
+            'is_featured': event.is_featured,
+            'created_at': event.created_at.isoformat()
+        }), 201
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'An event with this title and date already exists'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Result Routes
+@admin_bp.route('/api/results', methods=['POST'])
+@admin_required
+def create_result():
+    """Create new result entry (Admin only)"""
+    try:
+        data = request.get_json()
+        
+        required_fields = ['class_level', 'year', 'pass_rate']
+        is_valid, error_message = validate_required_fields(data, required_fields)
+        if not is_valid:
+            return jsonify({'error': error_message}), 400
+        
+        # Accepts '98%' / '2nd' as well as plain numbers
+        try:
+            pass_rate = parse_number(data['pass_rate'])
+            district_rank = parse_number(data.get('district_rank'), int)
+            state_rank = parse_number(data.get('state_rank'), int)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        result = Result(
+            class_level=data['class_level'],
+            year=data['year'],
+            pass_rate=pass_rate,
+            above_90=data.get('above_90', 0),
+            above_95=data.get('above_95', 0),
+            district_rank=district_rank,
+            state_rank=state_rank
+        )
+        
+        db.session.add(result)
+        db.session.commit()
+        response_cache.invalidate()
+        
+        return jsonify({
+            'id': result.id,
+            'class_level': result.class_level,
+            'year': result.year,
+            'pass_rate': format_percentage(result.pass_rate),
+            'above_90': result.above_90,
+            'above_95': result.above_95,
+            'district_rank': ordinal(result.district_rank),
+            'state_rank': ordinal(result.state_rank)
+        }), 201
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A result for this class and year already exists'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Gallery Routes
+@admin_bp.route('/api/gallery', methods=['POST'])
+@admin_required
+def upload_gallery_image():
+    """Upload gallery image (Admin only)"""
+    try:
+        if 'image' not in request.files:
+            return jsonify({'error': 'No image file provided'}), 400
+        
+        file = request.files['image']
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        # Check file extension
+        allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+        if '.' not in file.filename or file.filename.rsplit('.', 1)[1].lower() not in allowed_extensions:
+            return jsonify({'error': 'Invalid file type'}), 400
+        
+        # Generate unique filename
+        filename = secure_filename(f"{uuid.uuid4()}_{file.filename}")
+        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+        
+        # Save file
+        os.makedirs(current_app.config['UPLOAD_FOLDER'], exist_ok=True)
+        file.save(filepath)
+        
+        # Size and colour for placeholders; also rejects files that aren't images
+        try:
+            metadata = image_metadata(filepath)
+        except InvalidImage as e:
+            os.remove(filepath)
+            return jsonify({'error': str(e)}), 400
+        
+        # Create gallery entry
+        gallery_item = Gallery(
+            title=request.form.get('title', 'Untitled'),
+            description=request.form.get('description', ''),
+            image_url=f'/api/uploads/{filename}',
+            category=request.form.get('category', 'general'),
+            **metadata
+        )
+        
+        db.session.add(gallery_item)
+        db.session.commit()
+        response_cache.invalidate()
+        
+        return jsonify({
+            'id': gallery_item.id,
+            'title': gallery_item.title,
+            'description': gallery_item.description,
+            'image_url': gallery_item.image_url,
+            'category': gallery_item.category,
+            'width': gallery_item.width,
+            'height': gallery_item.height,
+            'dominant_color': gallery_item.dominant_color
+        }), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Faculty Routes
+@admin_bp.route('/api/faculty', methods=['POST'])
+@admin_required
+def create_faculty():
+    """Create faculty member (Admin only)"""
+    try:
+        data = request.get_json()
+        
+        required_fields = ['name', 'position', 'qualifications']
+        is_valid, error_message = validate_required_fields(data, required_fields)
+        if not is_valid:
+            return jsonify({'error': error_message}), 400
+        
+        faculty = Faculty(
+            name=sanitize_input(data['name']),
+            position=sanitize_input(data['position']),
+            qualifications=sanitize_input(data['qualifications']),
+            experience=sanitize_input(data.get('experience', '')),
+            subjects=parse_subjects(data.get('subjects')),
+            description=sanitize_input(data.get('description', '')),
+            photo_url=data.get('photo_url', ''),
+            position_order=data.get('position_order', 0)
+        )
+        
+        db.session.add(faculty)
+        db.session.commit()
+        response_cache.invalidate()
+        
+        return jsonify({
+            'id': faculty.id,
+            'name': faculty.name,
+            'position': faculty.position,
+            'qualifications': faculty.qualifications,
+            'experience': faculty.experience,
+            'subjects': list(faculty.subjects),
+            'description': faculty.description,
+            'photo_url': faculty.photo_url,
+            'position_order': faculty.position_order
+        }), 201
+        
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'A faculty member with this name already exists'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Backup Routes
+@admin_bp.route('/api/backups', methods=['GET'])
+@admin_required
+def list_backups():
+    """List backup snapshots (Admin only)"""
+    try:
+        backup_dir = current_app.config['BACKUP_DIR']
+        return jsonify({
+            'backups': [dict({key: value for key, value in manifest.items() if key != 'files'},
+                             uploads=len(manifest['files']))
+                        for _, manifest in reversed(backup.list_snapshots(backup_dir))],
+            'running': backup.is_running(backup_dir)
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _run_backup(app, lock):
+    try:
+        backup.create_snapshot(app, log=app.logger.info, lock=lock)
+    except Exception:
+        app.logger.exception("Backup failed")
+
+@admin_bp.route('/api/backups', methods=['POST'])
+@admin_required
+def create_backup():
+    """Start a backup in the background (Admin only); poll GET /api/backups for it"""
+    try:
+        app = current_app._get_current_object()
+        backup.sqlite_path(app)  # fail now rather than in the thread
+        lock = backup.lock_backup_dir(app.config['BACKUP_DIR'])
+        if lock is None:
+            return jsonify({'error': 'A backup is already running'}), 409
+        # A multi-GB copy would outlive the request timeout
+        threading.Thread(target=_run_backup, args=(app, lock), name='backup', daemon=True).start()
+        return jsonify({'message': 'Backup started'}), 202
+        
+    except backup.BackupError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/api/backups/<name>/download', methods=['GET'])
+@admin_required
+def download_backup(name):
+    """Stream a backup snapshot as .tar.gz (Admin only)"""
+    try:
+        path = backup.snapshot_dir(current_app.config['BACKUP_DIR'], name)
+    except backup.BackupError as e:
+        return jsonify({'error': str(e)}), 404
+    return Response(backup.stream_archive(path), mimetype='application/gzip',
+                    headers={'Content-Disposition': f'attachment; filename=ssps-backup-{name}.tar.gz'})
+
+# Dashboard Stats
+@admin_bp.route('/api/dashboard/stats', methods=['GET'])
+@admin_required
+def get_dashboard_stats():
+    """Get dashboard statistics (Admin only)"""
+    try:
+        # Count admissions by status
+        total_admissions = Admission.query.count()
+        pending_admissions = Admission.query.filter_by(application_status='pending').count()
+        
+        # Kept by inbox.py, so this doesn't scan the messages
+        unread_messages = unread_count(db.session)
+        
+        # Count upcoming events
+        today = datetime.utcnow().date()
+        upcoming_events = Event.query.filter(Event.event_date >= today).count()
+        
+        # Count active faculty
+        active_faculty = Faculty.query.filter_by(is_active=True).count()
+        
+        return jsonify({
+            'admissions': {
+                'total': total_admissions,
+                'pending': pending_admissions
+            },
+            'messages': {
+                'unread': unread_messages
+            },
+            'events': {
+                'upcoming': upcoming_events
+            },
+            'faculty': {
+                'active': active_faculty
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request
+from flask_jwt_extended import jwt_required, create_access_token, get_jwt_identity
+
+from extensions import db, rate_limiter
+from models import Admin
+
+auth_bp = Blueprint('auth', __name__)
+
+# Authentication Routes
+@auth_bp.route('/api/auth/login', methods=['POST'])
+@rate_limiter.limit('RATE_LIMIT_LOGIN')
+def login():
+    """Admin login"""
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('username') or not data.get('password'):
+            return jsonify({'error': 'Username and password required'}), 400
+        
+        admin = Admin.query.filter_by(username=data['username']).first()
+        
+        if admin and admin.check_password(data['password']) and admin.is_active:
+            admin.last_login = datetime.utcnow()
+            db.session.commit()
+            
+            access_token = create_access_token(identity=admin.id)
+            return jsonify({
+                'access_token': access_token,
+                'admin': {
+                    'id': admin.id,
+                    'username': admin.username,
+                    'full_name': admin.full_name,
+                    'email': admin.email
+                }
+            })
+        else:
+            return jsonify({'error': 'Invalid credentials'}), 401
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@auth_bp.route('/api/auth/me', methods=['GET'])
+@jwt_required()
+def get_current_user():
+    """Get current admin user info"""
+    try:
+        current_user_id = get_jwt_identity()
+        admin = Admin.query.get(current_user_id)
+        
+        if not admin:
+            return jsonify({'error': 'User not found'}), 404
+        
+        return jsonify({
+            'id': admin.id,
+            'username': admin.username,
+            'full_name': admin.full_name,
+            'email': admin.email,
+            'last_login': admin.last_login.isoformat() if admin.last_login else None
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
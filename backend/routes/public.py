@@ -0,0 +1,491 @@
+from datetime import date, datetime
+
+import sqlalchemy as sa
+from flask import Blueprint, Response, current_app, jsonify, request, send_from_directory
+from sqlalchemy.exc import IntegrityError
+
+from analytics import count_admission
+from cache import NO_EXPIRY, seconds_until_midnight
+from database import use_read_engine
+from extensions import db, metrics, response_cache, rate_limiter
+from idempotency import idempotent
+from inbox import count_messages
+from search import index_admission
+from models import News, Admission, ContactMessage, Event, Result, Topper, Gallery, Faculty, FacultySubject
+from utils import (validate_required_fields, sanitize_input, validate_email, validate_phone,
+                   encode_cursor, decode_cursor, format_percentage, ordinal, admission_fingerprint)
+
+public_bp = Blueprint('public', __name__)
+
+DATABASE_NAMES = {'sqlite': 'SQLite', 'postgresql': 'PostgreSQL'}
+
+@public_bp.before_request
+def route_reads():
+    # Public pages only read, so they use the read-only pool
+    if request.method in ('GET', 'HEAD'):
+        use_read_engine()
+
+@public_bp.route('/api/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'healthy',
+        'timestamp': datetime.utcnow().isoformat(),
+        'service': 'Shri Shyam Public School API',
+        'database': DATABASE_NAMES.get(db.engine.dialect.name, db.engine.dialect.name)
+    })
+
+@public_bp.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Request metrics of all workers in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# News Routes
+NEWS_ORDERS = ('recent', 'priority')
+
+@public_bp.route('/api/news', methods=['GET'])
+@response_cache.cached()
+def get_news():
+    """Get one page of news and announcements, newest first.
+
+    ``order=priority`` puts urgent, then high priority items first, each
+    newest first. Pass ``next_cursor`` back as ``cursor`` for the following
+    page; every page is read from an index, however long the archive.
+    """
+    try:
+        order = request.args.get('order', 'recent')
+        if order not in NEWS_ORDERS:
+            return jsonify({'error': f"order must be one of {', '.join(NEWS_ORDERS)}"}), 400
+        columns = [News.created_at, News.id]
+        if order == 'priority':
+            columns.insert(0, News.priority_rank)
+        try:
+            limit = min(max(int(request.args.get('limit', 10)), 1), 100)
+            cursor = request.args.get('cursor')
+            after = decode_cursor(cursor, len(columns)) if cursor else None
+            if after:
+                after[-2] = datetime.fromisoformat(after[-2])
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid limit or cursor'}), 400
+
+        query = News.query.filter_by(is_active=True)
+        if after:
+            # Typed literals, so the id is compared in its stored 16-byte form
+            last = sa.tuple_(*[sa.literal(value, column.type) for value, column in zip(after, columns)])
+            query = query.filter(sa.tuple_(*columns) < last)
+        news_items = query.order_by(*[column.desc() for column in columns]).limit(limit + 1).all()
+        more = len(news_items) > limit
+        news_items = news_items[:limit]
+
+        last = news_items[-1] if more else None
+        return jsonify({
+            'news': [{
+                'id': news.id,
+                'title': news.title,
+                'content': news.content,
+                'emoji': news.emoji,
+                'priority': news.priority,
+                'created_at': news.created_at.isoformat()
+            } for news in news_items],
+            'next_cursor': encode_cursor(*([last.priority_rank] if order == 'priority' else []),
+                                         last.created_at.isoformat(), last.id) if last else None
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Admission Routes
+@public_bp.route('/api/admissions', methods=['POST'])
+@idempotent
+@rate_limiter.limit('RATE_LIMIT_ADMISSIONS')
+def submit_admission():
+    """Submit admission application.
+
+    A second application for the same student (name, date of birth and
+    phone) is refused with 409; retries sending the same Idempotency-Key
+    get the original response instead.
+    """
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = [
+            'studentName', 'classApplying', 'dateOfBirth', 'gender',
+            'fatherName', 'motherName', 'phone', 'email', 'address'
+        ]
+        is_valid, error_message = validate_required_fields(data, required_fields)
+        if not is_valid:
+            return jsonify({'error': error_message}), 400
+        
+        # Validate email and phone
+        if not validate_email(data['email']):
+            return jsonify({'error': 'Invalid email format'}), 400
+        
+        if not validate_phone(data['phone']):
+            return jsonify({'error': 'Invalid phone number format'}), 400
+        
+        # Parse date of birth
+        try:
+            dob = datetime.strptime(data['dateOfBirth'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        admission = Admission(
+            student_name=sanitize_input(data['studentName']),
+            class_applying=sanitize_input(data['classApplying']),
+            date_of_birth=dob,
+            gender=sanitize_input(data['gender']),
+            father_name=sanitize_input(data['fatherName']),
+            mother_name=sanitize_input(data['motherName']),
+            phone=sanitize_input(data['phone']),
+            email=sanitize_input(data['email']),
+            address=sanitize_input(data['address']),
+            previous_school=sanitize_input(data.get('previousSchool', '')),
+            previous_percentage=data.get('previousPercentage')
+        )
+        admission.fingerprint = admission_fingerprint(admission.student_name, dob, admission.phone)
+        admission.submitted_at = datetime.utcnow()
+        
+        db.session.add(admission)
+        db.session.flush()
+        count_admission(db.session, admission.submitted_at.date(), admission.class_applying, 'pending',
+                        admission.gender)
+        index_admission(db.session, admission)
+        db.session.commit()
+        
+        return jsonify({
+            'message': 'Application submitted successfully',
+            'application_id': admission.id
+        }), 201
+        
+    except IntegrityError:
+        # One probe of uq_admissions_fingerprint
+        db.session.rollback()
+        return jsonify({'error': 'An application for this student has already been submitted'}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Contact Routes
+@public_bp.route('/api/contact', methods=['POST'])
+@idempotent
+@rate_limiter.limit('RATE_LIMIT_CONTACT')
+def submit_contact():
+    """Submit contact form message"""
+    try:
+        data = request.get_json()
+        
+        # Validate required fields
+        required_fields = ['name', 'email', 'subject', 'message']
+        is_valid, error_message = validate_required_fields(data, required_fields)
+        if not is_valid:
+            return jsonify({'error': error_message}), 400
+        
+        # Validate email
+        if not validate_email(data['email']):
+            return jsonify({'error': 'Invalid email format'}), 400
+        
+        contact_message = ContactMessage(
+            name=sanitize_input(data['name']),
+            email=sanitize_input(data['email']),
+            phone=sanitize_input(data.get('phone', '')),
+            subject=sanitize_input(data['subject']),
+            message=sanitize_input(data['message']),
+            status='unread'
+        )
+        
+        db.session.add(contact_message)
+        count_messages(db.session, 'unread')
+        db.session.commit()
+        
+        return jsonify({'message': 'Message sent successfully'}), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# Event Routes
+EVENT_WINDOWS = ('upcoming', 'past', 'all')
+
+def _parse_date_arg(name):
+    value = request.args.get(name)
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+@public_bp.route('/api/events', methods=['GET'])
+@response_cache.cached(ttl=seconds_until_midnight)
+def get_events():
+    """Get one page of events.
+
+    ``window`` is ``upcoming`` (default, soonest first), ``past`` (latest
+    first) or ``all``; ``from``/``to`` limit the dates (inclusive), and
+    ``category`` and ``featured`` filter. Pass ``next_cursor`` back as
+    ``cursor`` for the following page. Cached until midnight, when today's
+    events change window.
+    """
+    try:
+        try:
+            start, end = _parse_date_arg('from'), _parse_date_arg('to')
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        window = request.args.get('window', 'all' if start or end else 'upcoming')
+        if window not in EVENT_WINDOWS:
+            return jsonify({'error': f"window must be one of {', '.join(EVENT_WINDOWS)}"}), 400
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+            cursor = request.args.get('cursor')
+            after = decode_cursor(cursor, 2) if cursor else None
+            if after:
+                after[0] = datetime.strptime(after[0], '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid limit or cursor'}), 400
+
+        query = Event.query
+        today = date.today()
+        if window == 'upcoming':
+            query = query.filter(Event.event_date >= today)
+        elif window == 'past':
+            query = query.filter(Event.event_date < today)
+        if start:
+            query = query.filter(Event.event_date >= start)
+        if end:
+            query = query.filter(Event.event_date <= end)
+        if request.args.get('category'):
+            query = query.filter(Event.category == request.args['category'])
+        if 'featured' in request.args:
+            query = query.filter(Event.is_featured == (request.args['featured'] in ('1', 'true')))
+
+        # Keyset pagination on (event_date, id), which ix_events_date_id covers
+        sort_key = sa.tuple_(Event.event_date, Event.id)
+        newest_first = window == 'past'
+        if after:
+            # Typed literals, so the id is compared in its stored 16-byte form
+            last = sa.tuple_(sa.literal(after[0], Event.event_date.type), sa.literal(after[1], Event.id.type))
+            query = query.filter(sort_key < last if newest_first else sort_key > last)
+        order = (Event.event_date.desc(), Event.id.desc()) if newest_first else (Event.event_date, Event.id)
+        events = query.order_by(*order).limit(limit + 1).all()
+        more = len(events) > limit
+        events = events[:limit]
+
+        return jsonify({
+            'events': [{
+                'id': event.id,
+                'title': event.title,
+                'description': event.description,
+                'date': event.event_date.isoformat(),
+                'time': event.event_time,
+                'location': event.location,
+                'category': event.category,
+                'is_featured': event.is_featured,
+                'image_url': event.image_url,
+                'created_at': event.created_at.isoformat()
+            } for event in events],
+            'next_cursor': encode_cursor(events[-1].event_date.isoformat(), events[-1].id) if more else None
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Result Routes
+@public_bp.route('/api/results', methods=['GET'])
+@response_cache.cached()
+def get_results():
+    """Get academic results data"""
+    try:
+        # Get Class X results
+        class10_results = Result.query.filter_by(class_level='10').order_by(Result.year.desc()).all()
+        
+        # Get Class XII results
+        class12_results = Result.query.filter_by(class_level='12').order_by(Result.year.desc()).all()
+        
+        # Get toppers
+        toppers = Topper.query.order_by(Topper.year.desc()).limit(10).all()
+        
+        return jsonify({
+            'class10': [{
+                'year': result.year,
+                'passRate': format_percentage(result.pass_rate),
+                'above90': result.above_90,
+                'above95': result.above_95,
+                'districtRank': ordinal(result.district_rank),
+                'stateRank': ordinal(result.state_rank)
+            } for result in class10_results],
+            'class12': [{
+                'year': result.year,
+                'passRate': format_percentage(result.pass_rate),
+                'above90': result.above_90,
+                'above95': result.above_95,
+                'districtRank': ordinal(result.district_rank),
+                'stateRank': ordinal(result.state_rank)
+            } for result in class12_results],
+            'toppers': [{
+                'name': topper.name,
+                'percentage': topper.percentage,
+                'stream': topper.stream,
+                'achievement': topper.achievement,
+                'photo': topper.photo_url,
+                'year': topper.year
+            } for topper in toppers]
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+@public_bp.route('/api/results/trends', methods=['GET'])
+@response_cache.cached(ttl=NO_EXPIRY)
+def get_result_trends():
+    """Year-over-year changes, per-class averages and class comparisons of results"""
+    try:
+        # One GROUP BY query; the window functions run over its (class, year) groups
+        pass_rate = sa.func.avg(Result.pass_rate)
+        above_90 = sa.func.sum(Result.above_90)
+        above_95 = sa.func.sum(Result.above_95)
+        district_rank = sa.func.min(Result.district_rank)
+        state_rank = sa.func.min(Result.state_rank)
+        by_class = {'partition_by': Result.class_level, 'order_by': Result.year}
+        change = lambda value: value - sa.func.lag(value).over(**by_class)
+        rows = db.session.execute(
+            sa.select(
+                Result.class_level, Result.year,
+                pass_rate.label('pass_rate'), above_90.label('above_90'), above_95.label('above_95'),
+                district_rank.label('district_rank'), state_rank.label('state_rank'),
+                change(pass_rate).label('pass_rate_change'),
+                change(above_90).label('above_90_change'),
+                change(above_95).label('above_95_change'),
+                change(district_rank).label('district_rank_change'),
+                change(state_rank).label('state_rank_change'),
+                sa.func.avg(pass_rate).over(partition_by=Result.class_level).label('class_pass_rate'),
+                sa.func.avg(above_90).over(partition_by=Result.class_level).label('class_above_90'),
+                sa.func.avg(above_95).over(partition_by=Result.class_level).label('class_above_95'),
+                sa.func.avg(pass_rate).over(partition_by=Result.year).label('year_pass_rate'),
+            )
+            .group_by(Result.class_level, Result.year)
+            .order_by(Result.class_level, Result.year.desc())
+        ).all()
+
+        classes, years = {}, {}
+        for row in rows:
+            entry = classes.setdefault(row.class_level, {
+                'classLevel': row.class_level,
+                'averagePassRate': _round(row.class_pass_rate),
+                'averageAbove90': _round(row.class_above_90),
+                'averageAbove95': _round(row.class_above_95),
+                'years': [],
+            })
+            entry['years'].append({
+                'year': row.year,
+                'passRate': _round(row.pass_rate),
+                'passRateChange': _round(row.pass_rate_change),
+                'above90': row.above_90,
+                'above90Change': row.above_90_change,
+                'above95': row.above_95,
+                'above95Change': row.above_95_change,
+                # Negative rank changes are improvements
+                'districtRank': row.district_rank,
+                'districtRankChange': row.district_rank_change,
+                'stateRank': row.state_rank,
+                'stateRankChange': row.state_rank_change,
+                'vsYearAverage': _round(row.pass_rate - row.year_pass_rate),
+            })
+            year = years.setdefault(row.year, {'year': row.year, 'averagePassRate': _round(row.year_pass_rate),
+                                               'passRates': {}})
+            year['passRates'][row.class_level] = _round(row.pass_rate)
+
+        return jsonify({
+            'classes': list(classes.values()),
+            'years': [years[year] for year in sorted(years, reverse=True)],
+        })
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Gallery Routes
+@public_bp.route('/api/gallery', methods=['GET'])
+@response_cache.cached()
+def get_gallery():
+    """Get one page of gallery images, newest first, optionally of one ``category``.
+
+    Pass ``next_cursor`` back as ``cursor`` for the following page. Each
+    image carries its width, height and dominant colour, so the page can lay
+    out and tint placeholders before the images load.
+    """
+    try:
+        try:
+            limit = min(max(int(request.args.get('limit', 24)), 1), 100)
+            cursor = request.args.get('cursor')
+            after = decode_cursor(cursor, 2) if cursor else None
+            if after:
+                after[0] = datetime.fromisoformat(after[0])
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid limit or cursor'}), 400
+
+        query = Gallery.query.filter_by(is_active=True)
+        if request.args.get('category'):
+            query = query.filter(Gallery.category == request.args['category'])
+        if after:
+            # Typed literals, so the id is compared in its stored 16-byte form
+            last = sa.tuple_(sa.literal(after[0], Gallery.created_at.type), sa.literal(after[1], Gallery.id.type))
+            query = query.filter(sa.tuple_(Gallery.created_at, Gallery.id) < last)
+        images = query.order_by(Gallery.created_at.desc(), Gallery.id.desc()).limit(limit + 1).all()
+        more = len(images) > limit
+        images = images[:limit]
+        
+        return jsonify({
+            'images': [{
+                'id': image.id,
+                'title': image.title,
+                'description': image.description,
+                'image_url': image.image_url,
+                'category': image.category,
+                'width': image.width,
+                'height': image.height,
+                'dominant_color': image.dominant_color,
+                'created_at': image.created_at.isoformat()
+            } for image in images],
+            'next_cursor': encode_cursor(images[-1].created_at.isoformat(), images[-1].id) if more else None
+        })
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# Faculty Routes
+@public_bp.route('/api/faculty', methods=['GET'])
+@response_cache.cached()
+def get_faculty():
+    """Get faculty members, optionally only those teaching ``subject`` or holding ``position``"""
+    try:
+        query = Faculty.query.filter_by(is_active=True)
+        subject = request.args.get('subject', '').strip()
+        if subject:
+            # Case-insensitive, through ix_faculty_subjects_subject
+            query = query.filter(Faculty.id.in_(
+                sa.select(FacultySubject.faculty_id)
+                .where(sa.func.lower(FacultySubject.subject) == sa.func.lower(subject))
+            ))
+        position = request.args.get('position', '').strip()
+        if position:
+            query = query.filter(sa.func.lower(Faculty.position) == sa.func.lower(position))
+        faculty_members = query.order_by(Faculty.position_order).all()
+        
+        return jsonify([{
+            'id': faculty.id,
+            'name': faculty.name,
+            'position': faculty.position,
+            'qualifications': faculty.qualifications,
+            'experience': faculty.experience,
+            'subjects': list(faculty.subjects),
+            'description': faculty.description,
+            'photo_url': faculty.photo_url,
+            'position_order': faculty.position_order
+        } for faculty in faculty_members])
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# File serving route
+@public_bp.route('/api/uploads/<filename>')
+def serve_file(filename):
+    """Serve uploaded files"""
+    return send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Applicant search for Shri Shyam Public School
+
+Staff look up an application while a parent is on the phone, often with a
+misspelt name, a Hindi name written in Latin letters (or the reverse) or
+part of a phone number. Every application gets one row in
+``admission_search`` holding its names folded to a phonetic key, its phone
+digits and its email. Folding transliterates Devanagari and evens out the
+usual spelling variants (Shyaam/Shyam, Meena/मीणा, Singh/सिंह), so those
+match exactly; what is left over is caught by trigram matching.
+
+On SQLite the table is an FTS5 ``trigram`` index, on PostgreSQL a GIN
+``pg_trgm`` index. Rows are added with each application and kept after it
+is archived, so earlier years stay searchable.
+
+Usage:
+    python search.py rebuild             # re-index all applications
+    python search.py query "ramesh 98"   # try a search
+"""
+
+import argparse
+import difflib
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+import sqlalchemy as sa
+
+# Add the current directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Devanagari letters in a simple Latin transliteration; consonants carry the inherent 'a'
+_VOWELS = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ii', 'उ': 'u', 'ऊ': 'uu', 'ऋ': 'ri', 'ए': 'e', 'ऐ': 'ai',
+    'ओ': 'o', 'औ': 'au', 'ऑ': 'o',
+}
+_MATRAS = {
+    'ा': 'aa', 'ि': 'i', 'ी': 'ii', 'ु': 'u', 'ू': 'uu', 'ृ': 'ri', 'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+    'ॉ': 'o',
+}
+_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n', 'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n', 'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm', 'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v', 'श': 'sh',
+    'ष': 'sh', 'स': 's', 'ह': 'h', 'ळ': 'l',
+}
+# Consonants a nukta turns into another sound (ड़ -> r, फ़ -> f)
+_NUKTA_SOUNDS = {'d': 'r', 'dh': 'rh', 'ph': 'f', 'j': 'z', 'k': 'q'}
+_VIRAMA, _NUKTA = '्', '़'
+_NASALS = 'ंँ'
+_VISARGA = 'ः'
+
+# Query words shorter than this are ignored; a single letter would match nearly everything
+MIN_WORD = 2
+MIN_DIGITS = 3
+# Words at least this long also match with one letter wrong, added or missing
+FUZZY_MIN_LENGTH = 4
+# When nothing matches exactly, this many close candidates are scored in Python
+FUZZY_CANDIDATES = 200
+# Lowest similarity (0-1) at which a query word counts as found in a candidate: one wrong letter
+# scores 0.75 in a four-letter name, 0.73 when it folds to two letters (Kuxar, Kumar)
+FUZZY_THRESHOLD = 0.7
+
+# Latin spelling variants folded to one form, applied in order
+_FOLDS = [
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'(?<=[bcdgjkpst])h'), ''),   # aspirates: bh, chh, dh, kh, sh, th ... -> b, c, d, k, s, t
+    (re.compile(r'ng|nh\b'), 'n'),            # Singh / सिंह (sinh)
+    (re.compile(r'w'), 'v'),
+    (re.compile(r'z'), 'j'),
+    (re.compile(r'q'), 'k'),
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'ee|ii'), 'i'),
+    (re.compile(r'oo|uu'), 'u'),
+    (re.compile(r'([a-z])\1+'), r'\1'),       # aa -> a, nn -> n, tt -> t
+]
+
+def _transliterate_word(word):
+    """Devanagari word -> Latin, dropping the inherent 'a' where Hindi doesn't pronounce it"""
+    # Syllables as [consonant, vowel]; vowel None is the inherent 'a'
+    syllables = []
+    for char in word:
+        if char in _CONSONANTS:
+            syllables.append([_CONSONANTS[char], None])
+        elif char in _MATRAS and syllables:
+            syllables[-1][1] = _MATRAS[char]
+        elif char == _VIRAMA and syllables:
+            syllables[-1][1] = ''
+        elif char == _NUKTA and syllables:
+            syllables[-1][0] = _NUKTA_SOUNDS.get(syllables[-1][0], syllables[-1][0])
+        elif char in _VOWELS:
+            syllables.append(['', _VOWELS[char]])
+        elif (char in _NASALS or char == _VISARGA) and syllables:
+            # Nasalizes (or aspirates) the vowel before it
+            vowel = syllables[-1][1]
+            syllables[-1][1] = ('a' if vowel is None else vowel) + ('n' if char in _NASALS else 'h')
+        elif char not in _NASALS and char != _VISARGA and char != _NUKTA:
+            syllables.append([char, ''])
+    # Schwa deletion: always at the end of the word, and between VC and CV inside it (right to left)
+    if syllables and syllables[-1][1] is None and len(syllables) > 1:
+        syllables[-1][1] = ''
+    for i in range(len(syllables) - 2, 0, -1):
+        before, after = syllables[i - 1], syllables[i + 1]
+        if syllables[i][1] is None and syllables[i][0] and before[1] != '' and after[0] and after[1] != '':
+            syllables[i][1] = ''
+    return ''.join(consonant + ('a' if vowel is None else vowel) for consonant, vowel in syllables)
+
+@lru_cache(maxsize=65536)
+def fold(text):
+    """Phonetic search key of a name: 'Shyaam  Sharma' and 'श्याम शर्मा' both give 'syam sarma'"""
+    if not text:
+        return ''
+    if not text.isascii():
+        text = unicodedata.normalize('NFC', text)
+        text = re.sub(r'[ऀ-ॿ]+', lambda match: _transliterate_word(match.group()), text)
+        text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    text = re.sub(r'[^a-z0-9]+', ' ', text.casefold())
+    for pattern, replacement in _FOLDS:
+        text = pattern.sub(replacement, text)
+    return ' '.join(text.split())
+
+def _local_part(email):
+    # Domains (gmail.com) are shared by most families and only slow matching down
+    return email.partition('@')[0] if email else ''
+
+def document(student_name, father_name, mother_name, phone, email):
+    """Indexed text of one application: folded names, phone digits and the folded part of the email before '@'"""
+    # Migration 15 builds the index with this too; after changing it (or fold) run `python search.py rebuild`
+    digits = re.sub(r'\D', '', phone or '')[-10:]
+    names = ' '.join(fold(name) for name in (student_name, father_name, mother_name) if name)
+    # Padded with spaces so every word, even a two-letter one, can be matched from its start
+    return f' {names} {digits} {fold(_local_part(email))} '
+
+def _search_table():
+    from models import admission_search
+    return admission_search
+
+def index_admission(session, admission):
+    """Add an application to the search index; call inside the transaction that inserts it"""
+    session.execute(_search_table().insert().values(
+        admission_id=admission.id,
+        document=document(admission.student_name, admission.father_name, admission.mother_name,
+                          admission.phone, admission.email)))
+
+def rebuild(engine, batch_size=5000):
+    """Re-index admissions and admissions_archive, oldest first; returns the number indexed"""
+    from models import Admission, admissions_archive
+
+    table = _search_table()
+    columns = ('id', 'student_name', 'father_name', 'mother_name', 'phone', 'email', 'submitted_at')
+    rows = sa.union_all(*[sa.select(*[source.c[name] for name in columns])
+                          for source in (Admission.__table__, admissions_archive)]).subquery()
+    total = 0
+    with engine.begin() as conn:
+        conn.execute(table.delete())
+        # On SQLite the FTS rowid follows insertion order, which search results use for "newest first"
+        result = conn.execute(sa.select(rows).order_by(rows.c.submitted_at), execution_options={'yield_per': batch_size})
+        for batch in result.partitions():
+            conn.execute(table.insert(), [{'admission_id': row.id, 'document': document(*row[1:6])} for row in batch])
+            total += len(batch)
+    return total
+
+# A condition is a list of alternatives, each a list of substrings that must all occur in the document
+
+def _word(word):
+    # From the start of a word, so 'ram' finds Ramesh but not Vikram
+    return [[f' {word}']]
+
+def _digits(digits):
+    # Anywhere, so the last digits of a phone number are enough
+    return [[digits]]
+
+def _trigrams(text):
+    return [(i, text[i:i + 3]) for i in range(len(text) - 2)]
+
+def _fuzzy(word, broad=False):
+    """Alternatives tolerating one typo: each drops the trigrams a mistake at one letter would break.
+
+    ``broad`` also covers mistakes spanning two neighbouring letters, as one
+    mistyped letter can fold to two ('kuxar' -> 'kuksar') and swapped letters
+    touch two, and where that leaves none of the word's own trigrams (a short
+    word wrong in the middle) it uses those taking in the spaces around the
+    word instead, e.g. 'ta ' for 'sota'.
+    """
+    inner, padded = _trigrams(word), _trigrams(f' {word} ')
+    alternatives = []
+    for span in ((1, 2) if broad else (1,)):
+        for position in range(len(word) - span + 1):
+            kept = [trigram for i, trigram in inner if i + 3 <= position or i >= position + span]
+            if not kept and broad:
+                # In ' word ' the mistake is one character further right
+                kept = [trigram for i, trigram in padded if i + 3 <= position + 1 or i >= position + 1 + span]
+            if kept and kept not in alternatives:
+                alternatives.append(kept)
+    return alternatives
+
+def _terms(query):
+    """(digit runs, words) of a search query, folded like the index"""
+    terms = fold(' '.join(_local_part(term) for term in query.split())).split()
+    digits = [term for term in terms if term.isdigit() and len(term) >= MIN_DIGITS]
+    words = [term for term in terms if not term.isdigit() and len(term) >= MIN_WORD]
+    return digits, words
+
+def _matching(session, conditions, limit):
+    """(admission id, document) of the newest ``limit`` documents meeting every condition"""
+    table = _search_table()
+    if session.get_bind().dialect.name == 'sqlite':
+        # One FTS5 trigram MATCH; terms are folded to [a-z0-9], so quoting them is safe
+        expression = ' AND '.join(
+            '(' + ' OR '.join('(' + ' AND '.join(f'"{text}"' for text in alternative) + ')'
+                              for alternative in condition) + ')'
+            for condition in conditions)
+        query = (sa.select(table.c.admission_id, table.c.document)
+                 .where(sa.text('admission_search MATCH :expression').bindparams(expression=expression))
+                 .order_by(sa.text('rowid DESC')))
+    else:
+        # LIKE patterns are answered by the pg_trgm GIN index; ids are UUIDv7, so they sort by age
+        query = (sa.select(table.c.admission_id, table.c.document)
+                 .where(*[sa.or_(*[sa.and_(*[table.c.document.contains(text, autoescape=True)
+                                            for text in alternative])
+                                   for alternative in condition])
+                          for condition in conditions])
+                 .order_by(table.c.admission_id.desc()))
+    return session.execute(query.limit(limit)).all()
+
+@lru_cache(maxsize=65536)
+def _similarity(word, candidate):
+    matcher = difflib.SequenceMatcher(None, word, candidate)
+    if matcher.real_quick_ratio() < FUZZY_THRESHOLD:
+        return 0.0
+    return matcher.ratio()
+
+def _score(words, document):
+    """Sum of each query word's best similarity to a document word, or None if one isn't found"""
+    score = 0.0
+    document_words = document.split()
+    for word in words:
+        # Compared with whole words and with their beginnings, as exact matches are prefixes
+        best = max((max(_similarity(word, candidate), _similarity(word, candidate[:len(word)]))
+                    for candidate in document_words), default=0.0)
+        if best < FUZZY_THRESHOLD:
+            return None
+        score += best
+    return score
+
+def search(session, query, limit=20):
+    """Ids of the applications best matching ``query``.
+
+    Applications containing every query word (from the start of a name) and
+    digit run are returned newest first. Only if there are none, close
+    matches are returned instead, closest first.
+    """
+    digits, words = _terms(query)
+    if not digits and not words:
+        return []
+    exact = [row.admission_id for row in
+             _matching(session, [_digits(run) for run in digits] + [_word(word) for word in words], limit)]
+    if exact or not any(len(word) >= FUZZY_MIN_LENGTH for word in words):
+        return exact
+
+    # Broad alternatives match far more applications, so they are only tried when the narrow ones find nothing
+    for broad in (False, True):
+        conditions = [_digits(run) for run in digits]
+        conditions += [_fuzzy(word, broad) if len(word) >= FUZZY_MIN_LENGTH else _word(word) for word in words]
+        scored = []
+        for admission_id, document_text in _matching(session, conditions, FUZZY_CANDIDATES):
+            score = _score(words, document_text)
+            if score is not None:
+                scored.append((score, admission_id))
+        if scored:
+            break
+    # Stable sort: equally close candidates stay newest first
+    scored.sort(key=lambda item: -item[0])
+    return [admission_id for _, admission_id in scored[:limit]]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Applicant search index')
+    parser.add_argument('command', choices=['rebuild', 'query'])
+    parser.add_argument('text', nargs='?', help='search text for query')
+    args = parser.parse_args(argv)
+
+    from app import create_app
+    from extensions import db
+    from models import Admission
+
+    app = create_app()
+    with app.app_context():
+        if args.command == 'rebuild':
+            print(f"✅ Search index rebuilt: {rebuild(db.engine):,} applications")
+            return
+        if not args.text:
+            parser.error('query needs the search text')
+        for admission_id in search(db.session, args.text):
+            admission = db.session.get(Admission, admission_id)
+            if admission is None:
+                print(f"  {admission_id}  (archived)")
+                continue
+            print(f"  {admission.submitted_at:%Y-%m-%d}  {admission.student_name:<25} {admission.father_name:<25} "
+                  f"{admission.phone}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory-mapped files and file locks shared by all worker processes
+
+Used by the response cache and the rate limiter to keep small pieces of
+state that every gunicorn worker sees immediately, without a server, and by
+the maintenance scheduler to elect one worker as its leader.
+"""
+
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: the development server is a single process
+    fcntl = None
+
+# fcntl locks belong to the process, so threads of one worker also need this
+_thread_lock = threading.Lock()
+
+def open_mapped(path, size):
+    """Open (creating if needed) a file of at least ``size`` bytes and map it shared"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    if os.fstat(fd).st_size < size:
+        os.ftruncate(fd, size)
+    # ACCESS_WRITE is a shared, writable mapping on POSIX and Windows alike (Windows has no MAP_SHARED)
+    return fd, mmap.mmap(fd, size, access=mmap.ACCESS_WRITE)
+
+@contextmanager
+def locked(fd, length=0, start=0):
+    """Exclusive lock on a byte range of ``fd`` (the whole file by default)"""
+    with _thread_lock:
+        if fcntl is None:
+            yield
+            return
+        fcntl.lockf(fd, fcntl.LOCK_EX, length, start)
+        try:
+            yield
+        finally:
+            fcntl.lockf(fd, fcntl.LOCK_UN, length, start)
+
+def try_lock(fd):
+    """Non-blocking exclusive lock on all of ``fd``, held until it is closed or the process exits"""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+def is_locked(fd):
+    """Whether another process holds an exclusive lock on ``fd``.
+
+    Probes with a shared lock, released at once, so concurrent probes don't
+    conflict. Locks belong to the process: never call this on a file the
+    calling process has locked, as unlocking would drop that lock too.
+    """
+    if fcntl is None:
+        return False
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except OSError:
+        return True
+    fcntl.lockf(fd, fcntl.LOCK_UN)
+    return False
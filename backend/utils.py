@@ -0,0 +1,109 @@
+from functools import wraps
+import base64
+import hashlib
+import json
+import re
+import unicodedata
+
+from flask import jsonify
+
+from models import Admin
+
+# Helper functions
+def validate_required_fields(data, required_fields):
+    """Validate that all required fields are present in data"""
+    missing_fields = [field for field in required_fields if field not in data or not data[field]]
+    if missing_fields:
+        return False, f"Missing required fields: {', '.join(missing_fields)}"
+    return True, None
+
+def sanitize_input(text):
+    """Basic input sanitization"""
+    if isinstance(text, str):
+        return text.strip()
+    return text
+
+def validate_email(email):
+    """Validate email format"""
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+def validate_phone(phone):
+    """Validate phone number format"""
+    pattern = r'^[\+]?[0-9\s\-\(\)]{10,}$'
+    return re.match(pattern, phone) is not None
+
+def admission_fingerprint(student_name, date_of_birth, phone):
+    """16-byte digest identifying an applicant, whatever the spacing, case or phone prefix"""
+    name = ' '.join(unicodedata.normalize('NFKC', student_name).casefold().split())
+    # Last 10 digits, so '+91 98765-43210' and '09876543210' match
+    digits = re.sub(r'\D', '', phone)[-10:]
+    birth = date_of_birth if isinstance(date_of_birth, str) else date_of_birth.isoformat()
+    return hashlib.blake2b('\x1f'.join((name, birth[:10], digits)).encode('utf-8'), digest_size=16).digest()
+
+def parse_number(value, kind=float):
+    """Leading number of '98%', '98.5 %' or '2nd' as ``kind``; numbers pass through, '' is None"""
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else kind(value)
+    match = re.match(r'\s*(\d+(?:\.\d+)?)', str(value))
+    if not match:
+        if not str(value).strip():
+            return None
+        raise ValueError(f"'{value}' is not a number")
+    return kind(float(match.group(1)))
+
+def parse_subjects(value):
+    """Subject names from a list, a JSON array string or 'Chemistry, Physics'"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            value = json.loads(value)
+        else:
+            value = value.split(',')
+    subjects = []
+    for subject in value or []:
+        subject = str(subject).strip()
+        if subject and subject.lower() not in (s.lower() for s in subjects):
+            subjects.append(subject)
+    return subjects
+
+def encode_cursor(*values):
+    """Opaque pagination cursor holding the sort key of the last row returned"""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(',', ':')).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, count):
+    """Values of a cursor made by ``encode_cursor``; ValueError if it isn't one"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor') from None
+    if not isinstance(values, list) or len(values) != count:
+        raise ValueError('Invalid cursor')
+    return values
+
+def format_percentage(value):
+    """98.0 -> '98%', 98.5 -> '98.5%'"""
+    if value is None:
+        return None
+    return f"{value:g}%"
+
+def ordinal(value):
+    """2 -> '2nd', 11 -> '11th', 22 -> '22nd'"""
+    if value is None:
+        return None
+    suffix = 'th' if 10 <= value % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(value % 10, 'th')
+    return f"{value}{suffix}"
+
+# Authentication decorator for admin routes
+def admin_required(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        # Imported here so modules using the decorator don't pull in JWT at import
+        from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+        verify_jwt_in_request()
+        current_user_id = get_jwt_identity()
+        admin = Admin.query.get(current_user_id)
+        if not admin or not admin.is_active:
+            return jsonify({'error': 'Admin access required'}), 403
+        return f(*args, **kwargs)
+    return decorated
@@ -60,6 +60,7 @@ function initializeWebsite() {
     // Load dynamic content
     loadLatestNews();
     loadEventData();
+    loadGalleryPage();
     loadResultsData();
 }
 
@@ -225,6 +226,17 @@ function initializeForms() {
     }
 }
 
+// One Idempotency-Key per filled-in form: resubmitting after a dropped
+// connection replays the first response instead of submitting twice
+function submissionKey(form) {
+    if (!form.dataset.idempotencyKey) {
+        form.dataset.idempotencyKey = window.crypto && crypto.randomUUID
+            ? crypto.randomUUID()
+            : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    }
+    return form.dataset.idempotencyKey;
+}
+
 // Handle admission form submission
 async function handleAdmissionForm(e) {
     e.preventDefault();
@@ -238,6 +250,7 @@ async function handleAdmissionForm(e) {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Idempotency-Key': submissionKey(e.target),
             },
             body: JSON.stringify(data)
         });
@@ -245,7 +258,10 @@ async function handleAdmissionForm(e) {
         if (response.ok) {
             showAlert('success', 'Application submitted successfully! We will contact you soon.');
             e.target.reset();
+            delete e.target.dataset.idempotencyKey;
             hideApplicationForm();
+        } else if (response.status === 409) {
+            showAlert('error', 'An application for this student has already been received.');
         } else {
             throw new Error('Failed to submit application');
         }
@@ -270,6 +286,7 @@ async function handleContactForm(e) {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
+                'Idempotency-Key': submissionKey(e.target),
             },
             body: JSON.stringify(data)
         });
@@ -277,6 +294,7 @@ async function handleContactForm(e) {
         if (response.ok) {
             showAlert('success', 'Message sent successfully! We will get back to you soon.');
             e.target.reset();
+            delete e.target.dataset.idempotencyKey;
         } else {
             throw new Error('Failed to send message');
         }
@@ -573,8 +591,8 @@ async function loadLatestNews() {
     try {
         const response = await fetch(`${API_BASE_URL}/news`);
         if (response.ok) {
-            const news = await response.json();
-            updateNewsTicker(news);
+            const page = await response.json();
+            updateNewsTicker(page.news);
         }
     } catch (error) {
         console.error('Error loading news:', error);
@@ -591,28 +609,21 @@ function updateNewsTicker(newsItems) {
     }
 }
 
-// Load event data
+// Load event data (the server splits upcoming and past, one page each)
 async function loadEventData() {
     try {
-        const response = await fetch(`${API_BASE_URL}/events`);
-        if (response.ok) {
-            const events = await response.json();
-            updateEventsSection(events);
-        }
+        await Promise.all(['upcoming', 'past'].map(async type => {
+            const response = await fetch(`${API_BASE_URL}/events?window=${type}&limit=6`);
+            if (response.ok) {
+                const page = await response.json();
+                updateEventsList(type, page.events);
+            }
+        }));
     } catch (error) {
         console.error('Error loading events:', error);
     }
 }
 
-// Update events section
-function updateEventsSection(events) {
-    const upcomingEvents = events.filter(event => new Date(event.date) > new Date());
-    const pastEvents = events.filter(event => new Date(event.date) <= new Date());
-
-    updateEventsList('upcoming', upcomingEvents);
-    updateEventsList('past', pastEvents);
-}
-
 // Update events list
 function updateEventsList(type, events) {
     const container = document.querySelector(`#${type} .events-list`);
@@ -620,7 +631,7 @@ function updateEventsList(type, events) {
         container.innerHTML = events.map(event => {
             const date = new Date(event.date);
             const day = date.getDate();
-            const month = date.toLocaleLString('en', { month: 'short' });
+            const month = date.toLocaleString('en', { month: 'short' });
             
             return `
                 <div class="event-card">
@@ -642,6 +653,99 @@ function updateEventsList(type, events) {
     }
 }
 
+// Load gallery photos one page at a time; the next page loads when the
+// end of the grid comes into view
+const galleryState = { cursor: null, loading: false, done: false, observer: null };
+
+async function loadGalleryPage() {
+    const grid = document.querySelector('#gallery .gallery-grid');
+    if (!grid || galleryState.loading || galleryState.done) return;
+    galleryState.loading = true;
+
+    try {
+        const params = new URLSearchParams({ limit: 24 });
+        if (galleryState.cursor) params.set('cursor', galleryState.cursor);
+        const response = await fetch(`${API_BASE_URL}/gallery?${params}`);
+        if (!response.ok) return;
+        const page = await response.json();
+
+        if (!galleryState.cursor) {
+            // Keep the built-in photos when the gallery is empty
+            if (page.images.length === 0) {
+                galleryState.done = true;
+                return;
+            }
+            grid.innerHTML = '';
+        }
+        grid.append(...page.images.map(renderGalleryItem));
+        observeLazyImages(grid);
+
+        galleryState.cursor = page.next_cursor;
+        galleryState.done = !page.next_cursor;
+        watchGalleryEnd(grid);
+    } catch (error) {
+        console.error('Error loading gallery:', error);
+    } finally {
+        galleryState.loading = false;
+    }
+}
+
+// Built with DOM calls, not HTML, so titles and descriptions from uploads can't inject markup
+function renderGalleryItem(image) {
+    const url = image.image_url.startsWith('/api/')
+        ? API_BASE_URL.replace(/\/api$/, '') + image.image_url
+        : image.image_url;
+
+    const item = document.createElement('div');
+    item.className = 'gallery-item';
+    item.addEventListener('click', () => openLightbox(url));
+
+    const img = document.createElement('img');
+    img.dataset.src = url;
+    img.alt = image.title;
+    img.decoding = 'async';
+    // Known dimensions reserve the space; the dominant colour shows until the photo arrives
+    if (image.width && image.height) {
+        img.width = image.width;
+        img.height = image.height;
+        item.style.aspectRatio = `${image.width} / ${image.height}`;
+    }
+    if (image.dominant_color) item.style.backgroundColor = image.dominant_color;
+
+    const overlay = document.createElement('div');
+    overlay.className = 'gallery-overlay';
+    const title = document.createElement('h5');
+    title.textContent = image.title;
+    overlay.append(title);
+    if (image.description) {
+        const description = document.createElement('p');
+        description.textContent = image.description;
+        overlay.append(description);
+    }
+
+    item.append(img, overlay);
+    return item;
+}
+
+function watchGalleryEnd(grid) {
+    let sentinel = document.querySelector('#gallery .gallery-sentinel');
+    if (galleryState.done || !('IntersectionObserver' in window)) {
+        if (sentinel) sentinel.remove();
+        return;
+    }
+    if (!sentinel) {
+        sentinel = document.createElement('div');
+        sentinel.className = 'gallery-sentinel';
+        grid.after(sentinel);
+    }
+    if (!galleryState.observer) {
+        galleryState.observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) loadGalleryPage();
+        }, { rootMargin: '400px 0px' });
+        galleryState.observer.observe(sentinel);
+    }
+}
+
 // Load results data
 async function loadResultsData() {
     try {
@@ -774,21 +878,36 @@ style.textContent = `
 document.head.appendChild(style);
 
 // Performance optimization: Lazy load images
+let imageObserver = null;
+
 function initializeLazyLoading() {
-    const images = document.querySelectorAll('img[data-src]');
-    
-    const imageObserver = new IntersectionObserver((entries, observer) => {
-        entries.forEach(entry => {
-            if (entry.isIntersecting) {
-                const img = entry.target;
-                img.src = img.dataset.src;
-                img.removeAttribute('data-src');
-                imageObserver.unobserve(img);
-            }
-        });
-    });
+    observeLazyImages(document);
+}
+
+// Start loading img[data-src] under root shortly before they scroll into view
+function observeLazyImages(root) {
+    if (!('IntersectionObserver' in window)) {
+        root.querySelectorAll('img[data-src]').forEach(loadLazyImage);
+        return;
+    }
+    if (!imageObserver) {
+        imageObserver = new IntersectionObserver((entries, observer) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    loadLazyImage(entry.target);
+                    observer.unobserve(entry.target);
+                }
+            });
+        }, { rootMargin: '200px 0px' });
+    }
+    root.querySelectorAll('img[data-src]').forEach(img => imageObserver.observe(img));
+}
 
-    images.forEach(img => imageObserver.observe(img));
+function loadLazyImage(img) {
+    img.classList.add('loading');
+    img.addEventListener('load', () => img.classList.remove('loading'), { once: true });
+    img.src = img.dataset.src;
+    img.removeAttribute('data-src');
 }
 
 // Call lazy loading after DOM is loaded